@@ -4,8 +4,9 @@ Version modernisée de l'IHM Flux à coût minimum (PyQt5 + Gurobi)
 - UI stylée (stylesheet)
 - QTableWidget pour coûts / capacités / b
 - Thread non bloquant pour Gurobi
-- Visualisation avec Matplotlib + NetworkX
-- Import/Export Excel (.xlsx)
+- Analyse what-if par prix duaux (potentiels, coûts réduits, intervalles de sensibilité)
+- Visualisation avec Matplotlib + NetworkX (arcs en collections, disposition en cache)
+- Import/Export Excel (.xlsx) et format natif (.npz, memory-mapped)
 """
 
 import sys
@@ -13,24 +14,21 @@ import traceback
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QTableWidget, QTableWidgetItem, QMessageBox, QFileDialog, QSpinBox,
-    QTextEdit, QFrame, QHeaderView, QProgressBar, QSizePolicy
+    QTextEdit, QFrame, QHeaderView, QProgressBar, QSizePolicy, QComboBox, QLineEdit
 )
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize
 from PyQt5.QtGui import QFont, QIcon
-import pandas as pd
-import networkx as nx
-import matplotlib.pyplot as plt
 
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
-# Gurobi import (handle absence gracefully)
-try:
-    from gurobipy import Model, GRB, quicksum
-    HAVE_GUROBI = True
-except Exception as e:
-    HAVE_GUROBI = False
-    GUR_ERROR = str(e)
+from transport_io import ArcArrays, load_instance, save_instance, string_matrices
+from transport_multicommodity import read_excel_multicommodity, solve_column_generation
+from transport_timeexpanded import read_excel_time_expanded, solve_time_expanded
+from transport_render import FlowRenderer
+from transport_sensitivity import WhatIf
+# Gurobi import is handled (gracefully) in transport_solver
+from transport_solver import ENGINE_LABELS, balance_with_dummy, solve
 
 
 # ------------ Solver Thread ------------
@@ -39,7 +37,7 @@ class SolverThread(QThread):
     error_signal = pyqtSignal(str)
     progress_signal = pyqtSignal(int)
 
-    def __init__(self, nodes, arcs, costs, caps, b, silent=True):
+    def __init__(self, nodes, arcs, costs, caps, b, silent=True, dummy=None, engine="auto"):
         super().__init__()
         # ensure names are clean copies
         self.nodes = [str(n).strip() for n in nodes]
@@ -51,59 +49,18 @@ class SolverThread(QThread):
         # normalize b
         self.b = {str(k).strip(): float(v) for k, v in b.items()}
         self.silent = silent
+        self.dummy = dummy
+        self.engine = engine
 
     def run(self):
         try:
-            if not HAVE_GUROBI:
-                self.error_signal.emit("gurobipy non installé : " + GUR_ERROR)
-                return
-
-            m = Model("MinCostFlow")
-            if self.silent:
-                m.setParam('OutputFlag', 0)
-
-            # create vars
-            x = {}
-            for (i, j) in self.arcs:
-                ub = self.caps.get((i, j), float('inf'))
-                if ub is None:
-                    ub = float('inf')
-                ub_g = ub if (ub != float('inf')) else GRB.INFINITY
-                # variable name without spaces
-                varname = f"x_{i}_{j}".replace(" ", "_")
-                x[(i, j)] = m.addVar(lb=0.0, ub=ub_g, name=varname)
-
-            # objective
-            m.setObjective(quicksum(self.costs.get((i, j), 0.0) * x[(i, j)] for (i, j) in self.arcs), GRB.MINIMIZE)
-
-            # flow conservation (corrected)
-            for node in self.nodes:
-                outgoing = quicksum(x[(i, j)] for (i, j) in self.arcs if i == node)
-                incoming = quicksum(x[(i, j)] for (i, j) in self.arcs if j == node)
-                rhs = self.b.get(node, 0.0)
-                m.addConstr(outgoing - incoming == rhs, name=f"flow_{node}")
-
             # optional: emit progress (fake steps)
             self.progress_signal.emit(5)
-            m.optimize()
+            # auto: transportation fast path when bipartite, Gurobi otherwise (duals / ranging / basis captured)
+            result = solve(self.nodes, self.arcs, self.costs, self.caps, self.b,
+                           silent=self.silent, dummy=self.dummy, engine=self.engine)
             self.progress_signal.emit(80)
 
-            # build flows dict (normalized)
-            flows = {}
-            if m.status == GRB.OPTIMAL:
-                for (i, j) in self.arcs:
-                    val = x[(i, j)].X
-                    # cast to float
-                    try:
-                        v = float(val)
-                    except:
-                        v = 0.0
-                    flows[f"{i}->{j}"] = v
-
-                result = {"status": "OPTIMAL", "obj": float(m.ObjVal), "flows": flows}
-            else:
-                result = {"status": f"STATUS_{m.status}", "obj": None, "flows": {}}
-
             # debug print to console so you can see raw solver output
             print("\n[DEBUG] SolverThread result flows:")
             for k, vv in result["flows"].items():
@@ -119,6 +76,25 @@ class SolverThread(QThread):
             self.error_signal.emit(str(e) + "\n" + tb)
 
 
+class TaskThread(QThread):
+    """Exécute func(*args, **kwargs) hors du thread IHM (multi-produits, multi-périodes)."""
+    finished_signal = pyqtSignal(dict)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            self.finished_signal.emit(self.func(*self.args, **self.kwargs))
+        except Exception as e:
+            tb = traceback.format_exc()
+            self.error_signal.emit(str(e) + "\n" + tb)
+
+
 # ------------ Matplotlib canvas wrapper ------------
 class MplCanvas(FigureCanvas):
     def __init__(self, parent=None, width=5.5, height=4, dpi=100):
@@ -211,12 +187,24 @@ class MainWindow(QMainWindow):
         btn_save = QPushButton("Sauvegarder (.xlsx)")
         btn_save.clicked.connect(self.save_file)
         btn_layout.addWidget(btn_save)
+        btn_multi = QPushButton("Multi-produits (.xlsx)")
+        btn_multi.clicked.connect(self.launch_multicommodity)
+        btn_layout.addWidget(btn_multi)
+        btn_periods = QPushButton("Multi-périodes (.xlsx)")
+        btn_periods.clicked.connect(self.launch_time_expanded)
+        btn_layout.addWidget(btn_periods)
 
         # run and export
+        run_layout = QHBoxLayout()
+        left_layout.addLayout(run_layout)
+        self.engine_box = QComboBox()
+        for key, label in ENGINE_LABELS.items():
+            self.engine_box.addItem(label, key)
+        run_layout.addWidget(self.engine_box)
         btn_run = QPushButton("Lancer résolution")
         btn_run.setStyleSheet("padding:10px; font-weight:bold;")
         btn_run.clicked.connect(self.launch_solver)
-        left_layout.addWidget(btn_run)
+        run_layout.addWidget(btn_run, 1)
 
         # progress bar and log
         self.progress = QProgressBar()
@@ -239,6 +227,7 @@ class MainWindow(QMainWindow):
 
         # canvas
         self.canvas = MplCanvas(self, width=6, height=4, dpi=110)
+        self.renderer = FlowRenderer()
         right_layout.addWidget(self.canvas, 4)
 
         # results table
@@ -251,6 +240,30 @@ class MainWindow(QMainWindow):
         self.results_widget.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         right_layout.addWidget(self.results_widget, 2)
 
+        # what-if panel (dual prices, instant while inside the ranging interval)
+        lbl_wi = QLabel("Analyse what-if (prix duaux)")
+        lbl_wi.setStyleSheet("color:#e0e0e0;")
+        right_layout.addWidget(lbl_wi)
+        wi_layout = QHBoxLayout()
+        right_layout.addLayout(wi_layout)
+        self.wi_kind = QComboBox()
+        self.wi_kind.addItems(["Coût d'arc", "Offre de nœud"])
+        self.wi_kind.currentIndexChanged.connect(self.refresh_whatif_targets)
+        wi_layout.addWidget(self.wi_kind)
+        self.wi_target = QComboBox()
+        wi_layout.addWidget(self.wi_target, 1)
+        self.wi_counter = QComboBox()
+        self.wi_counter.setToolTip("Nœud de contrepartie (absorbe la variation d'offre)")
+        wi_layout.addWidget(self.wi_counter, 1)
+        self.wi_delta = QLineEdit("10")
+        self.wi_delta.setFixedWidth(70)
+        wi_layout.addWidget(self.wi_delta)
+        btn_wi = QPushButton("Évaluer")
+        btn_wi.clicked.connect(self.evaluate_whatif)
+        wi_layout.addWidget(btn_wi)
+        self.whatif = None
+        self.refresh_whatif_targets()
+
         # status bar
         self.status = self.statusBar()
         self.status.showMessage("Prêt")
@@ -391,34 +404,14 @@ class MainWindow(QMainWindow):
         self.status.showMessage("Vérification des données...")
 
         # check balance
+        dummy = None
         sumb = sum(b.values())
         if abs(sumb) > 1e-6:
             msg = (f"Somme des b_i = {sumb:.4f} (doit être 0). "
                    "Ajouter un noeud Dummy pour équilibrer ?")
             res = QMessageBox.question(self, "Équilibre", msg, QMessageBox.Yes | QMessageBox.No)
             if res == QMessageBox.Yes:
-                dummy = "Dummy"
-                # avoid name clash
-                idx = 1
-                while dummy in nodes:
-                    dummy = f"Dummy{idx}"
-                    idx += 1
-                nodes.append(dummy)
-                # create arcs to absorb/extract surplus
-                if sumb > 0:
-                    # surplus: add edges from nodes -> dummy
-                    for nd in list(nodes):
-                        if nd == dummy: continue
-                        arcs.append((nd, dummy))
-                        costs[(nd, dummy)] = 0.0
-                        caps[(nd, dummy)] = abs(sumb)
-                else:
-                    for nd in list(nodes):
-                        if nd == dummy: continue
-                        arcs.append((dummy, nd))
-                        costs[(dummy, nd)] = 0.0
-                        caps[(dummy, nd)] = abs(sumb)
-                b[dummy] = -sumb
+                dummy = balance_with_dummy(nodes, arcs, costs, caps, b)
                 self.log.append(f"Noeud {dummy} ajouté (b={-sumb:.4f})")
             else:
                 self.log.append("Annulé : corriger b_i")
@@ -426,7 +419,8 @@ class MainWindow(QMainWindow):
                 return
 
         # start thread
-        self.thread = SolverThread(nodes, arcs, costs, caps, b)
+        self.thread = SolverThread(nodes, arcs, costs, caps, b, dummy=dummy,
+                                   engine=self.engine_box.currentData())
         self.thread.progress_signal.connect(self.on_progress)
         self.thread.finished_signal.connect(self.on_solved)
         self.thread.error_signal.connect(self.on_error)
@@ -439,7 +433,7 @@ class MainWindow(QMainWindow):
         self.progress.setValue(v)
 
     def on_error(self, msg):
-        QMessageBox.critical(self, "Erreur Gurobi", msg)
+        QMessageBox.critical(self, "Erreur solveur", msg)
         self.log.append("Erreur: " + msg)
         self.status.showMessage("Erreur solveur")
 
@@ -478,7 +472,7 @@ class MainWindow(QMainWindow):
                 print(f"  {k} = {v}")
             print("--------------------------------------------------\n")
 
-            self.log.append(f"Coût optimal = {obj}")
+            self.log.append(f"Coût optimal = {obj} (moteur : {result.get('engine', 'gurobi')})")
             # fill results table
             self.results_widget.setRowCount(len(norm_flows))
             r = 0
@@ -498,192 +492,246 @@ class MainWindow(QMainWindow):
                 r += 1
             # plot using normalized flows
             self.plot_solution(norm_flows)
+            # keep duals / ranging / basis for instant what-if questions
+            try:
+                t = self.thread
+                self.whatif = WhatIf(t.nodes, t.arcs, t.costs, t.caps, t.b, result)
+            except Exception as e:
+                self.whatif = None
+                self.log.append("Analyse what-if indisponible : " + str(e))
+            self.refresh_whatif_targets()
             self.status.showMessage(f"Terminé — coût = {obj}")
             self.progress.setValue(100)
         else:
             QMessageBox.warning(self, "Résolution", f"Le solveur a renvoyé : {status}")
             self.status.showMessage(f"Terminé : {status}")
 
+    def refresh_whatif_targets(self):
+        self.wi_target.clear()
+        self.wi_counter.clear()
+        wi = self.whatif
+        if wi is None:
+            self.wi_target.setEnabled(False)
+            self.wi_counter.setEnabled(False)
+            return
+        self.wi_target.setEnabled(True)
+        if self.wi_kind.currentIndex() == 0:
+            self.wi_target.addItems([f"{i}->{j}" for (i, j) in wi.arcs])
+            self.wi_counter.setEnabled(False)
+        else:
+            self.wi_target.addItems(wi.nodes)
+            # default counterpart: Dummy if present, else the last node
+            counters = sorted(wi.nodes, key=lambda n: not n.startswith("Dummy"))
+            self.wi_counter.addItems(counters)
+            self.wi_counter.setEnabled(True)
+
+    def evaluate_whatif(self):
+        if self.whatif is None:
+            QMessageBox.information(self, "What-if", "Lancer d'abord une résolution optimale.")
+            return
+        try:
+            delta = float(self.wi_delta.text().strip())
+        except ValueError:
+            QMessageBox.warning(self, "What-if", "Variation invalide.")
+            return
+        target = self.wi_target.currentText()
+        try:
+            if self.wi_kind.currentIndex() == 0:
+                i, j = target.split("->")
+                res = self.whatif.cost_change((i, j), delta)
+                question = f"coût {target} {delta:+g}"
+            else:
+                counter = self.wi_counter.currentText()
+                res = self.whatif.supply_change(target, delta, counter=counter)
+                question = f"offre {target} {delta:+g} (contrepartie {counter})"
+        except Exception as e:
+            QMessageBox.warning(self, "What-if", str(e))
+            return
+
+        if res["obj"] is None:
+            self.log.append(f"What-if {question} : {res.get('status')} (re-résolution)")
+            return
+        how = "prix duaux" if res["method"] == "dual" else "re-résolution depuis la base"
+        msg = f"What-if {question} : coût = {res['obj']:.6g} (Δ = {res['delta_obj']:+.6g}, {how})"
+        rng = res.get("valid_range")
+        if rng is not None:
+            msg += f" ; intervalle valide [{rng[0]:.6g}, {rng[1]:.6g}]"
+        self.log.append(msg)
+        self.status.showMessage(msg)
+
     def plot_solution(self, flows):
         """
         flows: dict avec clés "N1->N2" et valeurs numériques (ex: 15.0)
+        Rendu par collections (voir transport_render) ; disposition en cache par ensemble de nœuds.
         """
-        self.canvas.ax.clear()
+        n_drawn = self.renderer.draw(self.canvas.ax, flows, nodes=self.nodes)
+        self.canvas.draw_idle()
+        self.log.append(f"Graphe affiché : {n_drawn} arcs dessinés")
 
-        if not flows:
-            self.canvas.ax.text(0.5, 0.5, "Aucun flux à afficher", ha='center', va='center',
-                                transform=self.canvas.ax.transAxes, fontsize=14)
-            self.canvas.ax.set_axis_off()
-            self.canvas.draw()
+    def load_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Charger fichier", "",
+                                              "Instances (*.xlsx *.xls *.npz);;Excel (*.xlsx *.xls);;Instance native (*.npz)")
+        if not path:
             return
+        try:
+            # whole-sheet vectorized parsing (no per-cell pandas access)
+            inst = load_instance(path)
+            self.fill_tables(inst)
+            if path.lower().endswith(".npz"):
+                self.log.append(f"Instance native importée : {inst.n_nodes} nœuds, {inst.n_arcs} arcs.")
+            else:
+                self.log.append("Fichier importé (sheets: costs, caps, b).")
+        except ValueError as e:
+            QMessageBox.information(self, "Format attendu", str(e))
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur import", str(e))
 
-        # Créer un graphe VIERGE
-        G = nx.DiGraph()
-
-        # Ajouter UNIQUEMENT les arêtes qui ont un flux défini (même à 0 si tu veux les voir)
-        edge_list = []
-        for arcstr, val in flows.items():
-            if not isinstance(arcstr, str):
-                continue
-            parts = arcstr.replace(" ", "").split("->")
-            if len(parts) != 2:
-                continue
-            i, j = parts[0], parts[1]
-
-            try:
-                v = float(val)
-            except:
-                v = 0.0
-
-            # Ajouter l'arête avec son flux
-            G.add_edge(i, j, weight=v)
-            edge_list.append((i, j, v))
-
-        if len(G.nodes()) == 0:
-            self.canvas.ax.text(0.5, 0.5, "Aucun nœud détecté", ha='center', va='center',
-                                transform=self.canvas.ax.transAxes, fontsize=14)
-            self.canvas.ax.set_axis_off()
-            self.canvas.draw()
+    def launch_multicommodity(self):
+        """Charge un classeur costs / caps / commodities et résout le transport multi-produits."""
+        path, _ = QFileDialog.getOpenFileName(self, "Charger instance multi-produits", "", "Excel (*.xlsx *.xls)")
+        if not path:
             return
+        try:
+            inst = read_excel_multicommodity(path)
+            inst.check_balance()
+        except ValueError as e:
+            QMessageBox.information(self, "Format attendu", str(e))
+            return
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur import", str(e))
+            return
+        total_b = {v: sum(inst.supply[k][v] for k in inst.commodities) for v in inst.nodes}
+        self.fill_tables(ArcArrays.from_dicts(inst.nodes, inst.arcs, inst.costs, inst.caps, total_b))
+        self.arcs, self.costs, self.caps, self.b = inst.arcs, inst.costs, inst.caps, total_b
+        self.log.append(f"Instance multi-produits : {', '.join(inst.commodities)} "
+                        f"({len(inst.nodes)} nœuds, {len(inst.arcs)} arcs).")
+        self.multi_thread = TaskThread(solve_column_generation, inst)
+        self.multi_thread.finished_signal.connect(self.on_multi_solved)
+        self.multi_thread.error_signal.connect(self.on_error)
+        self.progress.setValue(0)
+        self.status.showMessage("Génération de colonnes en cours...")
+        self.multi_thread.start()
 
-        # --- Positionnement ---
-        n_nodes = len(G.nodes())
-        if n_nodes <= 4:
-            # Disposition manuelle plus lisible pour petits graphes
-            nodes_sorted = sorted(G.nodes())
-            pos = {}
-            if n_nodes == 3:
-                pos[nodes_sorted[0]] = (0, 0)
-                pos[nodes_sorted[1]] = (1, 1)
-                pos[nodes_sorted[2]] = (2, 0)
-            elif n_nodes == 4:
-                pos[nodes_sorted[0]] = (0, 1)
-                pos[nodes_sorted[1]] = (0, 0)
-                pos[nodes_sorted[2]] = (1, 1)
-                pos[nodes_sorted[3]] = (1, 0)
-            else:
-                pos = nx.circular_layout(G)
-        else:
-            pos = nx.spring_layout(G, seed=42, k=1.5)
-
-        # --- Dessin des nœuds ---
-        nx.draw_networkx_nodes(G, pos, ax=self.canvas.ax,
-                            node_size=1000, node_color="#4b8bf5", edgecolors="white", linewidths=2)
-        nx.draw_networkx_labels(G, pos, ax=self.canvas.ax,
-                                font_color="white", font_weight="bold", font_size=12)
-
-        # --- Préparation des largeurs et couleurs ---
-        flows_values = [abs(data['weight']) for u, v, data in G.edges(data=True)]
-        max_flow = max(flows_values) if flows_values else 1
-        min_width = 1.0
-        max_width = 8.0
-
-        # --- Dessin des arêtes une par une (contrôle total) ---
-        for u, v, val in edge_list:
-            width = min_width if max_flow == 0 else min_width + (max_width - min_width) * (abs(val) / max_flow)
-            width = max(width, 1.0)
-
-            # Couleur selon intensité du flux
-            if abs(val) > 1e-6:
-                color = "#2ecc71"   # vert vif pour flux positif
-            else:
-                color = "#95a5a6"   # gris pour flux nul
-
-            # Dessin de l'arête
-            nx.draw_networkx_edges(G, pos,
-                                edgelist=[(u, v)],
-                                ax=self.canvas.ax,
-                                width=width,
-                                arrowsize=25,
-                                arrowstyle="-|>",
-                                edge_color=color,
-                                connectionstyle="arc3,rad=0.15")
-
-            # Label du flux au milieu de l'arête
-            x1, y1 = pos[u]
-            x2, y2 = pos[v]
-            xm = (x1 + x2) / 2 + (0.05 if x1 > x2 else -0.05)  # petit décalage pour lisibilité
-            ym = (y1 + y2) / 2 + 0.08
-
-            label = "0" if abs(val) < 0.01 else f"{val:.2f}".rstrip("0").rstrip(".")
-            self.canvas.ax.text(xm, ym, label,
-                                fontsize=11, fontweight='bold',
-                                ha='center', va='center',
-                                bbox=dict(facecolor='white', alpha=0.85, edgecolor='none',
-                                        boxstyle='round,pad=0.4', linewidth=0))
-
-        self.canvas.ax.set_axis_off()
-        self.canvas.ax.margins(0.15)
-        self.canvas.draw()
-        print("[DEBUG] Graphe affiché correctement avec uniquement les vraies arêtes")
-
-    def load_file(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Charger fichier Excel", "", "Excel (*.xlsx *.xls)")
+    def on_multi_solved(self, result):
+        status = result.get("status", "")
+        self.log.append("Multi-produits : " + str(status))
+        if status != "OPTIMAL":
+            QMessageBox.warning(self, "Résolution", f"Le solveur a renvoyé : {status}")
+            self.status.showMessage(f"Terminé : {status}")
+            return
+        obj = result["obj"]
+        self.log.append(f"Coût optimal = {obj} ({result['iterations']} itérations, {result['columns']} chemins)")
+        for k, flows in result["flows"].items():
+            used = [f"{a}={v:.6g}" for a, v in flows.items() if v > 1e-6]
+            self.log.append(f"  {k} : " + ", ".join(used))
+        total = result["total"]
+        self.results_widget.setRowCount(len(total))
+        for r, (arc, val) in enumerate(total.items()):
+            i, j = arc.split("->")
+            self.results_widget.setItem(r, 0, QTableWidgetItem(arc))
+            self.results_widget.setItem(r, 1, QTableWidgetItem(f"{val:.6g}"))
+            self.results_widget.setItem(r, 2, QTableWidgetItem(str(self.caps.get((i, j), ""))))
+        self.plot_solution(total)
+        # what-if analysis is single-commodity only
+        self.whatif = None
+        self.refresh_whatif_targets()
+        self.status.showMessage(f"Terminé — coût = {obj}")
+        self.progress.setValue(100)
+
+    def launch_time_expanded(self):
+        """Charge un classeur costs / caps / periods (+ transit, holding) et résout le réseau espace-temps."""
+        path, _ = QFileDialog.getOpenFileName(self, "Charger instance multi-périodes", "", "Excel (*.xlsx *.xls)")
         if not path:
             return
         try:
-            xls = pd.ExcelFile(path)
-            sheets = xls.sheet_names
-            # require sheets: costs, caps, b
-            if all(s in sheets for s in ["costs", "caps", "b"]):
-                df_cost = pd.read_excel(path, sheet_name="costs", index_col=0)
-                df_caps = pd.read_excel(path, sheet_name="caps", index_col=0)
-                df_b = pd.read_excel(path, sheet_name="b")
-                nodes = list(df_cost.index.astype(str))
-                self.spin_n.setValue(len(nodes))
-                self.generate_tables()
-                # fill costs & caps & b
-                for i, ni in enumerate(nodes):
-                    for j, nj in enumerate(nodes):
-                        if ni == nj:
-                            continue
-                        try:
-                            v = df_cost.loc[ni, nj]
-                            self.table_cost.setItem(i, j, QTableWidgetItem(str(v)))
-                        except:
-                            pass
-                        try:
-                            u = df_caps.loc[ni, nj]
-                            self.table_cap.setItem(i, j, QTableWidgetItem(str(u)))
-                        except:
-                            pass
-                # b
-                for idx, row in df_b.iterrows():
-                    node = str(row.iloc[0])
-                    val = str(row.iloc[1])
-                    try:
-                        i = nodes.index(node)
-                        self.table_b.setItem(i, 1, QTableWidgetItem(val))
-                    except:
-                        pass
-                self.log.append("Fichier importé (sheets: costs, caps, b).")
-            else:
-                QMessageBox.information(self, "Format attendu",
-                                        "Le fichier Excel doit contenir les feuilles: costs, caps, b.")
+            net = read_excel_time_expanded(path)
+            net.check_balance()
+        except ValueError as e:
+            QMessageBox.information(self, "Format attendu", str(e))
+            return
         except Exception as e:
             QMessageBox.critical(self, "Erreur import", str(e))
+            return
+        base = net.base
+        self.fill_tables(ArcArrays(base.nodes, base.tail, base.head, base.cost, base.cap, net.supply.sum(axis=1)))
+        _, arcs, costs, caps, _ = base.to_dicts()
+        self.arcs, self.costs, self.caps = arcs, costs, caps
+        self.log.append(f"Instance multi-périodes : {net.T} périodes, {net.n_nodes} nœuds et "
+                        f"{net.n_arcs} arcs dans le réseau espace-temps.")
+        self.period_thread = TaskThread(solve_time_expanded, net, engine=self.engine_box.currentData())
+        self.period_thread.finished_signal.connect(self.on_time_expanded_solved)
+        self.period_thread.error_signal.connect(self.on_error)
+        self.progress.setValue(0)
+        self.status.showMessage("Réseau espace-temps en cours de résolution...")
+        self.period_thread.start()
+
+    def on_time_expanded_solved(self, result):
+        status = result.get("status", "")
+        self.log.append("Multi-périodes : " + str(status))
+        if status != "OPTIMAL":
+            QMessageBox.warning(self, "Résolution", f"Le solveur a renvoyé : {status}")
+            self.status.showMessage(f"Terminé : {status}")
+            return
+        obj = result["obj"]
+        self.log.append(f"Coût optimal = {obj} (moteur : {result.get('engine', 'gurobi')})")
+        for row in result["report"].itertuples(index=False):
+            self.log.append(f"  t={row.period} : expédié {row.shipped:.6g} (coût {row.transport_cost:.6g}), "
+                            f"stock {row.stock:.6g} (coût {row.holding_cost:.6g})")
+        total = result["flows"]
+        self.results_widget.setRowCount(len(total))
+        for r, (arc, val) in enumerate(total.items()):
+            i, j = arc.split("->")
+            self.results_widget.setItem(r, 0, QTableWidgetItem(arc))
+            self.results_widget.setItem(r, 1, QTableWidgetItem(f"{val:.6g}"))
+            self.results_widget.setItem(r, 2, QTableWidgetItem(str(self.caps.get((i, j), ""))))
+        self.plot_solution(total)
+        # what-if analysis is static single-period only
+        self.whatif = None
+        self.refresh_whatif_targets()
+        self.status.showMessage(f"Terminé — coût = {obj}")
+        self.progress.setValue(100)
+
+    def fill_tables(self, inst):
+        nodes = [str(x) for x in inst.nodes]
+        n = len(nodes)
+        if n > self.spin_n.maximum():
+            self.spin_n.setMaximum(n)
+        self.spin_n.setValue(n)
+        self.generate_tables()
+        self.table_cost.setHorizontalHeaderLabels(nodes)
+        self.table_cost.setVerticalHeaderLabels(nodes)
+        self.table_cap.setHorizontalHeaderLabels(nodes)
+        self.table_cap.setVerticalHeaderLabels(nodes)
+
+        cost_txt, cap_txt = string_matrices(inst)
+        self.table_cost.setUpdatesEnabled(False)
+        self.table_cap.setUpdatesEnabled(False)
+        try:
+            for i in range(n):
+                for j in range(n):
+                    if i == j:
+                        continue
+                    self.table_cost.setItem(i, j, QTableWidgetItem(cost_txt[i, j]))
+                    self.table_cap.setItem(i, j, QTableWidgetItem(cap_txt[i, j]))
+        finally:
+            self.table_cost.setUpdatesEnabled(True)
+            self.table_cap.setUpdatesEnabled(True)
+
+        for i, (node, val) in enumerate(zip(nodes, inst.b.tolist())):
+            itn = QTableWidgetItem(node)
+            itn.setFlags(Qt.ItemIsEnabled)
+            self.table_b.setItem(i, 0, itn)
+            self.table_b.setItem(i, 1, QTableWidgetItem(f"{val:g}"))
+        self.nodes = nodes
 
     def save_file(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Sauvegarder fichier", "", "Excel (*.xlsx)")
+        path, _ = QFileDialog.getSaveFileName(self, "Sauvegarder fichier", "",
+                                              "Excel (*.xlsx);;Instance native (*.npz)")
         if not path:
             return
         try:
             nodes, arcs, costs, caps, b = self.read_tables()
-            df_cost = pd.DataFrame(index=nodes, columns=nodes)
-            df_cap = pd.DataFrame(index=nodes, columns=nodes)
-            for i in nodes:
-                for j in nodes:
-                    if i == j:
-                        df_cost.loc[i, j] = ""
-                        df_cap.loc[i, j] = ""
-                    else:
-                        df_cost.loc[i, j] = costs.get((i, j), "")
-                        df_cap.loc[i, j] = caps.get((i, j), "")
-            df_b = pd.DataFrame([(n, b[n]) for n in nodes], columns=["Node", "b"])
-            with pd.ExcelWriter(path) as writer:
-                df_cost.to_excel(writer, sheet_name="costs")
-                df_cap.to_excel(writer, sheet_name="caps")
-                df_b.to_excel(writer, sheet_name="b", index=False)
+            save_instance(path, ArcArrays.from_dicts(nodes, arcs, costs, caps, b))
             self.log.append("Fichier sauvegardé: " + path)
         except Exception as e:
             QMessageBox.critical(self, "Erreur sauvegarde", str(e))
@@ -0,0 +1,129 @@
+"""
+bench_engines.py
+Benchmark reproductible des moteurs de flux à coût minimum (transport_solver.solve)
+- familles d'instances générées (graine fixe) : grille creuse (réseau routier / ferré),
+  bipartite dense (port à port), longues chaînes avec raccourcis
+- pour chaque moteur : temps, pic mémoire Python (tracemalloc), accord de l'objectif avec le LP Gurobi
+
+Usage : python bench/bench_engines.py [--sizes 10 20 40] [--engines ssp cost_scaling gurobi] [--seed 0]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from transport_solver import ENGINE_LABELS, solve
+
+
+def grid_instance(k, rng):
+    """Grille k x k, arcs dans les deux sens ; offres dans un coin, demandes dans le coin opposé."""
+    name = lambda r, c: f"G{r}_{c}"
+    nodes = [name(r, c) for r in range(k) for c in range(k)]
+    arcs = []
+    for r in range(k):
+        for c in range(k):
+            for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+                rr, cc = r + dr, c + dc
+                if 0 <= rr < k and 0 <= cc < k:
+                    arcs.append((name(r, c), name(rr, cc)))
+    costs = {a: float(v) for a, v in zip(arcs, rng.integers(1, 20, size=len(arcs)))}
+    caps = {a: float(v) for a, v in zip(arcs, rng.integers(50, 150, size=len(arcs)))}
+    b = {v: 0.0 for v in nodes}
+    corner = max(1, k // 4)
+    for r in range(corner):
+        for c in range(corner):
+            b[name(r, c)] += 5.0
+            b[name(k - 1 - r, k - 1 - c)] -= 5.0
+    return nodes, arcs, costs, caps, b
+
+
+def bipartite_instance(k, rng):
+    """k dépôts x k demandes, tous les arcs, capacités parfois contraignantes."""
+    sources = [f"S{i}" for i in range(k)]
+    sinks = [f"D{j}" for j in range(k)]
+    arcs = [(s, t) for s in sources for t in sinks]
+    costs = {a: float(v) for a, v in zip(arcs, rng.integers(1, 100, size=len(arcs)))}
+    caps = {a: float(v) for a, v in zip(arcs, rng.integers(5, 40, size=len(arcs)))}
+    supply = rng.integers(20, 60, size=k).astype(float)
+    demand = rng.multinomial(int(supply.sum()), np.ones(k) / k).astype(float)
+    b = dict(zip(sources, supply.tolist()))
+    b.update(zip(sinks, (-demand).tolist()))
+    return sources + sinks, arcs, costs, caps, b
+
+
+def chain_instance(k, rng):
+    """Chaîne de k*k nœuds (arcs avant non bornés) avec quelques raccourcis plus chers par unité."""
+    n = k * k
+    nodes = [f"C{i}" for i in range(n)]
+    arcs = [(nodes[i], nodes[i + 1]) for i in range(n - 1)]
+    costs = {a: float(v) for a, v in zip(arcs, rng.integers(1, 5, size=len(arcs)))}
+    caps = {a: float("inf") for a in arcs}
+    for _ in range(n // 10):
+        i = int(rng.integers(0, n - 2))
+        j = int(rng.integers(i + 2, min(n, i + 50)))
+        a = (nodes[i], nodes[j])
+        if a not in costs:
+            arcs.append(a)
+            costs[a] = float(rng.integers(5, 30) * (j - i))
+            caps[a] = float(rng.integers(5, 20))
+    b = {v: 0.0 for v in nodes}
+    b[nodes[0]] = 50.0
+    b[nodes[-1]] = -50.0
+    return nodes, arcs, costs, caps, b
+
+
+FAMILIES = {"grid": grid_instance, "bipartite": bipartite_instance, "chain": chain_instance}
+
+
+def run_engine(engine, inst):
+    """Temps mesuré sans traçage (tracemalloc ralentit fortement les moteurs Python), puis pic mémoire."""
+    t0 = time.perf_counter()
+    try:
+        result = solve(*inst, engine=engine)
+        status, obj = result["status"], result["obj"]
+    except Exception as e:
+        status, obj = e.__class__.__name__, None
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    try:
+        solve(*inst, engine=engine)
+    except Exception:
+        pass
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return status, obj, elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark des moteurs de flux à coût minimum")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 40])
+    parser.add_argument("--engines", nargs="+", default=["gurobi", "ssp", "cost_scaling"],
+                        choices=list(ENGINE_LABELS))
+    parser.add_argument("--families", nargs="+", default=list(FAMILIES), choices=list(FAMILIES))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'family':>10} {'k':>4} {'nodes':>7} {'arcs':>8} {'engine':>13} {'status':>12} "
+          f"{'time(s)':>9} {'peak MiB':>9} {'obj':>14} {'agree':>6}")
+    for family in args.families:
+        for k in args.sizes:
+            inst = FAMILIES[family](k, np.random.default_rng(args.seed))
+            rows = [(engine,) + run_engine(engine, inst) for engine in args.engines]
+            reference = next((obj for engine, status, obj, _, _ in rows
+                              if engine == "gurobi" and obj is not None), None)
+            for engine, status, obj, elapsed, peak in rows:
+                if reference is None or obj is None:
+                    agree = "n/a"
+                else:
+                    agree = "yes" if abs(obj - reference) <= 1e-6 * max(1.0, abs(reference)) else "NO"
+                obj_txt = f"{obj:.6g}" if obj is not None else "-"
+                print(f"{family:>10} {k:>4} {len(inst[0]):>7} {len(inst[1]):>8} {engine:>13} {status:>12} "
+                      f"{elapsed:>9.3f} {peak:>9.2f} {obj_txt:>14} {agree:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+bench_io.py
+Benchmark import/export des instances de transport
+- ancienne conversion cellule par cellule (df.loc[ni, nj]) vs conversion vectorisée
+- Excel (.xlsx) vs format natif (.npz memory-mapped)
+
+Usage : python bench/bench_io.py [n1 n2 ...]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from transport_io import ArcArrays, frames_to_arrays, arrays_to_frames, save_npz, load_npz, write_excel_instance
+
+
+def random_instance(n, density=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    mask = rng.random((n, n)) < density
+    np.fill_diagonal(mask, False)
+    tail, head = np.nonzero(mask)
+    cost = rng.integers(1, 50, size=len(tail)).astype(np.float64)
+    cap = rng.integers(10, 200, size=len(tail)).astype(np.float64)
+    b = np.zeros(n)
+    b[0], b[-1] = 100.0, -100.0
+    nodes = np.asarray([f"N{k+1}" for k in range(n)], dtype=str)
+    return ArcArrays(nodes, tail.astype(np.int32), head.astype(np.int32), cost, cap, b)
+
+
+def legacy_frames_to_dicts(df_cost, df_caps, df_b):
+    """Reproduction de l'ancienne boucle (i, j) avec accès scalaire pandas."""
+    nodes = list(df_cost.index.astype(str))
+    costs, caps = {}, {}
+    for ni in nodes:
+        for nj in nodes:
+            if ni == nj:
+                continue
+            try:
+                v = float(df_cost.loc[ni, nj])
+                if v == v:
+                    costs[(ni, nj)] = v
+                    u = df_caps.loc[ni, nj]
+                    caps[(ni, nj)] = float(u) if u != "" else float("inf")
+            except:
+                pass
+    b = {}
+    for _, row in df_b.iterrows():
+        b[str(row.iloc[0])] = float(row.iloc[1])
+    return nodes, costs, caps, b
+
+
+def timeit(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(sizes):
+    print(f"{'n':>6} {'arcs':>9} {'legacy(s)':>10} {'vector(s)':>10} {'xlsx load(s)':>13} {'npz mmap(s)':>12}")
+    tmp = tempfile.mkdtemp()
+    for n in sizes:
+        inst = random_instance(n)
+        df_cost, df_cap, df_b = arrays_to_frames(inst)
+        df_cost = df_cost.replace("", np.nan)
+        df_cap = df_cap.replace("", np.nan)
+
+        t_legacy = timeit(lambda: legacy_frames_to_dicts(df_cost, df_cap, df_b), repeat=1)
+        t_vec = timeit(lambda: frames_to_arrays(df_cost, df_cap, df_b))
+
+        npz_path = os.path.join(tmp, f"inst_{n}.npz")
+        save_npz(npz_path, inst)
+        t_npz = timeit(lambda: load_npz(npz_path, mmap=True).cost.sum())
+
+        t_xlsx = float("nan")
+        if n <= 500:  # openpyxl dominates beyond this size
+            xlsx_path = os.path.join(tmp, f"inst_{n}.xlsx")
+            write_excel_instance(xlsx_path, inst)
+            t_xlsx = timeit(lambda: pd.read_excel(xlsx_path, sheet_name=None), repeat=1)
+
+        print(f"{n:>6} {inst.n_arcs:>9} {t_legacy:>10.4f} {t_vec:>10.4f} {t_xlsx:>13.4f} {t_npz:>12.5f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]] or [50, 200, 500, 1000]
+    main(args)
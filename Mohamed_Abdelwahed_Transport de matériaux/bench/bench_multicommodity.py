@@ -0,0 +1,82 @@
+"""
+bench_multicommodity.py
+Benchmark transport multi-produits : génération de colonnes (chemins) contre formulation par arcs
+- grille k x k à capacités partagées, K produits (origines / destinations tirées au hasard, graine fixe)
+- temps, nombre de colonnes / itérations, accord des objectifs
+
+Usage : python bench/bench_multicommodity.py [--sizes 6 10] [--commodities 2 5 10] [--workers 0] [--seed 0]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from transport_multicommodity import MultiCommodityInstance, solve_arc_based, solve_column_generation
+
+
+def grid_instance(k, n_commodities, rng):
+    """Grille k x k (arcs dans les deux sens) ; chaque produit relie quelques dépôts à quelques clients."""
+    name = lambda r, c: f"G{r}_{c}"
+    nodes = [name(r, c) for r in range(k) for c in range(k)]
+    arcs = []
+    for r in range(k):
+        for c in range(k):
+            for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+                rr, cc = r + dr, c + dc
+                if 0 <= rr < k and 0 <= cc < k:
+                    arcs.append((name(r, c), name(rr, cc)))
+    costs = {a: float(v) for a, v in zip(arcs, rng.integers(1, 20, size=len(arcs)))}
+    caps = {a: float(v) for a, v in zip(arcs, rng.integers(20, 60, size=len(arcs)))}
+    commodities = [f"P{q}" for q in range(n_commodities)]
+    supply = {}
+    for q in commodities:
+        chosen = rng.choice(len(nodes), size=4, replace=False)
+        b = {v: 0.0 for v in nodes}
+        amount = float(rng.integers(5, 15))
+        b[nodes[chosen[0]]] += amount
+        b[nodes[chosen[1]]] += amount
+        b[nodes[chosen[2]]] -= amount
+        b[nodes[chosen[3]]] -= amount
+        supply[q] = b
+    return MultiCommodityInstance(nodes, arcs, costs, caps, commodities, supply)
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        # e.g. size-limited license
+        result = {"status": e.__class__.__name__, "obj": None}
+    return result, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark multi-produits : chemins contre arcs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[6, 10])
+    parser.add_argument("--commodities", type=int, nargs="+", default=[2, 5, 10])
+    parser.add_argument("--workers", type=int, default=0, help="processus de tarification (0 = séquentiel)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'k':>4} {'K':>4} {'arcs':>6} {'arc vars':>9} {'arc(s)':>8} {'cg(s)':>8} {'iters':>6} "
+          f"{'columns':>8} {'arc obj':>12} {'cg obj':>12} {'agree':>6}")
+    for k in args.sizes:
+        for n_com in args.commodities:
+            inst = grid_instance(k, n_com, np.random.default_rng(args.seed))
+            arc, t_arc = timed(solve_arc_based, inst)
+            cg, t_cg = timed(solve_column_generation, inst, workers=args.workers or None)
+            if arc["obj"] is None or cg["obj"] is None:
+                agree = "n/a"
+            else:
+                agree = "yes" if abs(arc["obj"] - cg["obj"]) <= 1e-6 * max(1.0, abs(arc["obj"])) else "NO"
+            fmt = lambda r: f"{r['obj']:.6g}" if r["obj"] is not None else r["status"]
+            print(f"{k:>4} {n_com:>4} {len(inst.arcs):>6} {len(inst.arcs) * n_com:>9} {t_arc:>8.3f} {t_cg:>8.3f} "
+                  f"{cg.get('iterations', 0):>6} {cg.get('columns', 0):>8} {fmt(arc):>12} {fmt(cg):>12} {agree:>6}")
+
+
+if __name__ == "__main__":
+    main()
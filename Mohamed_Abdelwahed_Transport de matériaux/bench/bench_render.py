@@ -0,0 +1,90 @@
+"""
+bench_render.py
+Benchmark du rendu de la solution : ancien dessin arc par arc vs FlowRenderer (collections)
+de 10 à 10 000 arcs. Le temps mesuré inclut le dessin effectif du canvas (backend Agg).
+
+Usage : python bench/bench_render.py [n_arcs ...]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import networkx as nx
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from transport_render import FlowRenderer
+
+LEGACY_MAX_ARCS = 1000  # au-delà l'ancien rendu prend plusieurs minutes
+
+
+def random_flows(n_arcs, seed=0, zero_share=0.5):
+    rng = np.random.default_rng(seed)
+    n_nodes = max(3, int(np.sqrt(n_arcs) * 2))
+    flows = {}
+    while len(flows) < n_arcs:
+        i, j = rng.integers(0, n_nodes, size=2)
+        if i == j:
+            continue
+        v = 0.0 if rng.random() < zero_share else float(rng.integers(1, 100))
+        flows[f"N{i+1}->N{j+1}"] = v
+    return flows
+
+
+def legacy_draw(ax, flows):
+    """Ancien plot_solution : spring_layout à chaque appel, un draw_networkx_edges + un texte par arc."""
+    ax.clear()
+    G = nx.DiGraph()
+    edge_list = []
+    for arcstr, v in flows.items():
+        i, j = arcstr.split("->")
+        G.add_edge(i, j, weight=v)
+        edge_list.append((i, j, v))
+    pos = nx.spring_layout(G, seed=42, k=1.5)
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_size=1000, node_color="#4b8bf5")
+    nx.draw_networkx_labels(G, pos, ax=ax, font_color="white", font_size=12)
+    max_flow = max(abs(v) for _, _, v in edge_list) or 1
+    for u, v, val in edge_list:
+        width = max(1.0 + 7.0 * abs(val) / max_flow, 1.0)
+        color = "#2ecc71" if abs(val) > 1e-6 else "#95a5a6"
+        nx.draw_networkx_edges(G, pos, edgelist=[(u, v)], ax=ax, width=width, arrowsize=25,
+                               arrowstyle="-|>", edge_color=color, connectionstyle="arc3,rad=0.15")
+        x1, y1 = pos[u]
+        x2, y2 = pos[v]
+        ax.text((x1 + x2) / 2, (y1 + y2) / 2 + 0.08, f"{val:.2f}",
+                bbox=dict(facecolor='white', alpha=0.85, edgecolor='none', boxstyle='round,pad=0.4'))
+    ax.set_axis_off()
+
+
+def timed(draw, canvas):
+    t0 = time.perf_counter()
+    draw()
+    canvas.draw()
+    return time.perf_counter() - t0
+
+
+def main(sizes):
+    fig = Figure(figsize=(6, 4), dpi=110)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    renderer = FlowRenderer()
+
+    print(f"{'arcs':>7} {'legacy(s)':>10} {'batched 1st(s)':>15} {'batched cached(s)':>18}")
+    for n in sizes:
+        flows = random_flows(n)
+        t_legacy = float("nan")
+        if n <= LEGACY_MAX_ARCS:
+            t_legacy = timed(lambda: legacy_draw(ax, flows), canvas)
+        renderer.clear_cache()
+        t_first = timed(lambda: renderer.draw(ax, flows), canvas)
+        t_cached = timed(lambda: renderer.draw(ax, flows), canvas)
+        print(f"{n:>7} {t_legacy:>10.3f} {t_first:>15.3f} {t_cached:>18.3f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]] or [10, 100, 1000, 10000]
+    main(args)
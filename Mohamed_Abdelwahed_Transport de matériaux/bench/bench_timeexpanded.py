@@ -0,0 +1,78 @@
+"""
+bench_timeexpanded.py
+Construction et résolution du réseau espace-temps (transport_timeexpanded)
+- dépôts sur un anneau avec raccourcis aléatoires (graine fixe), durées de transit 1..3
+- temps et mémoire (tableaux d'arcs, pic tracemalloc) de la construction, puis temps de résolution
+
+Usage : python bench/bench_timeexpanded.py [--depots 100 1000] [--periods 50 300] [--solve-max-arcs 200000] [--engine auto]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from transport_io import ArcArrays
+from transport_solver import ENGINE_LABELS
+from transport_timeexpanded import TimeExpandedNetwork, solve_time_expanded
+
+
+def ring_network(n, T, rng, degree=4):
+    """Anneau de n dépôts + (degree - 1) raccourcis par dépôt ; offres en début d'horizon, demandes à la fin."""
+    tail = np.repeat(np.arange(n), degree)
+    offsets = np.concatenate([[1], rng.integers(2, max(3, n // 2), size=degree - 1)])
+    head = (tail + np.tile(offsets, n)) % n
+    cost = rng.integers(1, 20, size=len(tail)).astype(np.float64)
+    cap = rng.integers(20, 80, size=len(tail)).astype(np.float64)
+    base = ArcArrays(np.array([f"D{i}" for i in range(n)]), tail.astype(np.int32), head.astype(np.int32),
+                     cost, cap, np.zeros(n))
+    supply = np.zeros((n, T))
+    k = max(1, n // 10)
+    src = rng.choice(n, size=k, replace=False)
+    dst = rng.choice(n, size=k, replace=False)
+    amount = rng.integers(5, 20, size=k).astype(np.float64)
+    np.add.at(supply, (src, rng.integers(0, max(1, T // 2), size=k)), amount)
+    np.add.at(supply, (dst, np.full(k, T - 1)), -amount)
+    return TimeExpandedNetwork(base, supply, rng.integers(1, 4, size=len(tail)), hold_cost=0.1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du réseau espace-temps")
+    parser.add_argument("--depots", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--periods", type=int, nargs="+", default=[50, 300])
+    parser.add_argument("--solve-max-arcs", type=int, default=200000,
+                        help="ne résout que les réseaux d'au plus ce nombre d'arcs")
+    parser.add_argument("--engine", default="auto", choices=list(ENGINE_LABELS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'depots':>7} {'T':>5} {'nodes':>9} {'arcs':>10} {'build(s)':>9} {'arrays MiB':>11} "
+          f"{'peak MiB':>9} {'solve(s)':>9} {'status':>12}")
+    for n in args.depots:
+        for T in args.periods:
+            net = ring_network(n, T, np.random.default_rng(args.seed))
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            arrays = net.arrays()
+            build = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+            size = sum(a.nbytes for a in arrays.values()) / 2 ** 20
+            t_solve, status = float("nan"), "skipped"
+            if net.n_arcs <= args.solve_max_arcs:
+                t0 = time.perf_counter()
+                try:
+                    status = solve_time_expanded(net, engine=args.engine)["status"]
+                except Exception as e:
+                    # e.g. size-limited license
+                    status = e.__class__.__name__
+                t_solve = time.perf_counter() - t0
+            print(f"{n:>7} {T:>5} {net.n_nodes:>9} {net.n_arcs:>10} {build:>9.3f} {size:>11.1f} "
+                  f"{peak:>9.1f} {t_solve:>9.3f} {status:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+bench_transport.py
+Benchmark du chemin rapide "problème de transport" (Vogel + MODI) contre le modèle général Gurobi
+sur des matrices dépôts x demandes denses.
+
+Usage : python bench/bench_transport.py [m ...]   (instances m x m)
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from transport_simplex import detect_transportation, solve_transportation
+from transport_solver import HAVE_GUROBI, solve_min_cost_flow
+
+
+def bipartite_instance(m, n, seed=0):
+    rng = np.random.default_rng(seed)
+    sources = [f"S{k+1}" for k in range(m)]
+    sinks = [f"D{k+1}" for k in range(n)]
+    supply = rng.integers(10, 100, size=m).astype(float)
+    demand = rng.multinomial(int(supply.sum()), np.ones(n) / n).astype(float)
+    cost = rng.integers(1, 100, size=(m, n)).astype(float)
+    arcs = [(s, t) for s in sources for t in sinks]
+    costs = dict(zip(arcs, cost.ravel().tolist()))
+    caps = {a: float("inf") for a in arcs}
+    b = dict(zip(sources, supply.tolist()))
+    b.update(zip(sinks, (-demand).tolist()))
+    return sources + sinks, arcs, costs, caps, b
+
+
+def main(sizes):
+    print(f"{'m x n':>11} {'arcs':>9} {'transport(s)':>13} {'iters':>7} {'gurobi(s)':>10} {'speedup':>8} {'same obj':>9}")
+    for m in sizes:
+        nodes, arcs, costs, caps, b = bipartite_instance(m, m)
+        t0 = time.perf_counter()
+        problem = detect_transportation(nodes, arcs, costs, caps, b)
+        fast = solve_transportation(problem, nodes, arcs, costs)
+        t_fast = time.perf_counter() - t0
+
+        t_lp, same = float("nan"), "n/a"
+        if HAVE_GUROBI:
+            try:
+                t0 = time.perf_counter()
+                lp = solve_min_cost_flow(nodes, arcs, costs, caps, b)
+                t_lp = time.perf_counter() - t0
+                same = str(abs(lp["obj"] - fast["obj"]) <= 1e-6 * max(1.0, abs(lp["obj"])))
+            except Exception as e:
+                # e.g. size-limited license
+                same = e.__class__.__name__
+        speedup = t_lp / t_fast if t_lp == t_lp else float("nan")
+        print(f"{m:>5} x {m:<5} {len(arcs):>9} {t_fast:>13.3f} {fast.get('iterations', 0):>7} "
+              f"{t_lp:>10.3f} {speedup:>8.1f} {same:>9}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]] or [20, 50, 100, 200, 500]
+    main(args)
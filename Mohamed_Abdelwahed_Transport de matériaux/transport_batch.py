@@ -0,0 +1,133 @@
+"""
+transport_batch.py
+Résolution en lot (sans IHM) d'un dossier d'instances de flux à coût minimum
+- instances .xlsx/.xls (feuilles costs, caps, b) ou .npz (format natif)
+- lecture + résolution réparties sur un pool de processus, un environnement Gurobi par worker
+- équilibrage automatique par nœud Dummy (comme launch_solver après "Oui")
+- récapitulatif CSV : fichier, statut, objectif, temps de résolution, fichier des flux
+
+Usage : python transport_batch.py DOSSIER [--out DOSSIER_SORTIE] [--workers N] [--engine auto] [--no-balance]
+"""
+
+import os
+import sys
+import time
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from transport_io import load_instance
+from transport_solver import ENGINE_LABELS, HAVE_GUROBI, balance_with_dummy, solve
+
+INSTANCE_EXTENSIONS = (".xlsx", ".xls", ".npz")
+SUMMARY_COLUMNS = ["instance", "status", "engine", "obj", "solve_time", "total_time", "n_nodes", "n_arcs",
+                   "dummy", "flows_file", "error"]
+
+# per-worker solver environment (created once by the pool initializer)
+_ENV = None
+
+
+def _init_worker(threads):
+    global _ENV
+    if not HAVE_GUROBI:
+        return
+    from gurobipy import Env
+    _ENV = Env(empty=True)
+    _ENV.setParam("OutputFlag", 0)
+    if threads:
+        _ENV.setParam("Threads", threads)
+    _ENV.start()
+
+
+def scan_instances(folder):
+    """Liste triée des fichiers d'instances du dossier (hors fichiers temporaires Excel ~$)."""
+    files = []
+    for name in sorted(os.listdir(folder)):
+        if name.startswith("~$"):
+            continue
+        if name.lower().endswith(INSTANCE_EXTENSIONS):
+            files.append(os.path.join(folder, name))
+    return files
+
+
+def solve_instance(path, out_dir, balance=True, engine="auto"):
+    """Tâche d'un worker : lecture, équilibrage, résolution, écriture des flux. Renvoie une ligne du récapitulatif."""
+    t0 = time.perf_counter()
+    row = {"instance": os.path.basename(path), "status": "", "engine": "", "obj": None, "solve_time": None,
+           "total_time": None, "n_nodes": 0, "n_arcs": 0, "dummy": "", "flows_file": "", "error": ""}
+    try:
+        nodes, arcs, costs, caps, b = load_instance(path).to_dicts()
+        if balance:
+            row["dummy"] = balance_with_dummy(nodes, arcs, costs, caps, b) or ""
+        elif abs(sum(b.values())) > 1e-6:
+            row["status"] = "UNBALANCED"
+            return row
+        row["n_nodes"], row["n_arcs"] = len(nodes), len(arcs)
+
+        t_solve = time.perf_counter()
+        result = solve(nodes, arcs, costs, caps, b, env=_ENV, dummy=row["dummy"] or None, engine=engine)
+        row["solve_time"] = time.perf_counter() - t_solve
+        row["status"] = result["status"]
+        row["obj"] = result["obj"]
+        row["engine"] = result.get("engine", "")
+
+        if result["status"] == "OPTIMAL":
+            stem = os.path.splitext(os.path.basename(path))[0]
+            flows_file = os.path.join(out_dir, f"{stem}_flows.csv")
+            rows = [(i, j, result["flows"][f"{i}->{j}"], caps.get((i, j), float("inf")))
+                    for (i, j) in arcs]
+            pd.DataFrame(rows, columns=["from", "to", "flow", "cap"]).to_csv(flows_file, index=False)
+            row["flows_file"] = flows_file
+    except Exception as e:
+        row["status"] = "ERROR"
+        row["error"] = f"{e.__class__.__name__}: {e}"
+        traceback.print_exc()
+    row["total_time"] = time.perf_counter() - t0
+    return row
+
+
+def run_batch(folder, out_dir=None, workers=None, balance=True, threads_per_worker=1, engine="auto"):
+    """Résout toutes les instances du dossier et écrit out_dir/summary.csv. Retourne le DataFrame récapitulatif."""
+    out_dir = out_dir or os.path.join(folder, "results")
+    os.makedirs(out_dir, exist_ok=True)
+    files = scan_instances(folder)
+    rows = []
+    if files:
+        workers = workers or min(len(files), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(threads_per_worker,)) as pool:
+            futures = {pool.submit(solve_instance, f, out_dir, balance, engine): f for f in files}
+            for fut in as_completed(futures):
+                row = fut.result()
+                rows.append(row)
+                print(f"[{len(rows)}/{len(files)}] {row['instance']}: {row['status']} obj={row['obj']}")
+    summary = pd.DataFrame(rows, columns=SUMMARY_COLUMNS).sort_values("instance") if rows \
+        else pd.DataFrame(columns=SUMMARY_COLUMNS)
+    summary.to_csv(os.path.join(out_dir, "summary.csv"), index=False)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Résolution en lot d'instances de flux à coût minimum")
+    parser.add_argument("folder", help="dossier contenant les instances (.xlsx, .xls, .npz)")
+    parser.add_argument("--out", default=None, help="dossier de sortie (défaut : FOLDER/results)")
+    parser.add_argument("--workers", type=int, default=None, help="nombre de processus (défaut : nb de CPU)")
+    parser.add_argument("--threads", type=int, default=1, help="threads Gurobi par worker")
+    parser.add_argument("--engine", default="auto", choices=list(ENGINE_LABELS),
+                        help="moteur de résolution (défaut : auto)")
+    parser.add_argument("--no-balance", action="store_true",
+                        help="ne pas ajouter de nœud Dummy si sum b_i != 0 (instance marquée UNBALANCED)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    summary = run_batch(args.folder, args.out, args.workers, balance=not args.no_balance,
+                        threads_per_worker=args.threads, engine=args.engine)
+    n_ok = int((summary["status"] == "OPTIMAL").sum()) if len(summary) else 0
+    print(f"{n_ok}/{len(summary)} instances optimales en {time.perf_counter() - t0:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
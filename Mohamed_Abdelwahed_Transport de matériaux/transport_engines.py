@@ -0,0 +1,336 @@
+"""
+transport_engines.py
+Moteurs combinatoires de flux à coût minimum (sans Gurobi)
+- ssp : plus courts chemins successifs (Dijkstra + potentiels de nœuds)
+- cost_scaling : push-relabel avec mise à l'échelle des coûts (Goldberg-Tarjan)
+Même entrée (nodes, arcs, costs, caps, b) et même dict de sortie que solve_min_cost_flow.
+"""
+
+import heapq
+from collections import deque
+
+import numpy as np
+
+
+class ResidualGraph:
+    """
+    Graphe résiduel en tableaux : l'arc k de l'instance donne l'arête 2k (sens direct,
+    capacité u, coût c) et l'arête 2k+1 (sens inverse, capacité 0, coût -c) ; e ^ 1 est l'arête jumelle.
+    adj[v] : arêtes sortant de v (construit par tri des origines, CSR).
+    """
+
+    def __init__(self, nodes, arcs, costs, caps, b, inf_cap=None):
+        self.nodes = list(nodes)
+        index = {v: k for k, v in enumerate(self.nodes)}
+        n_arcs = len(arcs)
+        tail = np.fromiter((index[i] for (i, j) in arcs), dtype=np.int64, count=n_arcs)
+        head = np.fromiter((index[j] for (i, j) in arcs), dtype=np.int64, count=n_arcs)
+        cost = np.fromiter((costs.get(a, 0.0) for a in arcs), dtype=np.float64, count=n_arcs)
+        cap = np.fromiter((caps.get(a, np.inf) for a in arcs), dtype=np.float64, count=n_arcs)
+        if inf_cap is not None:
+            cap = np.where(np.isinf(cap), inf_cap, cap)
+
+        e_from = np.empty(2 * n_arcs, dtype=np.int64)
+        e_to = np.empty(2 * n_arcs, dtype=np.int64)
+        e_from[0::2], e_from[1::2] = tail, head
+        e_to[0::2], e_to[1::2] = head, tail
+        e_cost = np.empty(2 * n_arcs)
+        e_cost[0::2], e_cost[1::2] = cost, -cost
+        e_res = np.zeros(2 * n_arcs)
+        e_res[0::2] = cap
+
+        order = np.argsort(e_from, kind="stable")
+        starts = np.searchsorted(e_from[order], np.arange(len(self.nodes) + 1))
+        order_l = order.tolist()
+        self.adj = [order_l[starts[v]:starts[v + 1]] for v in range(len(self.nodes))]
+        # plain lists: scalar access in the inner loops is much cheaper than on numpy arrays
+        self.to = e_to.tolist()
+        self.cost = e_cost.tolist()
+        self.res = e_res.tolist()
+        self.arc_cost = cost
+        self.excess = [float(b.get(v, 0.0)) for v in self.nodes]
+
+    def flows(self):
+        return self.res[1::2]
+
+
+def _result(arcs, costs, flows, engine, tol=1e-9, **extra):
+    out = {}
+    obj = 0.0
+    for (i, j), f in zip(arcs, flows):
+        f = float(f) if f > tol else 0.0
+        out[f"{i}->{j}"] = f
+        obj += costs.get((i, j), 0.0) * f
+    result = {"status": "OPTIMAL", "obj": obj, "flows": out, "engine": engine}
+    result.update(extra)
+    return result
+
+
+def _failed(status, engine):
+    return {"status": status, "obj": None, "flows": {}, "engine": engine}
+
+
+def _capacity_bound(caps, b):
+    """
+    Borne finie pour les arcs non bornés : offre totale + somme des capacités finies
+    (aucun flux optimal sans cycle négatif non borné ne la dépasse).
+    """
+    finite = sum(u for u in caps.values() if u is not None and u != float('inf'))
+    return sum(v for v in b.values() if v > 0) + finite + 1.0
+
+
+def _unbounded(nodes, arcs, costs, caps):
+    """Vrai s'il existe un cycle de coût négatif formé uniquement d'arcs de capacité infinie (Bellman-Ford)."""
+    inf_arcs = [(i, j, costs.get((i, j), 0.0)) for (i, j) in arcs
+                if caps.get((i, j), float('inf')) in (None, float('inf'))]
+    if not any(c < 0 for _, _, c in inf_arcs):
+        return False
+    dist = {v: 0.0 for v in nodes}
+    for _ in range(len(nodes)):
+        changed = False
+        for i, j, c in inf_arcs:
+            if dist[i] + c < dist[j] - 1e-12:
+                dist[j] = dist[i] + c
+                changed = True
+        if not changed:
+            return False
+    return True
+
+
+def _saturate_negative(g, tol=1e-12):
+    """Sature les arcs de coût négatif : toutes les arêtes résiduelles ont alors un coût >= 0."""
+    for e in range(0, len(g.res), 2):
+        if g.cost[e] < 0 and g.res[e] > tol:
+            r = g.res[e]
+            g.res[e] = 0.0
+            g.res[e + 1] += r
+            g.excess[g.to[e + 1]] -= r
+            g.excess[g.to[e]] += r
+
+
+# ------------ successive shortest paths ------------
+def solve_ssp(nodes, arcs, costs, caps, b, tol=1e-9):
+    """
+    Plus courts chemins successifs : Dijkstra multi-sources (nœuds en excès) sur les coûts réduits
+    c + pi_u - pi_w >= 0, augmentation vers le premier nœud en déficit atteint, mise à jour des potentiels.
+    Les arcs de coût négatif sont saturés au départ, ce qui permet de partir de pi = 0.
+    """
+    if _unbounded(nodes, arcs, costs, caps):
+        return _failed("UNBOUNDED", "ssp")
+    g = ResidualGraph(nodes, arcs, costs, caps, b, inf_cap=_capacity_bound(caps, b))
+    _saturate_negative(g)
+    n = len(g.nodes)
+    pi = [0.0] * n
+    excess = g.excess
+    adj, to, cost, res = g.adj, g.to, g.cost, g.res
+    n_aug = 0
+
+    while True:
+        sources = [v for v in range(n) if excess[v] > tol]
+        if not sources:
+            break
+        dist = [float('inf')] * n
+        pred = [-1] * n
+        done = [False] * n
+        heap = []
+        for s in sources:
+            dist[s] = 0.0
+            heap.append((0.0, s))
+        heapq.heapify(heap)
+        target = -1
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = True
+            if excess[u] < -tol:
+                target = u
+                break
+            pu = pi[u]
+            for e in adj[u]:
+                if res[e] <= tol:
+                    continue
+                w = to[e]
+                if done[w]:
+                    continue
+                rc = cost[e] + pu - pi[w]
+                nd = d + (rc if rc > 0 else 0.0)
+                if nd < dist[w]:
+                    dist[w] = nd
+                    pred[w] = e
+                    heapq.heappush(heap, (nd, w))
+        if target < 0:
+            return _failed("INFEASIBLE", "ssp")
+
+        dt = dist[target]
+        for v in range(n):
+            pi[v] += dist[v] if dist[v] < dt else dt
+
+        # bottleneck along the path
+        delta = -excess[target]
+        v = target
+        while pred[v] >= 0:
+            e = pred[v]
+            if res[e] < delta:
+                delta = res[e]
+            v = to[e ^ 1]
+        if excess[v] < delta:
+            delta = excess[v]
+        w = target
+        while pred[w] >= 0:
+            e = pred[w]
+            res[e] -= delta
+            res[e ^ 1] += delta
+            w = to[e ^ 1]
+        excess[v] -= delta
+        excess[target] += delta
+        n_aug += 1
+
+    # Gurobi convention for out - in = b: dual = -pi
+    duals = {v: -p for v, p in zip(g.nodes, pi)}
+    return _result(arcs, costs, g.flows(), "ssp", duals=duals, iterations=n_aug)
+
+
+# ------------ cost scaling push-relabel ------------
+def _integer_costs(cost, precision=6):
+    """Coûts entiers (multipliés par 10^k si nécessaire) et facteur appliqué."""
+    factor = 1
+    for _ in range(precision + 1):
+        scaled = cost * factor
+        if np.allclose(scaled, np.round(scaled)):
+            break
+        factor *= 10
+    return np.round(cost * factor).astype(np.int64), factor
+
+
+def _global_update(g, cost, p, eps, tol):
+    """
+    Mise à jour globale des prix (Goldberg) : Dijkstra inverse depuis les nœuds en déficit,
+    longueur d'une arête résiduelle = max(0, floor(c_p / eps) + 1), puis p(v) -= eps * d(v).
+    Conserve l'eps-optimalité. Renvoie False si un nœud en excès ne peut atteindre aucun déficit.
+    """
+    n = len(p)
+    adj, to, res, excess = g.adj, g.to, g.res, g.excess
+    inf = float('inf')
+    d = [inf] * n
+    heap = [(0, v) for v in range(n) if excess[v] < -tol]
+    for _, v in heap:
+        d[v] = 0
+    heapq.heapify(heap)
+    while heap:
+        dw, w = heapq.heappop(heap)
+        if dw > d[w]:
+            continue
+        # residual edges v -> w are the twins of edges leaving w
+        for e in adj[w]:
+            ein = e ^ 1
+            if res[ein] <= tol:
+                continue
+            v = to[e]
+            cp = cost[ein] + p[v] - p[w]
+            nd = dw + (cp // eps + 1 if cp >= 0 else 0)
+            if nd < d[v]:
+                d[v] = nd
+                heapq.heappush(heap, (nd, v))
+    finite = [x for x in d if x != inf]
+    d_max = (max(finite) if finite else 0) + 1
+    for v in range(n):
+        if d[v] == inf:
+            if excess[v] > tol:
+                return False
+            d[v] = d_max
+        p[v] -= eps * d[v]
+    return True
+
+
+def solve_cost_scaling(nodes, arcs, costs, caps, b, alpha=8, tol=1e-9):
+    """
+    Push-relabel avec mise à l'échelle des coûts (file FIFO, arc courant, mises à jour globales des prix).
+    Coûts entiers multipliés par (n + 1) : un flux 1-optimal est alors optimal.
+    Capacités infinies remplacées par une borne finie.
+    """
+    if _unbounded(nodes, arcs, costs, caps):
+        return _failed("UNBOUNDED", "cost_scaling")
+    g = ResidualGraph(nodes, arcs, costs, caps, b, inf_cap=_capacity_bound(caps, b))
+    n = len(g.nodes)
+    icost, _ = _integer_costs(g.arc_cost)
+    scale = n + 1
+    cost = [0] * (2 * len(arcs))
+    cost[0::2] = (icost * scale).tolist()
+    cost[1::2] = (-icost * scale).tolist()
+    adj, to, res, excess = g.adj, g.to, g.res, g.excess
+    p = [0] * n
+    eps = max(max((abs(c) for c in cost), default=1), 1)
+    n_relabel = 0
+
+    while True:
+        eps = max(1, eps // alpha)
+        # saturate every residual edge with negative reduced cost
+        for u in range(n):
+            pu = p[u]
+            for e in adj[u]:
+                r = res[e]
+                if r > tol and cost[e] + pu - p[to[e]] < 0:
+                    res[e] = 0.0
+                    res[e ^ 1] += r
+                    excess[u] -= r
+                    excess[to[e]] += r
+        if not _global_update(g, cost, p, eps, tol):
+            return _failed("INFEASIBLE", "cost_scaling")
+        active = deque(v for v in range(n) if excess[v] > tol)
+        in_queue = [False] * n
+        for v in active:
+            in_queue[v] = True
+        current = [0] * n
+        since_update = 0
+
+        while active:
+            v = active.popleft()
+            in_queue[v] = False
+            edges = adj[v]
+            while excess[v] > tol:
+                k = current[v]
+                if k < len(edges):
+                    e = edges[k]
+                    w = to[e]
+                    if res[e] > tol and cost[e] + p[v] - p[w] < 0:
+                        delta = excess[v] if excess[v] < res[e] else res[e]
+                        res[e] -= delta
+                        res[e ^ 1] += delta
+                        excess[v] -= delta
+                        excess[w] += delta
+                        if excess[w] > tol and not in_queue[w]:
+                            active.append(w)
+                            in_queue[w] = True
+                    else:
+                        current[v] = k + 1
+                    continue
+                # relabel: p(v) = max over residual edges of p(w) - c(e) - eps
+                best = None
+                for e in edges:
+                    if res[e] > tol:
+                        cand = p[to[e]] - cost[e]
+                        if best is None or cand > best:
+                            best = cand
+                if best is None:
+                    return _failed("INFEASIBLE", "cost_scaling")
+                p[v] = best - eps
+                current[v] = 0
+                n_relabel += 1
+                since_update += 1
+                if since_update >= n:
+                    # periodic global price update keeps long paths from costing O(n) relabels each
+                    since_update = 0
+                    if not _global_update(g, cost, p, eps, tol):
+                        return _failed("INFEASIBLE", "cost_scaling")
+                    current = [0] * n
+        if eps == 1:
+            break
+
+    return _result(arcs, costs, g.flows(), "cost_scaling", iterations=n_relabel)
+
+
+ENGINES = {
+    "ssp": solve_ssp,
+    "cost_scaling": solve_cost_scaling,
+}
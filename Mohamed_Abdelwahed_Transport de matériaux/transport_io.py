@@ -0,0 +1,232 @@
+"""
+transport_io.py
+Import/Export rapide des instances de flux à coût minimum
+- Conversion vectorisée feuilles Excel (costs / caps / b) <-> tableaux d'arcs
+- Format colonne natif (.npz non compressé) avec chargement memory-mapped
+- Conversion tableaux d'arcs -> dicts attendus par SolverThread
+"""
+
+import os
+import tempfile
+import zipfile
+import numpy as np
+import pandas as pd
+
+
+# arrays stored in a native instance file (all 1-D, same order as ArcArrays fields)
+NPZ_KEYS = ("nodes", "tail", "head", "cost", "cap", "b")
+
+
+class ArcArrays:
+    """
+    Instance sous forme de tableaux colonnes.
+    nodes : noms des nœuds (array str)
+    tail, head : indices (int32) de l'origine / destination de chaque arc
+    cost, cap : coût et capacité de chaque arc (cap = inf si non borné)
+    b : bilan de chaque nœud (positive=offre, negative=demande)
+    """
+
+    def __init__(self, nodes, tail, head, cost, cap, b):
+        self.nodes = nodes
+        self.tail = tail
+        self.head = head
+        self.cost = cost
+        self.cap = cap
+        self.b = b
+
+    @property
+    def n_nodes(self):
+        return len(self.nodes)
+
+    @property
+    def n_arcs(self):
+        return len(self.tail)
+
+    def to_dicts(self):
+        """Retourne (nodes, arcs, costs, caps, b) au format de read_tables / SolverThread."""
+        nodes = [str(n) for n in self.nodes]
+        names = np.asarray(nodes, dtype=object)
+        arcs = list(zip(names[self.tail].tolist(), names[self.head].tolist()))
+        costs = dict(zip(arcs, np.asarray(self.cost, dtype=float).tolist()))
+        caps = dict(zip(arcs, np.asarray(self.cap, dtype=float).tolist()))
+        b = dict(zip(nodes, np.asarray(self.b, dtype=float).tolist()))
+        return nodes, arcs, costs, caps, b
+
+    @classmethod
+    def from_dicts(cls, nodes, arcs, costs, caps, b):
+        """Construit les tableaux depuis les dicts de read_tables."""
+        nodes = [str(n) for n in nodes]
+        index = {n: k for k, n in enumerate(nodes)}
+        tail = np.fromiter((index[i] for (i, j) in arcs), dtype=np.int32, count=len(arcs))
+        head = np.fromiter((index[j] for (i, j) in arcs), dtype=np.int32, count=len(arcs))
+        cost = np.fromiter((costs.get(a, 0.0) for a in arcs), dtype=np.float64, count=len(arcs))
+        cap = np.fromiter((caps.get(a, np.inf) for a in arcs), dtype=np.float64, count=len(arcs))
+        bvec = np.fromiter((b.get(n, 0.0) for n in nodes), dtype=np.float64, count=len(nodes))
+        return cls(np.asarray(nodes, dtype=str), tail, head, cost, cap, bvec)
+
+
+# ------------ Excel <-> arrays ------------
+def frames_to_arrays(df_cost, df_caps, df_b):
+    """
+    Convertit les feuilles costs / caps / b en tableaux d'arcs, sans boucle (i, j).
+    Un arc (i, j) existe si la cellule de coût hors diagonale est numérique.
+    Une capacité vide ou absente devient inf.
+    """
+    nodes = [str(n).strip() for n in df_cost.index]
+
+    # align costs on its own index (columns may be in another order or incomplete)
+    df_cost = df_cost.copy()
+    df_cost.index = nodes
+    df_cost.columns = [str(c).strip() for c in df_cost.columns]
+    cost_mat = df_cost.reindex(index=nodes, columns=nodes).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+
+    df_caps = df_caps.copy()
+    df_caps.index = [str(r).strip() for r in df_caps.index]
+    df_caps.columns = [str(c).strip() for c in df_caps.columns]
+    cap_mat = df_caps.reindex(index=nodes, columns=nodes).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+
+    mask = ~np.isnan(cost_mat)
+    np.fill_diagonal(mask, False)
+    tail, head = np.nonzero(mask)
+    cost = cost_mat[tail, head]
+    cap = cap_mat[tail, head]
+    cap[np.isnan(cap)] = np.inf
+
+    # b sheet: first column = node, second column = value
+    b_nodes = df_b.iloc[:, 0].astype(str).str.strip()
+    b_vals = pd.to_numeric(df_b.iloc[:, 1], errors="coerce").fillna(0.0)
+    b = pd.Series(b_vals.to_numpy(), index=b_nodes.to_numpy())
+    b = b[~b.index.duplicated(keep="last")].reindex(nodes).fillna(0.0).to_numpy(dtype=np.float64)
+
+    return ArcArrays(np.asarray(nodes, dtype=str), tail.astype(np.int32), head.astype(np.int32), cost, cap, b)
+
+
+def arrays_to_frames(inst):
+    """Inverse de frames_to_arrays : matrices costs / caps (cellules vides = "") et feuille b."""
+    nodes = [str(x) for x in inst.nodes]
+    n = len(nodes)
+    cost_mat = np.full((n, n), "", dtype=object)
+    cap_mat = np.full((n, n), "", dtype=object)
+    cost_mat[inst.tail, inst.head] = np.asarray(inst.cost, dtype=float)
+    caps = np.asarray(inst.cap, dtype=float)
+    cap_mat[inst.tail, inst.head] = np.where(np.isinf(caps), "", caps.astype(object))
+    df_cost = pd.DataFrame(cost_mat, index=nodes, columns=nodes)
+    df_cap = pd.DataFrame(cap_mat, index=nodes, columns=nodes)
+    df_b = pd.DataFrame({"Node": nodes, "b": np.asarray(inst.b, dtype=float)})
+    return df_cost, df_cap, df_b
+
+
+def read_excel_instance(path):
+    """Lit un classeur (feuilles costs, caps, b) en un seul passage."""
+    sheets = pd.read_excel(path, sheet_name=None, index_col=None)
+    if not all(s in sheets for s in ["costs", "caps", "b"]):
+        raise ValueError("Le fichier Excel doit contenir les feuilles: costs, caps, b.")
+    df_cost = sheets["costs"].set_index(sheets["costs"].columns[0])
+    df_caps = sheets["caps"].set_index(sheets["caps"].columns[0])
+    return frames_to_arrays(df_cost, df_caps, sheets["b"])
+
+
+def write_excel_instance(path, inst):
+    df_cost, df_cap, df_b = arrays_to_frames(inst)
+    with pd.ExcelWriter(path) as writer:
+        df_cost.to_excel(writer, sheet_name="costs")
+        df_cap.to_excel(writer, sheet_name="caps")
+        df_b.to_excel(writer, sheet_name="b", index=False)
+
+
+def string_matrices(inst):
+    """
+    Matrices de texte (n x n) pour remplir table_cost / table_cap sans accès pandas cellule par cellule.
+    Les cellules sans arc restent "" et les capacités infinies aussi.
+    """
+    n = inst.n_nodes
+    cost_txt = np.full((n, n), "", dtype=object)
+    cap_txt = np.full((n, n), "", dtype=object)
+    cost_txt[inst.tail, inst.head] = [f"{v:g}" for v in np.asarray(inst.cost, dtype=float).tolist()]
+    cap_txt[inst.tail, inst.head] = ["" if np.isinf(v) else f"{v:g}" for v in np.asarray(inst.cap, dtype=float).tolist()]
+    return cost_txt, cap_txt
+
+
+# ------------ native columnar format (.npz) ------------
+def save_npz(path, inst):
+    """
+    Sauvegarde non compressée : chaque tableau reste contigu dans le zip, donc mappable.
+    Écrite dans un fichier temporaire puis renommée : inst peut être mappé sur path lui-même
+    (load_npz), le réécrire sur place tronquerait les pages encore lues.
+    """
+    path = str(path)
+    if not path.endswith(".npz"):
+        path += ".npz"  # same name as np.savez would use
+    fd, tmp = tempfile.mkstemp(suffix=".npz", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f,
+                     nodes=np.asarray(inst.nodes, dtype=str),
+                     tail=np.ascontiguousarray(inst.tail, dtype=np.int32),
+                     head=np.ascontiguousarray(inst.head, dtype=np.int32),
+                     cost=np.ascontiguousarray(inst.cost, dtype=np.float64),
+                     cap=np.ascontiguousarray(inst.cap, dtype=np.float64),
+                     b=np.ascontiguousarray(inst.b, dtype=np.float64))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _memmap_npz(path):
+    """
+    np.load ignore mmap_mode pour les .npz : on localise chaque membre .npy stocké
+    (ZIP_STORED) dans l'archive et on le mappe directement avec np.memmap.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as fh:
+        for info in zf.infolist():
+            key = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                arrays[key] = np.load(zf.open(info))
+                continue
+            # local file header: 30 bytes + filename + extra field
+            fh.seek(info.header_offset)
+            local = fh.read(30)
+            name_len = int.from_bytes(local[26:28], "little")
+            extra_len = int.from_bytes(local[28:30], "little")
+            fh.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(fh)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(fh)
+            if dtype.hasobject or 0 in shape:
+                fh.seek(info.header_offset + 30 + name_len + extra_len)
+                arrays[key] = np.lib.format.read_array(fh)
+                continue
+            arrays[key] = np.memmap(path, dtype=dtype, mode="r", offset=fh.tell(),
+                                    shape=shape, order="F" if fortran else "C")
+    return arrays
+
+
+def load_npz(path, mmap=True):
+    """Charge une instance native ; mmap=True évite de lire les tableaux d'arcs en RAM."""
+    if mmap:
+        data = _memmap_npz(path)
+    else:
+        with np.load(path) as npz:
+            data = {k: npz[k] for k in npz.files}
+    missing = [k for k in NPZ_KEYS if k not in data]
+    if missing:
+        raise ValueError("Instance .npz incomplète, tableaux manquants : " + ", ".join(missing))
+    return ArcArrays(*(data[k] for k in NPZ_KEYS))
+
+
+def load_instance(path, mmap=True):
+    """Charge .npz (natif) ou .xlsx/.xls (feuilles costs, caps, b) selon l'extension."""
+    if str(path).lower().endswith(".npz"):
+        return load_npz(path, mmap=mmap)
+    return read_excel_instance(path)
+
+
+def save_instance(path, inst):
+    if str(path).lower().endswith(".npz"):
+        save_npz(path, inst)
+    else:
+        write_excel_instance(path, inst)
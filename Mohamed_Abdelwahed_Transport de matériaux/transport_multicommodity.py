@@ -0,0 +1,278 @@
+"""
+transport_multicommodity.py
+Transport multi-produits (pétrole, grain...) partageant les capacités des voies
+- instance : feuilles costs / caps (coût unitaire et capacité partagée par arc)
+  + feuille "commodities" (Node, puis une colonne b_i par produit)
+- génération de colonnes sur les chemins : maître LP Gurobi (capacités partagées + bilans par produit),
+  tarification par plus court chemin (Dijkstra multi-sources) par produit, en parallèle
+- formulation par arcs (x[k, arc]) pour comparaison
+"""
+
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from transport_io import frames_to_arrays, arrays_to_frames, ArcArrays
+from transport_solver import HAVE_GUROBI, GUR_ERROR, arc_key
+
+if HAVE_GUROBI:
+    from gurobipy import Model, GRB, Column, quicksum
+
+
+class MultiCommodityInstance:
+    """
+    nodes, arcs, costs, caps : réseau partagé (mêmes dicts que read_tables)
+    commodities : noms des produits
+    supply : {produit: {nœud: b_ik}} (positive=offre, negative=demande, somme nulle par produit)
+    """
+
+    def __init__(self, nodes, arcs, costs, caps, commodities, supply):
+        self.nodes = list(nodes)
+        self.arcs = list(arcs)
+        self.costs = dict(costs)
+        self.caps = dict(caps)
+        self.commodities = list(commodities)
+        self.supply = {k: dict(supply[k]) for k in self.commodities}
+
+    def check_balance(self, tol=1e-6):
+        bad = [k for k in self.commodities if abs(sum(self.supply[k].values())) > tol]
+        if bad:
+            raise ValueError("Somme des b_i non nulle pour : " + ", ".join(bad))
+
+
+# ------------ Excel ------------
+def read_excel_multicommodity(path):
+    """Lit un classeur costs / caps / commodities (la feuille b, si présente, est ignorée)."""
+    sheets = pd.read_excel(path, sheet_name=None, index_col=None)
+    if not all(s in sheets for s in ["costs", "caps", "commodities"]):
+        raise ValueError("Le fichier Excel doit contenir les feuilles: costs, caps, commodities.")
+    df_cost = sheets["costs"].set_index(sheets["costs"].columns[0])
+    df_caps = sheets["caps"].set_index(sheets["caps"].columns[0])
+    df_com = sheets["commodities"]
+    base = frames_to_arrays(df_cost, df_caps, df_com.iloc[:, :2])
+    nodes, arcs, costs, caps, _ = base.to_dicts()
+    com_nodes = df_com.iloc[:, 0].astype(str).str.strip()
+    commodities = [str(c).strip() for c in df_com.columns[1:]]
+    supply = {}
+    for col, k in zip(df_com.columns[1:], commodities):
+        vals = pd.to_numeric(df_com[col], errors="coerce").fillna(0.0)
+        series = pd.Series(vals.to_numpy(), index=com_nodes.to_numpy())
+        series = series[~series.index.duplicated(keep="last")].reindex(nodes).fillna(0.0)
+        supply[k] = dict(zip(nodes, series.tolist()))
+    return MultiCommodityInstance(nodes, arcs, costs, caps, commodities, supply)
+
+
+def write_excel_multicommodity(path, inst):
+    """Écrit costs / caps, la feuille b (somme des produits) et la feuille commodities."""
+    total = {v: sum(inst.supply[k].get(v, 0.0) for k in inst.commodities) for v in inst.nodes}
+    base = ArcArrays.from_dicts(inst.nodes, inst.arcs, inst.costs, inst.caps, total)
+    df_cost, df_cap, df_b = arrays_to_frames(base)
+    df_com = pd.DataFrame({"Node": inst.nodes})
+    for k in inst.commodities:
+        df_com[k] = [inst.supply[k].get(v, 0.0) for v in inst.nodes]
+    with pd.ExcelWriter(path) as writer:
+        df_cost.to_excel(writer, sheet_name="costs")
+        df_cap.to_excel(writer, sheet_name="caps")
+        df_b.to_excel(writer, sheet_name="b", index=False)
+        df_com.to_excel(writer, sheet_name="commodities", index=False)
+
+
+# ------------ pricing (shortest paths) ------------
+def _csr(n, tail, head):
+    order = np.argsort(tail, kind="stable")
+    starts = np.searchsorted(tail[order], np.arange(n + 1))
+    return order.tolist(), starts.tolist(), head.tolist()
+
+
+def _price_commodity(args):
+    """
+    Dijkstra multi-sources pour un produit : les sources démarrent à -sigma_i (décalé pour rester >= 0),
+    longueur d'arc c_a - w_a >= 0. Renvoie les chemins de coût réduit négatif [(arc indices, source, puits, rc)].
+    """
+    n, order, starts, head, tail, length, sources, sigma, sinks, tau, tol = args
+    shift = max(sigma) if sigma else 0.0
+    dist = [float('inf')] * n
+    pred = [-1] * n
+    heap = []
+    for s, sg in zip(sources, sigma):
+        d0 = shift - sg
+        if d0 < dist[s]:
+            dist[s] = d0
+            heap.append((d0, s))
+    heapq.heapify(heap)
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for k in range(starts[u], starts[u + 1]):
+            a = order[k]
+            w = head[a]
+            nd = d + length[a]
+            if nd < dist[w] - 1e-12:
+                dist[w] = nd
+                pred[w] = a
+                heapq.heappush(heap, (nd, w))
+    columns = []
+    for t, tt in zip(sinks, tau):
+        if dist[t] == float('inf'):
+            continue
+        rc = dist[t] - shift - tt
+        if rc < -tol:
+            path = []
+            v = t
+            while pred[v] >= 0:
+                a = pred[v]
+                path.append(a)
+                v = tail[a]
+            path.reverse()
+            columns.append((path, v, t, rc))
+    return columns
+
+
+# ------------ column generation ------------
+def solve_column_generation(inst, workers=None, max_iter=500, tol=1e-7, silent=True, env=None, big_m=None):
+    """
+    Génération de colonnes sur les chemins.
+    Maître : min sum c_p l_p + M * artificielles
+             sum_{p contient a} l_p <= u_a              (capacité partagée, dual w_a <= 0)
+             sum_{p part de i, produit k} l_p = b_ik     (offre, dual sigma)
+             sum_{p arrive en j, produit k} l_p = -b_jk  (demande, dual tau)
+    Tarification : pour chaque produit, plus court chemin avec longueurs c_a - w_a (Dijkstra : exige
+    c_a >= 0, ValueError sinon ; w_a <= 0 garde alors les longueurs positives).
+    workers : nombre de processus pour la tarification (None = séquentiel).
+    Renvoie un dict : status, obj, flows {produit: {"i->j": x}}, total {"i->j": x}, iterations, columns.
+    """
+    if not HAVE_GUROBI:
+        raise RuntimeError("gurobipy non installé : " + GUR_ERROR)
+    inst.check_balance()
+    index = {v: k for k, v in enumerate(inst.nodes)}
+    n = len(inst.nodes)
+    tail = np.array([index[i] for (i, j) in inst.arcs], dtype=np.int64)
+    head = np.array([index[j] for (i, j) in inst.arcs], dtype=np.int64)
+    cost = np.array([inst.costs.get(a, 0.0) for a in inst.arcs], dtype=np.float64)
+    cap = np.array([inst.caps.get(a, float('inf')) for a in inst.arcs], dtype=np.float64)
+    if (cost < 0).any():
+        bad = [arc_key(*inst.arcs[a]) for a in np.flatnonzero(cost < 0)[:5].tolist()]
+        raise ValueError("Génération de colonnes : coûts négatifs non pris en charge (" + ", ".join(bad) + ")")
+    order, starts, head_l = _csr(n, tail, head)
+    tail_l = tail.tolist()
+    if big_m is None:
+        big_m = (np.abs(cost).sum() + 1.0) * 10.0
+
+    m = Model("MultiCommodityCG", env=env) if env is not None else Model("MultiCommodityCG")
+    if silent:
+        m.setParam('OutputFlag', 0)
+    cap_con = {}
+    for a in np.flatnonzero(np.isfinite(cap)).tolist():
+        cap_con[a] = m.addConstr(quicksum([]) <= cap[a], name=f"cap_{a}")
+    src_con, dst_con = {}, {}
+    artificials = []
+    for k in inst.commodities:
+        for v, val in inst.supply[k].items():
+            if val > tol:
+                art = m.addVar(obj=big_m)
+                artificials.append(art)
+                src_con[(k, index[v])] = m.addConstr(art == val, name=f"src_{k}_{v}".replace(" ", "_"))
+            elif val < -tol:
+                art = m.addVar(obj=big_m)
+                artificials.append(art)
+                dst_con[(k, index[v])] = m.addConstr(art == -val, name=f"dst_{k}_{v}".replace(" ", "_"))
+    m.ModelSense = GRB.MINIMIZE
+
+    columns = []   # (commodity, arc indices, var)
+    seen = set()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers else None
+    it = 0
+    try:
+        while it < max_iter:
+            m.optimize()
+            if m.status != GRB.OPTIMAL:
+                return {"status": f"STATUS_{m.status}", "obj": None, "flows": {}, "total": {}}
+            w = np.zeros(len(inst.arcs))
+            for a, con in cap_con.items():
+                w[a] = con.Pi
+            # cost >= 0 and w <= 0: the clamp only removes solver round-off on w
+            length = np.maximum(cost - w, 0.0).tolist()
+
+            tasks = []
+            for k in inst.commodities:
+                srcs = [(v, con.Pi) for (kk, v), con in src_con.items() if kk == k]
+                dsts = [(v, con.Pi) for (kk, v), con in dst_con.items() if kk == k]
+                tasks.append((n, order, starts, head_l, tail_l, length,
+                              [v for v, _ in srcs], [p for _, p in srcs],
+                              [v for v, _ in dsts], [p for _, p in dsts], tol))
+            results = list(pool.map(_price_commodity, tasks)) if pool else [_price_commodity(t) for t in tasks]
+
+            added = 0
+            for k, cols in zip(inst.commodities, results):
+                for path, s, t, rc in cols:
+                    key = (k, tuple(path))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    col = Column()
+                    for a in path:
+                        if a in cap_con:
+                            col.addTerms(1.0, cap_con[a])
+                    col.addTerms(1.0, src_con[(k, s)])
+                    col.addTerms(1.0, dst_con[(k, t)])
+                    var = m.addVar(obj=float(cost[path].sum()), column=col)
+                    columns.append((k, path, var))
+                    added += 1
+            it += 1
+            if added == 0:
+                break
+    finally:
+        if pool:
+            pool.shutdown()
+
+    if any(art.X > 1e-6 for art in artificials):
+        return {"status": "INFEASIBLE", "obj": None, "flows": {}, "total": {}, "iterations": it}
+    flows = {k: {arc_key(i, j): 0.0 for (i, j) in inst.arcs} for k in inst.commodities}
+    for k, path, var in columns:
+        val = var.X
+        if val > tol:
+            for a in path:
+                i, j = inst.arcs[a]
+                flows[k][arc_key(i, j)] += val
+    total = {arc_key(i, j): sum(flows[k][arc_key(i, j)] for k in inst.commodities) for (i, j) in inst.arcs}
+    obj = sum(inst.costs.get(a, 0.0) * total[arc_key(*a)] for a in inst.arcs)
+    return {"status": "OPTIMAL", "obj": obj, "flows": flows, "total": total,
+            "iterations": it, "columns": len(columns), "engine": "column_generation"}
+
+
+# ------------ arc-based formulation ------------
+def solve_arc_based(inst, silent=True, env=None):
+    """Formulation par arcs : une variable par (produit, arc), commodités x arcs variables."""
+    if not HAVE_GUROBI:
+        raise RuntimeError("gurobipy non installé : " + GUR_ERROR)
+    inst.check_balance()
+    m = Model("MultiCommodityArc", env=env) if env is not None else Model("MultiCommodityArc")
+    if silent:
+        m.setParam('OutputFlag', 0)
+    x = {}
+    for k in inst.commodities:
+        for a in inst.arcs:
+            x[k, a] = m.addVar(obj=inst.costs.get(a, 0.0))
+    m.ModelSense = GRB.MINIMIZE
+    out_arcs = {v: [] for v in inst.nodes}
+    in_arcs = {v: [] for v in inst.nodes}
+    for a in inst.arcs:
+        out_arcs[a[0]].append(a)
+        in_arcs[a[1]].append(a)
+    for k in inst.commodities:
+        for v in inst.nodes:
+            m.addConstr(quicksum(x[k, a] for a in out_arcs[v]) - quicksum(x[k, a] for a in in_arcs[v])
+                        == inst.supply[k].get(v, 0.0))
+    for a in inst.arcs:
+        u = inst.caps.get(a, float('inf'))
+        if u != float('inf'):
+            m.addConstr(quicksum(x[k, a] for k in inst.commodities) <= u)
+    m.optimize()
+    if m.status != GRB.OPTIMAL:
+        return {"status": f"STATUS_{m.status}", "obj": None, "flows": {}, "total": {}}
+    flows = {k: {arc_key(*a): float(x[k, a].X) for a in inst.arcs} for k in inst.commodities}
+    total = {arc_key(*a): sum(flows[k][arc_key(*a)] for k in inst.commodities) for a in inst.arcs}
+    return {"status": "OPTIMAL", "obj": float(m.ObjVal), "flows": flows, "total": total, "engine": "arc"}
@@ -0,0 +1,192 @@
+"""
+transport_render.py
+Rendu rapide de la solution de flux (Matplotlib)
+- tous les arcs dessinés en une seule LineCollection (largeurs / couleurs en tableaux)
+- pointes de flèches en une seule PolyCollection
+- positions des nœuds mises en cache (LRU) par ensemble de nœuds et d'arcs
+- niveaux de détail : arcs à flux nul masqués et étiquettes supprimées au-delà de seuils d'arcs
+"""
+
+from collections import OrderedDict
+import numpy as np
+import networkx as nx
+from matplotlib.collections import LineCollection, PolyCollection
+
+
+FLOW_COLOR = "#2ecc71"   # vert vif pour flux positif
+ZERO_COLOR = "#95a5a6"   # gris pour flux nul
+NODE_COLOR = "#4b8bf5"
+
+
+def parse_flows(flows):
+    """flows {"N1->N2": val} -> (tails, heads, values) ; les clés mal formées sont ignorées."""
+    tails, heads, values = [], [], []
+    for arcstr, val in flows.items():
+        if not isinstance(arcstr, str):
+            continue
+        parts = arcstr.replace(" ", "").split("->")
+        if len(parts) != 2:
+            continue
+        try:
+            v = float(val)
+        except:
+            v = 0.0
+        tails.append(parts[0])
+        heads.append(parts[1])
+        values.append(v)
+    return tails, heads, np.asarray(values, dtype=np.float64)
+
+
+def compute_layout(nodes, arcs=()):
+    """
+    Même disposition que l'ancien plot_solution : manuelle pour 3/4 nœuds, sinon spring sur le
+    graphe orienté des arcs [(origine, destination)] (nœuds triés, arcs triés : disposition stable).
+    """
+    nodes_sorted = sorted(nodes)
+    n_nodes = len(nodes_sorted)
+    if n_nodes == 3:
+        coords = [(0, 0), (1, 1), (2, 0)]
+        return dict(zip(nodes_sorted, coords))
+    if n_nodes == 4:
+        coords = [(0, 1), (0, 0), (1, 1), (1, 0)]
+        return dict(zip(nodes_sorted, coords))
+    G = nx.DiGraph()
+    G.add_nodes_from(nodes_sorted)
+    G.add_edges_from(sorted(arcs))
+    if n_nodes <= 4:
+        return nx.circular_layout(G)
+    return nx.spring_layout(G, seed=42, k=1.5)
+
+
+class FlowRenderer:
+    """
+    Dessine un dict de flux sur un Axes en quelques collections seulement.
+    max_labels : au-delà de ce nombre d'arcs visibles, pas d'étiquettes de flux
+    max_node_labels : au-delà, pas de noms de nœuds
+    hide_zero_above : au-delà de ce nombre d'arcs, les arcs à |flux| <= eps sont masqués
+                      (0 = toujours masqués, None = jamais)
+    """
+
+    def __init__(self, max_labels=60, max_node_labels=80, hide_zero_above=30, eps=1e-6,
+                 rad=0.15, samples=12, min_width=1.0, max_width=8.0, layout_cache_size=16):
+        self.max_labels = max_labels
+        self.max_node_labels = max_node_labels
+        self.hide_zero_above = hide_zero_above
+        self.eps = eps
+        self.rad = rad
+        self.samples = samples
+        self.min_width = min_width
+        self.max_width = max_width
+        self.layout_cache_size = layout_cache_size
+        self._layout_cache = OrderedDict()
+
+    def layout(self, nodes, arcs=()):
+        key = (frozenset(nodes), frozenset(arcs))
+        pos = self._layout_cache.get(key)
+        if pos is not None:
+            self._layout_cache.move_to_end(key)
+            return pos
+        pos = compute_layout(*key)
+        self._layout_cache[key] = pos
+        if len(self._layout_cache) > self.layout_cache_size:
+            self._layout_cache.popitem(last=False)
+        return pos
+
+    def clear_cache(self):
+        self._layout_cache.clear()
+
+    def _curves(self, p1, p2):
+        """Courbes de Bézier quadratiques (comme connectionstyle arc3) échantillonnées d'un coup."""
+        d = p2 - p1
+        ctrl = (p1 + p2) / 2 + self.rad * np.stack([d[:, 1], -d[:, 0]], axis=1)
+        t = np.linspace(0.0, 1.0, self.samples)[None, :, None]
+        a, c, b = p1[:, None, :], ctrl[:, None, :], p2[:, None, :]
+        curves = (1 - t) ** 2 * a + 2 * (1 - t) * t * c + t ** 2 * b
+        return curves, ctrl
+
+    def _arrow_heads(self, p1, ctrl, p2, widths, tip=0.8):
+        """Triangles orientés selon la tangente de la courbe en t=tip."""
+        a, c, b = p1, ctrl, p2
+        point = (1 - tip) ** 2 * a + 2 * (1 - tip) * tip * c + tip ** 2 * b
+        tangent = 2 * (1 - tip) * (c - a) + 2 * tip * (b - c)
+        norm = np.linalg.norm(tangent, axis=1, keepdims=True)
+        norm[norm == 0] = 1.0
+        u = tangent / norm
+        v = np.stack([-u[:, 1], u[:, 0]], axis=1)
+        span = np.ptp(np.vstack([p1, p2]), axis=0).max() if len(p1) else 1.0
+        size = (0.025 + 0.004 * widths[:, None]) * (span if span > 0 else 1.0)
+        back = point - u * size
+        return np.stack([point, back + v * size * 0.5, back - v * size * 0.5], axis=1)
+
+    def draw(self, ax, flows, nodes=None):
+        """
+        flows : dict {"N1->N2": val}
+        nodes : nœuds à placer (par défaut ceux qui apparaissent dans flows) ;
+                passer la liste complète garde la disposition stable entre deux résolutions.
+        Retourne le nombre d'arcs dessinés.
+        """
+        ax.clear()
+        tails, heads, values = parse_flows(flows)
+        all_nodes = set(tails) | set(heads)
+        if nodes is not None:
+            all_nodes |= set(nodes)
+        if not all_nodes:
+            ax.text(0.5, 0.5, "Aucun flux à afficher", ha='center', va='center',
+                    transform=ax.transAxes, fontsize=14)
+            ax.set_axis_off()
+            return 0
+
+        pos = self.layout(all_nodes, zip(tails, heads))
+        names = sorted(all_nodes)
+        xy = np.asarray([pos[n] for n in names], dtype=np.float64)
+        index = {n: k for k, n in enumerate(names)}
+
+        absval = np.abs(values)
+        if self.hide_zero_above is not None and len(values) > self.hide_zero_above:
+            keep = absval > self.eps
+        else:
+            keep = np.ones(len(values), dtype=bool)
+        ti = np.fromiter((index[t] for t in tails), dtype=np.int64, count=len(tails))[keep]
+        hi = np.fromiter((index[h] for h in heads), dtype=np.int64, count=len(heads))[keep]
+        vals = values[keep]
+        absv = absval[keep]
+
+        # nodes: one scatter collection
+        many = len(names) > self.max_node_labels
+        ax.scatter(xy[:, 0], xy[:, 1], s=(60 if many else 1000), c=NODE_COLOR,
+                   edgecolors="white", linewidths=(0.5 if many else 2), zorder=3)
+        if not many:
+            for n, (x, y) in zip(names, xy):
+                ax.text(x, y, n, color="white", fontweight="bold", fontsize=12,
+                        ha="center", va="center", zorder=4)
+
+        if len(vals):
+            max_flow = absv.max()
+            if max_flow == 0:
+                widths = np.full(len(vals), self.min_width)
+            else:
+                widths = self.min_width + (self.max_width - self.min_width) * (absv / max_flow)
+            widths = np.maximum(widths, 1.0)
+            colors = np.where(absv > self.eps, FLOW_COLOR, ZERO_COLOR)
+
+            p1, p2 = xy[ti], xy[hi]
+            curves, ctrl = self._curves(p1, p2)
+            ax.add_collection(LineCollection(curves, linewidths=widths, colors=colors,
+                                             capstyle="round", zorder=1))
+            ax.add_collection(PolyCollection(self._arrow_heads(p1, ctrl, p2, widths),
+                                             facecolors=colors, edgecolors="none", zorder=2))
+
+            # labels only while they stay readable
+            if len(vals) <= self.max_labels:
+                mid = curves[:, self.samples // 2, :]
+                for (xm, ym), val in zip(mid, vals.tolist()):
+                    label = "0" if abs(val) < 0.01 else f"{val:.2f}".rstrip("0").rstrip(".")
+                    ax.text(xm, ym, label, fontsize=11, fontweight='bold',
+                            ha='center', va='center', zorder=5,
+                            bbox=dict(facecolor='white', alpha=0.85, edgecolor='none',
+                                      boxstyle='round,pad=0.4', linewidth=0))
+
+        ax.autoscale_view()
+        ax.set_axis_off()
+        ax.margins(0.15)
+        return len(vals)
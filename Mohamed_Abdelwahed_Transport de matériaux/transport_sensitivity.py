@@ -0,0 +1,152 @@
+"""
+transport_sensitivity.py
+Analyse "what-if" après une résolution optimale
+- variation du coût d'un arc : delta objectif = x_ij * delta tant que le coût reste dans [SAObjLow, SAObjUp]
+- variation de l'offre d'un nœud (compensée par un nœud de contrepartie) :
+  delta objectif = (pi_noeud - pi_contrepartie) * delta tant que la base reste réalisable
+  (chemin de l'arbre de base entre les deux nœuds, limité par les capacités résiduelles)
+- hors intervalle : nouvelle résolution redémarrée depuis la base sauvegardée
+"""
+
+from collections import deque
+
+from transport_solver import arc_key, solve_min_cost_flow
+
+
+class WhatIf:
+    """
+    Répond aux questions de tarification à partir d'un résultat de solve_min_cost_flow.
+    nodes, arcs, costs, caps, b : données résolues (après ajout éventuel du nœud Dummy)
+    result : dict renvoyé par le solveur (duals, cost_ranging, basis...)
+    """
+
+    def __init__(self, nodes, arcs, costs, caps, b, result, env=None, tol=1e-9):
+        if result.get("status") != "OPTIMAL":
+            raise ValueError("Analyse what-if impossible : solution non optimale")
+        self.nodes = list(nodes)
+        self.arcs = list(arcs)
+        self.costs = dict(costs)
+        self.caps = dict(caps)
+        self.b = dict(b)
+        self.result = result
+        self.env = env
+        self.tol = tol
+        self.obj = result["obj"]
+        self.flows = result["flows"]
+        self.duals = result.get("duals", {})
+        self.cost_ranging = result.get("cost_ranging", {})
+        self.basis = result.get("basis")
+        self._tree = None
+
+    @property
+    def has_duals(self):
+        return bool(self.duals)
+
+    # ------------ basis tree ------------
+    def _basis_tree(self):
+        """Adjacence de l'arbre de base : arcs structurels basiques (VBasis == 0)."""
+        if self._tree is None:
+            tree = {n: [] for n in self.nodes}
+            if self.basis is not None:
+                for (i, j), vb in zip(self.arcs, self.basis["vbasis"]):
+                    if vb == 0:
+                        tree[i].append((j, (i, j), +1))
+                        tree[j].append((i, (i, j), -1))
+            self._tree = tree
+        return self._tree
+
+    def _tree_path(self, src, dst):
+        """Liste [(arc, sens)] du chemin src -> dst dans l'arbre de base, None si non connexe."""
+        tree = self._basis_tree()
+        prev = {src: None}
+        queue = deque([src])
+        while queue:
+            u = queue.popleft()
+            if u == dst:
+                break
+            for v, arc, sign in tree.get(u, []):
+                if v not in prev:
+                    prev[v] = (u, arc, sign)
+                    queue.append(v)
+        if dst not in prev:
+            return None
+        path = []
+        v = dst
+        while prev[v] is not None:
+            u, arc, sign = prev[v]
+            path.append((arc, sign))
+            v = u
+        path.reverse()
+        return path
+
+    def supply_range(self, node, counter):
+        """
+        Intervalle [dmin, dmax] des variations d'offre de node (compensées par counter)
+        pour lesquelles la base actuelle reste optimale. None si la base ne permet pas de conclure.
+        """
+        path = self._tree_path(node, counter)
+        if path is None:
+            return None
+        up, down = float('inf'), float('inf')
+        for arc, sign in path:
+            x = self.flows.get(arc_key(*arc), 0.0)
+            u = self.caps.get(arc, float('inf'))
+            if sign > 0:
+                # pushing more from node to counter raises x on forward arcs
+                up = min(up, u - x)
+                down = min(down, x)
+            else:
+                up = min(up, x)
+                down = min(down, u - x)
+        return (-max(down, 0.0), max(up, 0.0))
+
+    # ------------ questions ------------
+    def cost_change(self, arc, delta):
+        """Coût de l'arc (i, j) augmenté de delta."""
+        arc = (str(arc[0]).strip(), str(arc[1]).strip())
+        if arc not in self.costs:
+            raise KeyError(f"Arc inconnu : {arc_key(*arc)}")
+        new_cost = self.costs[arc] + delta
+        lo, up = self.cost_ranging.get(arc_key(*arc), (None, None))
+        if lo is not None and lo - self.tol <= new_cost <= up + self.tol:
+            x = self.flows.get(arc_key(*arc), 0.0)
+            return {"method": "dual", "obj": self.obj + x * delta, "delta_obj": x * delta,
+                    "valid_range": (lo - self.costs[arc], up - self.costs[arc])}
+        costs = dict(self.costs)
+        costs[arc] = new_cost
+        return self._resolve(self.nodes, self.arcs, costs, self.caps, self.b,
+                             valid_range=(None if lo is None else (lo - self.costs[arc], up - self.costs[arc])))
+
+    def supply_change(self, node, delta, counter=None):
+        """
+        Offre de node augmentée de delta (demande si delta < 0) ; counter absorbe la différence
+        pour garder sum b_i = 0. Par défaut : le nœud Dummy s'il existe.
+        """
+        node = str(node).strip()
+        if node not in self.b:
+            raise KeyError(f"Nœud inconnu : {node}")
+        if counter is None:
+            dummies = [n for n in self.nodes if n.startswith("Dummy")]
+            if not dummies:
+                raise ValueError("Préciser le nœud de contrepartie (aucun nœud Dummy)")
+            counter = dummies[-1]
+        counter = str(counter).strip()
+        if counter == node:
+            raise ValueError("Le nœud de contrepartie doit être différent")
+
+        rng = self.supply_range(node, counter) if self.has_duals else None
+        if rng is not None and rng[0] - self.tol <= delta <= rng[1] + self.tol:
+            d_obj = (self.duals[node] - self.duals[counter]) * delta
+            return {"method": "dual", "obj": self.obj + d_obj, "delta_obj": d_obj, "valid_range": rng}
+        b = dict(self.b)
+        b[node] += delta
+        b[counter] -= delta
+        return self._resolve(self.nodes, self.arcs, self.costs, self.caps, b, valid_range=rng)
+
+    def _resolve(self, nodes, arcs, costs, caps, b, valid_range=None):
+        """Hors intervalle : résolution redémarrée depuis la base optimale sauvegardée."""
+        res = solve_min_cost_flow(nodes, arcs, costs, caps, b, env=self.env, basis=self.basis)
+        out = {"method": "resolve", "status": res["status"], "obj": res["obj"], "valid_range": valid_range,
+               "result": res}
+        out["delta_obj"] = None if res["obj"] is None else res["obj"] - self.obj
+        return out
@@ -0,0 +1,417 @@
+"""
+transport_simplex.py
+Chemin rapide pour les instances bipartites (problème de transport classique)
+- détection : chaque arc va d'un dépôt (b_i > 0) vers un point de demande (b_i < 0),
+  capacités non contraignantes, instance équilibrée
+- solution initiale par la méthode de Vogel, puis MODI (stepping-stone) en numpy
+- arcs absents du couple (dépôt, demande) : coût M, solution rejetée s'ils portent du flux
+- intervalles de sensibilité des coûts lus sur la base MODI (pas de nouvelle résolution)
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+class TransportProblem:
+    """Données du problème de transport extraites d'une instance de flux."""
+
+    def __init__(self, sources, sinks, supply, demand, cost, present, arc_cells, ignored):
+        self.sources = sources      # noms des dépôts (lignes)
+        self.sinks = sinks          # noms des points de demande (colonnes)
+        self.supply = supply        # offres (m,)
+        self.demand = demand        # demandes (n,), positives
+        self.cost = cost            # matrice des coûts (m, n)
+        self.present = present      # masque des arcs existants (m, n)
+        self.arc_cells = arc_cells  # {(i, j): (r, c)} arcs de l'instance -> cellule
+        self.ignored = ignored      # arcs de l'instance écartés (flux nul), ex. arcs Dummy inutiles
+
+
+def detect_transportation(nodes, arcs, costs, caps, b, dummy=None, tol=1e-9):
+    """
+    Renvoie un TransportProblem si l'instance est un problème de transport pur, None sinon.
+    dummy : nœud d'équilibrage ajouté par balance_with_dummy ; ses arcs de coût 0 vers le
+    mauvais côté sont inutiles quand tous les coûts sont >= 0 et sont alors écartés.
+    """
+    if not arcs:
+        return None
+    if abs(sum(b.values())) > 1e-6:
+        return None
+    sources = [n for n in nodes if b.get(n, 0.0) > tol]
+    sinks = [n for n in nodes if b.get(n, 0.0) < -tol]
+    if not sources or not sinks:
+        return None
+    row = {n: r for r, n in enumerate(sources)}
+    col = {n: c for c, n in enumerate(sinks)}
+    m, n = len(sources), len(sinks)
+    supply = np.array([b[s] for s in sources], dtype=np.float64)
+    demand = np.array([-b[t] for t in sinks], dtype=np.float64)
+
+    nonneg = all(v >= 0 for v in costs.values())
+    cost = np.zeros((m, n), dtype=np.float64)
+    present = np.zeros((m, n), dtype=bool)
+    arc_cells = {}
+    ignored = []
+    for (i, j) in arcs:
+        if i in row and j in col:
+            r, c = row[i], col[j]
+            if present[r, c]:
+                # parallel arcs: not a plain transportation matrix
+                return None
+            u = caps.get((i, j), float('inf'))
+            if u is not None and u < min(supply[r], demand[c]) - tol:
+                # binding capacity: capacitated transport, use the general engine
+                return None
+            cost[r, c] = costs.get((i, j), 0.0)
+            present[r, c] = True
+            arc_cells[(i, j)] = (r, c)
+        elif dummy is not None and nonneg and dummy in (i, j) and costs.get((i, j), 0.0) == 0.0:
+            ignored.append((i, j))
+        else:
+            return None
+    return TransportProblem(sources, sinks, supply, demand, cost, present, arc_cells, ignored)
+
+
+# ------------ Vogel ------------
+def vogel_initial(cost, supply, demand):
+    """
+    Solution de base initiale (Vogel). Chaque ligne garde ses colonnes triées par coût et deux
+    pointeurs vers les deux premières colonnes encore actives (idem pour les colonnes) : le calcul
+    des pénalités reste vectorisé sans rebalayer la matrice à chaque allocation.
+    Renvoie la liste des cellules de base [(r, c, x)] (m + n - 1 cellules, arbre couvrant).
+    """
+    m, n = cost.shape
+    s = supply.astype(np.float64).copy()
+    d = demand.astype(np.float64).copy()
+    row_active = np.ones(m, dtype=bool)
+    col_active = np.ones(n, dtype=bool)
+    row_order = np.argsort(cost, axis=1, kind="stable")      # (m, n) column indices
+    col_order = np.argsort(cost, axis=0, kind="stable").T    # (n, m) row indices
+    # first / second active entry of each line in its sorted order
+    row_p1 = np.zeros(m, dtype=np.int64)
+    row_p2 = np.ones(m, dtype=np.int64)
+    col_p1 = np.zeros(n, dtype=np.int64)
+    col_p2 = np.ones(n, dtype=np.int64)
+    rows_idx = np.arange(m)
+    cols_idx = np.arange(n)
+    basis = []
+
+    def advance(order, ptr, other_active, lines, size):
+        # move pointers of the given lines past entries whose other line is inactive
+        sel = lines
+        while sel.size:
+            cur = order[sel, np.minimum(ptr[sel], size - 1)]
+            sel = sel[(ptr[sel] < size) & ~other_active[cur]]
+            ptr[sel] += 1
+
+    def first_two(order, p1, p2, other_active, active, size):
+        lines = np.flatnonzero(active)
+        advance(order, p1, other_active, lines, size)
+        np.maximum(p2, p1 + 1, out=p2)
+        advance(order, p2, other_active, lines, size)
+        first = order[np.arange(len(p1)), np.minimum(p1, size - 1)]
+        second = order[np.arange(len(p2)), np.minimum(p2, size - 1)]
+        return first, second, p2 < size
+
+    n_rows, n_cols = m, n
+    while n_rows > 0 and n_cols > 0:
+        if n_rows == 1 or n_cols == 1:
+            # only one line left: allocate everything that remains along it
+            r_left = np.flatnonzero(row_active)
+            c_left = np.flatnonzero(col_active)
+            if n_rows == 1:
+                r = r_left[0]
+                for c in c_left:
+                    basis.append((r, c, d[c]))
+            else:
+                c = c_left[0]
+                for r in r_left:
+                    basis.append((r, c, s[r]))
+            break
+
+        r_first, r_second, r_has2 = first_two(row_order, row_p1, row_p2, col_active, row_active, n)
+        c_first, c_second, c_has2 = first_two(col_order, col_p1, col_p2, row_active, col_active, m)
+        r_pen = np.where(r_has2, cost[rows_idx, r_second] - cost[rows_idx, r_first], cost[rows_idx, r_first])
+        c_pen = np.where(c_has2, cost[c_second, cols_idx] - cost[c_first, cols_idx], cost[c_first, cols_idx])
+        r_pen = np.where(row_active, r_pen, -np.inf)
+        c_pen = np.where(col_active, c_pen, -np.inf)
+
+        rbest = int(np.argmax(r_pen))
+        cbest = int(np.argmax(c_pen))
+        if r_pen[rbest] >= c_pen[cbest]:
+            r, c = rbest, int(r_first[rbest])
+        else:
+            r, c = int(c_first[cbest]), cbest
+
+        x = min(s[r], d[c])
+        basis.append((r, c, x))
+        s[r] -= x
+        d[c] -= x
+        # remove exactly one line per allocation so the basis stays a spanning tree
+        if s[r] <= d[c]:
+            row_active[r] = False
+            n_rows -= 1
+        else:
+            col_active[c] = False
+            n_cols -= 1
+    return basis
+
+
+# ------------ MODI ------------
+def _potentials(m, n, adj, cost):
+    """u_r + v_c = c_rc sur les cellules de base ; parcours de l'arbre depuis la ligne 0."""
+    u = np.zeros(m)
+    v = np.zeros(n)
+    seen = np.zeros(m + n, dtype=bool)
+    seen[0] = True
+    queue = deque([0])
+    while queue:
+        k = queue.popleft()
+        for w in adj[k]:
+            if seen[w]:
+                continue
+            seen[w] = True
+            if k < m:
+                v[w - m] = cost[k, w - m] - u[k]
+            else:
+                u[w] = cost[w, k - m] - v[k - m]
+            queue.append(w)
+    return u, v
+
+
+def _smaller_side(adj, a, b):
+    """
+    Après suppression de l'arête a-b : composante (liste de nœuds) la plus petite,
+    trouvée par deux parcours alternés arrêtés dès que l'un s'épuise.
+    """
+    seen = [{a}, {b}]
+    stacks = [[a], [b]]
+    while True:
+        for k in (0, 1):
+            if not stacks[k]:
+                return list(seen[k])
+            x = stacks[k].pop()
+            for w in adj[x]:
+                if w not in seen[k]:
+                    seen[k].add(w)
+                    stacks[k].append(w)
+
+
+def _tree_path(adj, src, dst):
+    """Chemin de nœuds src -> dst dans l'arbre de base (lignes 0..m-1, colonnes m..m+n-1)."""
+    prev = {src: None}
+    queue = deque([src])
+    while queue:
+        k = queue.popleft()
+        if k == dst:
+            break
+        for w in adj[k]:
+            if w not in prev:
+                prev[w] = k
+                queue.append(w)
+    path = [dst]
+    while prev[path[-1]] is not None:
+        path.append(prev[path[-1]])
+    path.reverse()
+    return path
+
+
+def modi(cost, supply, demand, basis=None, max_iter=None, block_rows=256, eps=1e-9):
+    """
+    Méthode MODI (u-v) avec tarification partielle par blocs de lignes.
+    Renvoie (x dense (m, n), u, v, liste des cellules de base, nombre d'itérations, optimal).
+    """
+    m, n = cost.shape
+    if basis is None:
+        basis = vogel_initial(cost, supply, demand)
+    x = np.zeros((m, n))
+    adj = [set() for _ in range(m + n)]
+    for r, c, val in basis:
+        x[r, c] = val
+        adj[r].add(m + c)
+        adj[m + c].add(r)
+    is_basic = np.zeros((m, n), dtype=bool)
+    for r, c, _ in basis:
+        is_basic[r, c] = True
+
+    max_iter = max_iter or 50 * (m + n) + 1000
+    scale = eps * max(1.0, float(np.abs(cost).max()))
+    block_rows = max(1, min(block_rows, m))
+    start = 0
+    it = 0
+    u, v = _potentials(m, n, adj, cost)
+    optimal = False
+    while it < max_iter:
+        # partial pricing: scan row blocks until a negative reduced cost is found
+        entering = None
+        scanned = 0
+        while scanned < m:
+            rows = np.arange(start, min(start + block_rows, m))
+            rc = cost[rows] - u[rows, None] - v[None, :]
+            k = int(np.argmin(rc))
+            r_loc, c = divmod(k, n)
+            start = rows[-1] + 1 if rows[-1] + 1 < m else 0
+            scanned += len(rows)
+            if rc[r_loc, c] < -scale:
+                entering = (int(rows[r_loc]), c)
+                break
+        if entering is None:
+            optimal = True
+            break
+
+        r0, c0 = entering
+        rc_in = cost[r0, c0] - u[r0] - v[c0]
+        # cycle: entering cell (+), then alternate along the tree path row r0 -> column c0
+        path = _tree_path(adj, r0, m + c0)
+        cells = []
+        for a, b_ in zip(path[:-1], path[1:]):
+            cells.append((a, b_ - m) if a < m else (b_, a - m))
+        minus = cells[0::2]
+        plus = cells[1::2]
+        theta_cell = min(minus, key=lambda rc_: x[rc_])
+        theta = x[theta_cell]
+        x[r0, c0] += theta
+        for cell in plus:
+            x[cell] += theta
+        for cell in minus:
+            x[cell] -= theta
+        x[theta_cell] = 0.0
+
+        # basis update
+        lr, lc = theta_cell
+        adj[lr].discard(m + lc)
+        adj[m + lc].discard(lr)
+        is_basic[lr, lc] = False
+        # potentials: only the smaller subtree cut off by the leaving cell is shifted
+        side = np.fromiter(_smaller_side(adj, lr, m + lc), dtype=np.int64)
+        side_rows = side[side < m]
+        side_cols = side[side >= m] - m
+        sign = 1.0 if r0 in set(side_rows.tolist()) else -1.0
+        u[side_rows] += sign * rc_in
+        v[side_cols] -= sign * rc_in
+        adj[r0].add(m + c0)
+        adj[m + c0].add(r0)
+        is_basic[r0, c0] = True
+        it += 1
+
+    cells = list(zip(*np.nonzero(is_basic)))
+    return x, u, v, cells, it, optimal
+
+
+def cost_ranging(cost, present, u, v, cells):
+    """
+    Intervalles de coût (SAObjLow, SAObjUp) des cellules existantes pour lesquels la base MODI reste
+    optimale. Cellule hors base : [c - rc, inf). Cellule de base (r, c) : retirer son arête coupe l'arbre
+    en deux ; faire varier son coût de delta décale les potentiels d'un côté et change de +/- delta le
+    coût réduit des cellules hors base qui relient les deux côtés. Avec lignes et colonnes dans l'ordre
+    d'un parcours en profondeur, chaque sous-arbre est un intervalle : les minima hors intervalle se
+    lisent sur des minima préfixes / suffixes. Renvoie deux matrices (m, n) (inf hors cellules existantes).
+    """
+    m, n = cost.shape
+    rc = cost - u[:, None] - v[None, :]
+    is_basic = np.zeros((m, n), dtype=bool)
+    adj = [[] for _ in range(m + n)]
+    for r, c in cells:
+        is_basic[r, c] = True
+        adj[r].append(m + c)
+        adj[m + c].append(r)
+    low = np.where(present, cost - np.maximum(rc, 0.0), np.inf)
+    up = np.full((m, n), np.inf)
+
+    # DFS order (every component), parent of each node, subtree interval [tin, tout)
+    order, parent = [], np.full(m + n, -1)
+    tin, tout = np.zeros(m + n, dtype=np.int64), np.zeros(m + n, dtype=np.int64)
+    seen = np.zeros(m + n, dtype=bool)
+    for root in range(m + n):
+        if seen[root]:
+            continue
+        seen[root] = True
+        stack = [(root, False)]
+        while stack:
+            k, closing = stack.pop()
+            if closing:
+                tout[k] = len(order)
+                continue
+            tin[k] = len(order)
+            order.append(k)
+            stack.append((k, True))
+            for w in adj[k]:
+                if not seen[w]:
+                    seen[w] = True
+                    parent[w] = k
+                    stack.append((w, False))
+    order = np.array(order)
+    is_row = order < m
+    rows_before = np.concatenate([[0], np.cumsum(is_row)])
+    cols_before = np.concatenate([[0], np.cumsum(~is_row)])
+    row_perm, col_perm = order[is_row], order[~is_row] - m
+
+    # reduced costs of non-basic existing cells, rows / columns in DFS order
+    w = np.where(present & ~is_basic, rc, np.inf)[row_perm][:, col_perm]
+    inf_col = np.full((m, 1), np.inf)
+    inf_row = np.full((1, n), np.inf)
+    row_pre = np.concatenate([inf_col, np.minimum.accumulate(w, axis=1)], axis=1)              # min w[i, :j]
+    row_suf = np.concatenate([np.minimum.accumulate(w[:, ::-1], axis=1)[:, ::-1], inf_col], axis=1)  # min w[i, j:]
+    col_pre = np.concatenate([inf_row, np.minimum.accumulate(w, axis=0)], axis=0)
+    col_suf = np.concatenate([np.minimum.accumulate(w[::-1], axis=0)[::-1], inf_row], axis=0)
+
+    for r, c in cells:
+        # child side of the edge in the DFS tree
+        child = m + c if parent[m + c] == r else r
+        ra, rb = rows_before[tin[child]], rows_before[tout[child]]
+        ca, cb = cols_before[tin[child]], cols_before[tout[child]]
+        # rows inside x columns outside, rows outside x columns inside
+        in_out = min(row_pre[ra:rb, ca].min(initial=np.inf), row_suf[ra:rb, cb].min(initial=np.inf))
+        out_in = min(col_pre[ra, ca:cb].min(initial=np.inf), col_suf[rb, ca:cb].min(initial=np.inf))
+        if child == r:
+            # side holding row r moves with it: its rows vs the other columns
+            low[r, c], up[r, c] = cost[r, c] - out_in, cost[r, c] + in_out
+        else:
+            low[r, c], up[r, c] = cost[r, c] - in_out, cost[r, c] + out_in
+    return low, up
+
+
+def solve_transportation(problem, nodes, arcs, costs, tol=1e-7):
+    """
+    Résout le problème de transport et renvoie un résultat au même format que solve_min_cost_flow.
+    Les potentiels et les intervalles de coût (cost_ranging) ne sont renvoyés que si aucun arc n'a
+    été écarté (sinon ils ne garantissent pas la réalisabilité duale sur ces arcs).
+    """
+    cost = problem.cost
+    big = (np.abs(cost[problem.present]).max() + 1.0) * (cost.shape[0] + cost.shape[1]) \
+        if problem.present.any() else 1.0
+    work = np.where(problem.present, cost, big)
+    x, u, v, cells, iters, optimal = modi(work, problem.supply, problem.demand)
+    if not optimal:
+        return {"status": "ITERATION_LIMIT", "obj": None, "flows": {}, "engine": "transport"}
+    if (x[~problem.present] > tol).any():
+        return {"status": "INFEASIBLE", "obj": None, "flows": {}, "engine": "transport"}
+
+    x = np.where(x > tol, x, 0.0)
+    flows = {}
+    obj = 0.0
+    for (i, j) in arcs:
+        cell = problem.arc_cells.get((i, j))
+        val = float(x[cell]) if cell is not None else 0.0
+        flows[f"{i}->{j}"] = val
+        obj += costs.get((i, j), 0.0) * val
+    result = {"status": "OPTIMAL", "obj": obj, "flows": flows, "engine": "transport", "iterations": iters}
+
+    if not problem.ignored:
+        # Gurobi convention for out - in = b: pi_source = u, pi_sink = -v
+        duals = {n_: 0.0 for n_ in nodes}
+        duals.update({s: float(u[r]) for r, s in enumerate(problem.sources)})
+        duals.update({t: float(-v[c]) for c, t in enumerate(problem.sinks)})
+        is_basic = np.zeros(cost.shape, dtype=bool)
+        for r, c in cells:
+            is_basic[r, c] = True
+        cell_r = np.fromiter((problem.arc_cells[a][0] for a in arcs), dtype=np.int64, count=len(arcs))
+        cell_c = np.fromiter((problem.arc_cells[a][1] for a in arcs), dtype=np.int64, count=len(arcs))
+        rc = cost[cell_r, cell_c] - u[cell_r] - v[cell_c]
+        keys = list(flows.keys())
+        result["duals"] = duals
+        result["reduced_costs"] = dict(zip(keys, rc.tolist()))
+        low, up = cost_ranging(cost, problem.present, u, v, cells)
+        result["cost_ranging"] = dict(zip(keys, zip(low[cell_r, cell_c].tolist(), up[cell_r, cell_c].tolist())))
+        result["basis"] = {"vbasis": np.where(is_basic[cell_r, cell_c], 0, -1).tolist(), "cbasis": None}
+    return result
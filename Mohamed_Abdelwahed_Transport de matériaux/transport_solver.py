@@ -0,0 +1,219 @@
+"""
+transport_solver.py
+Modèle Gurobi du flux à coût minimum, utilisable hors de l'IHM
+- construction en O(arcs) (listes d'adjacence au lieu d'un parcours des arcs par nœud)
+- capture des potentiels (duals), coûts réduits, intervalles de sensibilité et de la base optimale
+- redémarrage à chaud depuis une base sauvegardée
+- solve : point d'entrée commun à tous les moteurs (transport, Gurobi, ssp, cost scaling)
+- solve_arrays : même chemin pour une instance en tableaux (ArcArrays), API matricielle Gurobi
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+from transport_engines import ENGINES
+from transport_simplex import detect_transportation, solve_transportation
+
+# Gurobi import (handle absence gracefully)
+try:
+    from gurobipy import Model, GRB, quicksum
+    HAVE_GUROBI = True
+    GUR_ERROR = ""
+except Exception as e:
+    HAVE_GUROBI = False
+    GUR_ERROR = str(e)
+
+
+def arc_key(i, j):
+    return f"{i}->{j}"
+
+
+def balance_with_dummy(nodes, arcs, costs, caps, b, tol=1e-6):
+    """
+    Si sum b_i != 0, ajoute (en place) un nœud Dummy relié à tous les nœuds par des arcs
+    de coût 0 et de capacité |sum b_i| qui absorbe (ou fournit) l'écart.
+    Retourne le nom du nœud ajouté, None si l'instance est déjà équilibrée.
+    """
+    sumb = sum(b.values())
+    if abs(sumb) <= tol:
+        return None
+    dummy = "Dummy"
+    # avoid name clash
+    idx = 1
+    while dummy in nodes:
+        dummy = f"Dummy{idx}"
+        idx += 1
+    nodes.append(dummy)
+    # create arcs to absorb/extract surplus
+    for nd in list(nodes):
+        if nd == dummy:
+            continue
+        arc = (nd, dummy) if sumb > 0 else (dummy, nd)
+        arcs.append(arc)
+        costs[arc] = 0.0
+        caps[arc] = abs(sumb)
+    b[dummy] = -sumb
+    return dummy
+
+
+def solve_min_cost_flow(nodes, arcs, costs, caps, b, silent=True, env=None, basis=None):
+    """
+    Résout min sum c_ij x_ij  s.c.  sum_out x - sum_in x = b_i,  0 <= x_ij <= u_ij.
+    basis : dict {"vbasis": [...], "cbasis": [...]} d'une résolution précédente (même arcs / nœuds)
+    Retourne un dict : status, obj, flows {"i->j": x} et, si optimal,
+    duals {node: pi}, reduced_costs {"i->j": rc}, cost_ranging {"i->j": (low, up)}, basis.
+    """
+    if not HAVE_GUROBI:
+        raise RuntimeError("gurobipy non installé : " + GUR_ERROR)
+
+    m = Model("MinCostFlow", env=env) if env is not None else Model("MinCostFlow")
+    if silent:
+        m.setParam('OutputFlag', 0)
+
+    # create vars
+    x = []
+    for (i, j) in arcs:
+        ub = caps.get((i, j), float('inf'))
+        if ub is None:
+            ub = float('inf')
+        ub_g = ub if (ub != float('inf')) else GRB.INFINITY
+        # variable name without spaces
+        varname = f"x_{i}_{j}".replace(" ", "_")
+        x.append(m.addVar(lb=0.0, ub=ub_g, obj=costs.get((i, j), 0.0), name=varname))
+    m.ModelSense = GRB.MINIMIZE
+
+    # flow conservation: adjacency built once
+    out_vars = {node: [] for node in nodes}
+    in_vars = {node: [] for node in nodes}
+    for k, (i, j) in enumerate(arcs):
+        out_vars.setdefault(i, []).append(x[k])
+        in_vars.setdefault(j, []).append(x[k])
+    constrs = []
+    for node in nodes:
+        rhs = b.get(node, 0.0)
+        constrs.append(m.addConstr(quicksum(out_vars[node]) - quicksum(in_vars[node]) == rhs,
+                                   name=f"flow_{node}".replace(" ", "_")))
+
+    if basis is not None:
+        m.update()
+        vb, cb = basis.get("vbasis"), basis.get("cbasis")
+        if vb is not None and len(vb) == len(x) and cb is not None and len(cb) == len(constrs):
+            m.setAttr("VBasis", x, vb)
+            m.setAttr("CBasis", constrs, cb)
+
+    m.optimize()
+
+    if m.status != GRB.OPTIMAL:
+        return {"status": f"STATUS_{m.status}", "obj": None, "flows": {}}
+
+    xs = m.getAttr("X", x)
+    flows = {arc_key(i, j): float(v) for (i, j), v in zip(arcs, xs)}
+    result = {"status": "OPTIMAL", "obj": float(m.ObjVal), "flows": flows,
+              "runtime": float(m.Runtime)}
+
+    # sensitivity information (LP only)
+    if not m.IsMIP:
+        pis = m.getAttr("Pi", constrs)
+        rcs = m.getAttr("RC", x)
+        lows = m.getAttr("SAObjLow", x)
+        ups = m.getAttr("SAObjUp", x)
+        result["duals"] = {node: float(p) for node, p in zip(nodes, pis)}
+        result["reduced_costs"] = {arc_key(i, j): float(r) for (i, j), r in zip(arcs, rcs)}
+        result["cost_ranging"] = {arc_key(i, j): (float(lo), float(up))
+                                  for (i, j), lo, up in zip(arcs, lows, ups)}
+        try:
+            result["basis"] = {"vbasis": list(m.getAttr("VBasis", x)),
+                               "cbasis": list(m.getAttr("CBasis", constrs))}
+        except Exception:
+            # no basis available (e.g. barrier without crossover)
+            pass
+    return result
+
+
+# engines selectable from the GUI / batch command
+ENGINE_LABELS = {
+    "auto": "Automatique",
+    "gurobi": "Gurobi (LP)",
+    "transport": "Transport (Vogel + MODI)",
+    "ssp": "Plus courts chemins successifs",
+    "cost_scaling": "Cost scaling (push-relabel)",
+}
+
+
+def solve(nodes, arcs, costs, caps, b, silent=True, env=None, basis=None, dummy=None, engine="auto"):
+    """
+    Point d'entrée utilisé par l'IHM et le mode batch.
+    engine :
+      auto         - instance bipartite pure : Vogel + MODI ; sinon Gurobi (ou ssp si gurobipy absent)
+      gurobi       - modèle LP général
+      transport    - Vogel + MODI uniquement (erreur si l'instance n'est pas un problème de transport)
+      ssp          - plus courts chemins successifs (transport_engines)
+      cost_scaling - push-relabel avec mise à l'échelle des coûts (transport_engines)
+    """
+    if engine not in ENGINE_LABELS:
+        raise ValueError(f"Moteur inconnu : {engine}")
+    if engine in ("auto", "transport"):
+        problem = detect_transportation(nodes, arcs, costs, caps, b, dummy=dummy)
+        if problem is not None:
+            result = solve_transportation(problem, nodes, arcs, costs)
+            if result["status"] == "OPTIMAL" or engine == "transport":
+                return result
+        elif engine == "transport":
+            raise ValueError("L'instance n'est pas un problème de transport pur (dépôts -> demandes)")
+    if engine in ENGINES:
+        return ENGINES[engine](nodes, arcs, costs, caps, b)
+    if engine == "auto" and not HAVE_GUROBI:
+        return ENGINES["ssp"](nodes, arcs, costs, caps, b)
+    result = solve_min_cost_flow(nodes, arcs, costs, caps, b, silent=silent, env=env, basis=basis)
+    result["engine"] = "gurobi"
+    return result
+
+
+def solve_min_cost_flow_arrays(inst, silent=True, env=None):
+    """
+    Même modèle que solve_min_cost_flow, construit depuis les tableaux d'arcs avec l'API matricielle
+    (une MVar et une matrice d'incidence creuse) : aucun dict ni tuple par arc.
+    Retourne un dict : status, obj, x (np.ndarray aligné sur les arcs), duals (np.ndarray), runtime.
+    """
+    if not HAVE_GUROBI:
+        raise RuntimeError("gurobipy non installé : " + GUR_ERROR)
+    n, k = inst.n_nodes, inst.n_arcs
+    m = Model("MinCostFlowArrays", env=env) if env is not None else Model("MinCostFlowArrays")
+    if silent:
+        m.setParam('OutputFlag', 0)
+    cap = np.asarray(inst.cap, dtype=np.float64)
+    x = m.addMVar(k, lb=0.0, ub=np.where(np.isinf(cap), GRB.INFINITY, cap),
+                  obj=np.asarray(inst.cost, dtype=np.float64))
+    m.ModelSense = GRB.MINIMIZE
+    rows = np.concatenate([np.asarray(inst.tail), np.asarray(inst.head)])
+    cols = np.concatenate([np.arange(k), np.arange(k)])
+    vals = np.concatenate([np.ones(k), -np.ones(k)])
+    A = sp.csr_matrix((vals, (rows, cols)), shape=(n, k))
+    constrs = m.addMConstr(A, x, "=", np.asarray(inst.b, dtype=np.float64))
+    m.optimize()
+    if m.status != GRB.OPTIMAL:
+        return {"status": f"STATUS_{m.status}", "obj": None, "x": None}
+    return {"status": "OPTIMAL", "obj": float(m.ObjVal), "x": np.asarray(x.X, dtype=np.float64),
+            "duals": np.asarray(constrs.Pi, dtype=np.float64), "runtime": float(m.Runtime),
+            "engine": "gurobi"}
+
+
+def solve_arrays(inst, silent=True, env=None, engine="auto"):
+    """
+    Point d'entrée pour les grandes instances en tableaux (ex. réseau espace-temps).
+    auto / gurobi : modèle matriciel ; sinon conversion en dicts puis solve (ou ssp si gurobipy absent).
+    Le résultat contient toujours x (np.ndarray aligné sur les arcs) si optimal.
+    """
+    if engine not in ENGINE_LABELS:
+        raise ValueError(f"Moteur inconnu : {engine}")
+    if engine in ("auto", "gurobi") and HAVE_GUROBI:
+        return solve_min_cost_flow_arrays(inst, silent=silent, env=env)
+    nodes, arcs, costs, caps, b = inst.to_dicts()
+    result = solve(nodes, arcs, costs, caps, b, silent=silent, env=env, engine=engine)
+    if result["status"] == "OPTIMAL":
+        flows = result["flows"]
+        result["x"] = np.fromiter((flows.get(arc_key(i, j), 0.0) for (i, j) in arcs),
+                                  dtype=np.float64, count=len(arcs))
+    else:
+        result["x"] = None
+    return result
@@ -0,0 +1,201 @@
+"""
+transport_timeexpanded.py
+Plans d'expédition sur plusieurs jours : réseau espace-temps
+- nœud (v, t) = indice t * n + v ; arcs de transport (i, t) -> (j, t + durée), arcs de stockage (v, t) -> (v, t + 1)
+- offres / demandes par période, durée de transit par arc, coût et capacité de stockage par dépôt
+- arcs générés à la demande, période par période, sous forme de tableaux (pas de tuples Python)
+- résolution par le chemin flux à coût minimum existant (transport_solver.solve_arrays)
+- rapport par période : quantités expédiées, stockées, coûts
+- classeur : feuilles costs / caps, "periods" (Node puis une colonne b_i par période),
+  "transit" (matrice des durées, 1 par défaut) et "holding" (Node, cost, cap) facultatives
+"""
+
+import numpy as np
+import pandas as pd
+
+from transport_io import ArcArrays, frames_to_arrays
+from transport_solver import solve_arrays
+
+
+class TimeExpandedNetwork:
+    """
+    base : ArcArrays statique (seuls nodes, tail, head, cost, cap sont utilisés)
+    supply : matrice (n, T) des bilans par dépôt et par période (somme totale nulle)
+    transit : durée (entière, >= 0) de chaque arc de base, en périodes (défaut 1)
+    hold_cost, hold_cap : coût / capacité de stockage d'une période à la suivante (scalaire ou par dépôt)
+    Les expéditions qui arriveraient après l'horizon ne sont pas générées.
+    """
+
+    def __init__(self, base, supply, transit=None, hold_cost=0.0, hold_cap=np.inf):
+        self.base = base
+        self.supply = np.asarray(supply, dtype=np.float64)
+        n = base.n_nodes
+        if self.supply.ndim != 2 or self.supply.shape[0] != n:
+            raise ValueError(f"supply doit être une matrice ({n}, T)")
+        self.n, self.T = n, self.supply.shape[1]
+        self.transit = np.ones(base.n_arcs, dtype=np.int64) if transit is None \
+            else np.asarray(transit, dtype=np.int64)
+        if len(self.transit) != base.n_arcs or (self.transit < 0).any():
+            raise ValueError("transit : une durée entière >= 0 par arc")
+        self.hold_cost = np.broadcast_to(np.asarray(hold_cost, dtype=np.float64), (n,))
+        self.hold_cap = np.broadcast_to(np.asarray(hold_cap, dtype=np.float64), (n,))
+        self.index_dtype = np.int32 if n * self.T < 2 ** 31 else np.int64
+        self._arrays = None
+
+    @property
+    def n_nodes(self):
+        return self.n * self.T
+
+    @property
+    def n_move_arcs(self):
+        return int(np.maximum(self.T - self.transit, 0).sum())
+
+    @property
+    def n_hold_arcs(self):
+        return self.n * max(self.T - 1, 0)
+
+    @property
+    def n_arcs(self):
+        return self.n_move_arcs + self.n_hold_arcs
+
+    def check_balance(self, tol=1e-6):
+        total = float(self.supply.sum())
+        if abs(total) > tol:
+            raise ValueError(f"Somme des b_i sur l'horizon = {total:.4f} (doit être 0)")
+
+    def iter_periods(self):
+        """
+        Génère, pour chaque période de départ t, les arcs partant de t :
+        (t, tail, head, cost, cap, base_arc) où base_arc = -1 - v pour le stockage du dépôt v.
+        """
+        base, n, dt = self.base, self.n, self.index_dtype
+        tail0 = np.asarray(base.tail, dtype=dt)
+        head0 = np.asarray(base.head, dtype=dt)
+        cost0 = np.asarray(base.cost, dtype=np.float64)
+        cap0 = np.asarray(base.cap, dtype=np.float64)
+        depots = np.arange(n, dtype=dt)
+        for t in range(self.T):
+            move = np.flatnonzero(t + self.transit < self.T)
+            tail = t * n + tail0[move]
+            head = (t + self.transit[move]).astype(dt) * n + head0[move]
+            cost, cap, ref = cost0[move], cap0[move], move
+            if t < self.T - 1:
+                tail = np.concatenate([tail, t * n + depots])
+                head = np.concatenate([head, (t + 1) * n + depots])
+                cost = np.concatenate([cost, self.hold_cost])
+                cap = np.concatenate([cap, self.hold_cap])
+                ref = np.concatenate([ref, -1 - depots.astype(np.int64)])
+            yield t, tail, head, cost, cap, ref
+
+    def arrays(self):
+        """Arcs du réseau espace-temps (calculés une fois) : dict de tableaux tail/head/cost/cap/base/period."""
+        if self._arrays is None:
+            m = self.n_arcs
+            out = {"tail": np.empty(m, self.index_dtype), "head": np.empty(m, self.index_dtype),
+                   "cost": np.empty(m), "cap": np.empty(m),
+                   "base": np.empty(m, np.int64), "period": np.empty(m, np.int32)}
+            pos = 0
+            for t, tail, head, cost, cap, ref in self.iter_periods():
+                k = len(tail)
+                for key, arr in (("tail", tail), ("head", head), ("cost", cost), ("cap", cap), ("base", ref)):
+                    out[key][pos:pos + k] = arr
+                out["period"][pos:pos + k] = t
+                pos += k
+            self._arrays = out
+        return self._arrays
+
+    def node_names(self):
+        names = np.asarray(self.base.nodes, dtype=str)
+        suffix = np.char.add("@t", np.arange(self.T).astype(str))
+        return np.char.add(np.tile(names, self.T), np.repeat(suffix, self.n))
+
+    def to_arc_arrays(self):
+        """Instance ArcArrays équivalente (bilans période-majeurs, comme les indices de nœuds)."""
+        a = self.arrays()
+        return ArcArrays(self.node_names(), a["tail"], a["head"], a["cost"], a["cap"],
+                         np.ascontiguousarray(self.supply.T).ravel())
+
+    def report(self, x):
+        """
+        Rapport par période à partir du vecteur de flux x (aligné sur arrays()) :
+        offre, demande, quantité expédiée, coût de transport, stock reporté, coût de stockage.
+        """
+        a = self.arrays()
+        move = a["base"] >= 0
+        T = self.T
+        shipped = np.bincount(a["period"][move], weights=x[move], minlength=T)
+        ship_cost = np.bincount(a["period"][move], weights=(x * a["cost"])[move], minlength=T)
+        stock = np.bincount(a["period"][~move], weights=x[~move], minlength=T)
+        stock_cost = np.bincount(a["period"][~move], weights=(x * a["cost"])[~move], minlength=T)
+        return pd.DataFrame({"period": np.arange(T),
+                             "supply": np.clip(self.supply, 0, None).sum(axis=0),
+                             "demand": np.clip(-self.supply, 0, None).sum(axis=0),
+                             "shipped": shipped, "transport_cost": ship_cost,
+                             "stock": stock, "holding_cost": stock_cost})
+
+    def arc_period_flows(self, x):
+        """Matrice (arcs de base, T) des quantités expédiées par arc et par période de départ."""
+        a = self.arrays()
+        move = a["base"] >= 0
+        out = np.zeros((self.base.n_arcs, self.T))
+        np.add.at(out, (a["base"][move], a["period"][move]), x[move])
+        return out
+
+
+def solve_time_expanded(net, silent=True, env=None, engine="auto"):
+    """
+    Résout le réseau espace-temps par solve_arrays.
+    Retourne un dict : status, obj, engine, x, report (DataFrame par période),
+    arc_flows (matrice arcs de base x périodes), flows {"i->j": total sur l'horizon}.
+    """
+    net.check_balance()
+    result = solve_arrays(net.to_arc_arrays(), silent=silent, env=env, engine=engine)
+    out = {"status": result["status"], "obj": result.get("obj"), "engine": result.get("engine", engine)}
+    if result["status"] != "OPTIMAL":
+        return out
+    x = result["x"]
+    out["x"] = x
+    out["report"] = net.report(x)
+    out["arc_flows"] = net.arc_period_flows(x)
+    names = [str(v) for v in net.base.nodes]
+    totals = out["arc_flows"].sum(axis=1).tolist()
+    out["flows"] = {f"{names[i]}->{names[j]}": v
+                    for i, j, v in zip(net.base.tail.tolist(), net.base.head.tolist(), totals)}
+    return out
+
+
+# ------------ Excel ------------
+def read_excel_time_expanded(path):
+    """Lit un classeur costs / caps / periods (+ transit, holding facultatives)."""
+    sheets = pd.read_excel(path, sheet_name=None, index_col=None)
+    if not all(s in sheets for s in ["costs", "caps", "periods"]):
+        raise ValueError("Le fichier Excel doit contenir les feuilles: costs, caps, periods.")
+    df_cost = sheets["costs"].set_index(sheets["costs"].columns[0])
+    df_caps = sheets["caps"].set_index(sheets["caps"].columns[0])
+    df_per = sheets["periods"]
+    base = frames_to_arrays(df_cost, df_caps, df_per.iloc[:, :2])
+    nodes = [str(v) for v in base.nodes]
+
+    per_nodes = df_per.iloc[:, 0].astype(str).str.strip().to_numpy()
+    values = df_per.iloc[:, 1:].apply(pd.to_numeric, errors="coerce").fillna(0.0)
+    values.index = per_nodes
+    supply = values[~values.index.duplicated(keep="last")].reindex(nodes).fillna(0.0).to_numpy(np.float64)
+
+    transit = None
+    if "transit" in sheets:
+        df_tr = sheets["transit"].set_index(sheets["transit"].columns[0])
+        df_tr.index = [str(r).strip() for r in df_tr.index]
+        df_tr.columns = [str(c).strip() for c in df_tr.columns]
+        mat = df_tr.reindex(index=nodes, columns=nodes).apply(pd.to_numeric, errors="coerce").to_numpy(np.float64)
+        transit = mat[base.tail, base.head]
+        transit = np.where(np.isnan(transit), 1, np.rint(transit)).astype(np.int64)
+
+    hold_cost, hold_cap = 0.0, np.inf
+    if "holding" in sheets:
+        df_h = sheets["holding"]
+        h = df_h.iloc[:, 1:3].apply(pd.to_numeric, errors="coerce")
+        h.index = df_h.iloc[:, 0].astype(str).str.strip().to_numpy()
+        h = h[~h.index.duplicated(keep="last")].reindex(nodes)
+        hold_cost = h.iloc[:, 0].fillna(0.0).to_numpy(np.float64)
+        hold_cap = h.iloc[:, 1].fillna(np.inf).to_numpy(np.float64) if h.shape[1] > 1 else np.inf
+    return TimeExpandedNetwork(base, supply, transit, hold_cost, hold_cap)
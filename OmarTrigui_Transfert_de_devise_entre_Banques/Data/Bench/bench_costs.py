@@ -0,0 +1,92 @@
+"""
+Benchmark : chiffrage des plans par CostEngine (Src/Utils.py).
+
+N transferts et N paiements aléatoires (--currencies devises, valeurs EUR de bench_optimizer), barème
+à paliers avec frais fixe, écart de conversion et intérêt : temps d'un appel vectorisé price(),
+comparé à une boucle Python sur les fonctions scalaires de Utils (mesurée sur --sample lignes,
+extrapolée). Les deux chiffrages sont comparés sur l'échantillon.
+Puis frais de transfert sous S scénarios de change d'un coup (valeurs (S, C)), comme StressEngine.
+
+Usage : python Bench/bench_costs.py [--transfers 1000000 5000000] [--currencies 6] [--scenarios 200]
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_optimizer import CURRENCIES, EUR_VALUE
+from Src.Utils import CostEngine, compute_transfer_cost, compute_conversion_cost
+
+TIERS = ((0.0, 0.002), (10_000.0, 0.001), (100_000.0, 0.0005), (1_000_000.0, 0.0002))
+
+
+def scalar_price(engine, t_cur, t_amount, p_from, p_amount, w):
+    """Référence : une ligne à la fois avec les fonctions scalaires de Utils."""
+    fees = 0.0
+    for c, a in zip(t_cur.tolist(), t_amount.tolist()):
+        value = a * w[c]
+        rate = TIERS[0][1]
+        for threshold, r in TIERS:
+            if value >= threshold:
+                rate = r
+        fees += compute_transfer_cost(value, rate) + (engine.fixed_fee if a > 0 else 0.0)
+    paid = spread = 0.0
+    for f, a in zip(p_from.tolist(), p_amount.tolist()):
+        value = a * w[f]
+        base = value / engine.markup
+        paid += value
+        spread += compute_conversion_cost(base, engine.spread)
+    return fees, paid, spread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Débit du chiffrage vectorisé des plans")
+    parser.add_argument("--transfers", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--currencies", type=int, default=6)
+    parser.add_argument("--scenarios", type=int, default=200)
+    parser.add_argument("--sample", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    engine = CostEngine(tiers=TIERS, fixed_fee=2.0, spread=0.001, interet=0.03)
+    C = args.currencies
+    w = np.array([EUR_VALUE[c] for c in CURRENCIES[:C]])
+    rng = np.random.default_rng(args.seed)
+    print(engine)
+    print(f"{'rows':>10} {'vectorised s':>13} {'M rows/s':>9} {'scalar s (est.)':>16} {'speed-up':>9} "
+          f"{'scenarios s':>12}")
+    for n in args.transfers:
+        t_cur = rng.integers(0, C, n)
+        t_amount = rng.lognormal(9, 2, n) / w[t_cur]
+        p_from = rng.integers(0, C, n)
+        p_amount = rng.lognormal(9, 2, n) / w[p_from]
+
+        t0 = time.perf_counter()
+        total = engine.price(t_cur, t_amount, p_from, p_amount, w)
+        t_vec = time.perf_counter() - t0
+
+        k = min(args.sample, n)
+        t0 = time.perf_counter()
+        fees, paid, spread = scalar_price(engine, t_cur[:k], t_amount[:k], p_from[:k], p_amount[:k], w)
+        t_scalar = (time.perf_counter() - t0) * n / k
+        check = engine.price(t_cur[:k], t_amount[:k], p_from[:k], p_amount[:k], w)
+        assert np.isclose(check["transfer_fees"], fees) and np.isclose(check["payments"], paid) \
+            and np.isclose(check["spread"], spread), "chiffrages différents"
+
+        # transfer fees under S FX scenarios at once (StressEngine.evaluate)
+        m = min(n, 20_000)
+        ws = w[None, :] * np.exp(rng.normal(0.0, 0.01, (args.scenarios, C)))
+        t0 = time.perf_counter()
+        engine.transfer_fees(t_amount[:m], t_cur[:m], ws).sum(axis=1)
+        t_scen = time.perf_counter() - t0
+        print(f"{n:>10,} {t_vec:>13.3f} {2 * n / t_vec / 1e6:>9.1f} {t_scalar:>16.2f} {t_scalar / t_vec:>8.0f}x "
+              f"{t_scen:>12.3f}  ({args.scenarios} x {m:,})")
+        print(f"{'':>10} total {total['total']:,.0f} = paiements {total['payments']:,.0f} "
+              f"(écart {total['spread']:,.0f}, intérêt {total['interest']:,.0f}) + frais {total['transfer_fees']:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
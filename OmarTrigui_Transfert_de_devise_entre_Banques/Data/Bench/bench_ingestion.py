@@ -0,0 +1,113 @@
+"""
+Benchmark : ingestion en continu des ordres de paiement (IngestionService).
+
+Un émetteur asyncio écrit des ordres horodatés (graine fixe) par paquets, dans un fichier suivi en
+continu ou sur un socket TCP local ; le service met à jour les positions nettes et relance
+l'optimisation (anti-rebond) à chaque franchissement de seuil.
+Rapport : débit d'ingestion, latences émetteur -> position et franchissement -> plan, nombre de plans.
+
+Usage : python Bench/bench_ingestion.py [--banks 100] [--messages 200000] [--rate 50000] [--source file|socket]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Src.DataLoader import BankMatrices
+from Src.RateEngine import RateEngine
+from Src.Optimizer import optimize_transfers, optimize_transfers_fast
+from Src.Ingestion import NetPositions, IngestionService, format_metrics
+
+CURRENCIES = ["EUR", "USD"]
+RATES = {("EUR", "USD"): 1.17, ("USD", "EUR"): 0.86}
+
+
+def initial_positions(n_banks, rng):
+    banks = [f"B{k}" for k in range(n_banks)]
+    required = rng.uniform(500, 1500, (n_banks, len(CURRENCIES)))
+    balance = required * rng.uniform(0.95, 1.2, required.shape)
+    return BankMatrices(banks, CURRENCIES, balance, required, np.ones(required.shape, dtype=bool))
+
+
+def instruction_batches(n_banks, n_messages, batch, rng):
+    """Ordres banque -> banque, montants petits devant les soldes (quelques franchissements de seuil)."""
+    for start in range(0, n_messages, batch):
+        k = min(batch, n_messages - start)
+        src = rng.integers(0, n_banks, k)
+        dst = (src + rng.integers(1, n_banks, k)) % n_banks
+        cur = rng.integers(0, len(CURRENCIES), k)
+        amount = rng.uniform(1, 50, k)
+        yield src, dst, cur, amount
+
+
+def lines(src, dst, cur, amount):
+    ts = time.time()
+    return "".join(f"{ts:.6f},B{s},B{d},{CURRENCIES[c]},{a:.2f}\n"
+                   for s, d, c, a in zip(src.tolist(), dst.tolist(), cur.tolist(), amount.tolist()))
+
+
+async def produce(service, args, rng, write):
+    batch = max(1, args.rate // 100)
+    for chunk in instruction_batches(args.banks, args.messages, batch, rng):
+        await write(lines(*chunk))
+        await asyncio.sleep(batch / args.rate)
+    while service.n_messages < args.messages:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(service.max_delay + 0.5)  # laisse partir le dernier plan
+    service.stop()
+
+
+async def run(args):
+    rng = np.random.default_rng(args.seed)
+    positions = NetPositions(initial_positions(args.banks, rng), threshold=0.0)
+    optimize = optimize_transfers_fast if args.fast else optimize_transfers
+    service = IngestionService(positions, RateEngine.from_dict(RATES), optimize=optimize,
+                               debounce=args.debounce, max_delay=args.max_delay)
+    if args.source == "file":
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "instructions.csv")
+            open(path, "w").close()
+            with open(path, "a", encoding="utf-8") as out:
+                async def write(text):
+                    out.write(text)
+                    out.flush()
+                await service.run(service.tail_file(path, poll=0.005), produce(service, args, rng, write))
+    else:
+        async def produce_socket():
+            while service.port is None:
+                await asyncio.sleep(0.01)
+            _, writer = await asyncio.open_connection("127.0.0.1", service.port)
+
+            async def write(text):
+                writer.write(text.encode("utf-8"))
+                await writer.drain()
+            await produce(service, args, rng, write)
+            writer.close()
+        await service.run(service.serve(), produce_socket())
+    return service
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de l'ingestion en continu")
+    parser.add_argument("--banks", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--rate", type=int, default=50_000, help="ordres par seconde visés")
+    parser.add_argument("--source", choices=["file", "socket"], default="file")
+    parser.add_argument("--debounce", type=float, default=0.2)
+    parser.add_argument("--max-delay", type=float, default=1.0)
+    parser.add_argument("--fast", action="store_true", help="aperçu rapide au lieu du PL exact")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    service = asyncio.run(run(args))
+    print(f"source={args.source} banks={args.banks} wall={time.perf_counter() - t0:.2f}s")
+    print(format_metrics(service.metrics()))
+
+
+if __name__ == "__main__":
+    main()
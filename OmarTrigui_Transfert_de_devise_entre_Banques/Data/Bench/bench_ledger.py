@@ -0,0 +1,104 @@
+"""
+Benchmark : registre des plans (Src/Ledger.py), débit d'écriture et de lecture.
+
+Remplit un registre de --rows lignes (runs de --run-rows mouvements aléatoires répartis sur --days
+jours, --banks banques, --currencies devises), puis mesure les parcours par memmap : agrégats par
+devise (valeur de référence), par jour, par banque émettrice x devise, mouvement net banque x devise
+sur un mois, rejeu d'un run. Débit en lignes/s et Mo/s des colonnes lues ; le pic d'allocations
+pendant les agrégats (tracemalloc, hors pages memmap du cache système) montre que l'historique
+n'est pas chargé en entier.
+
+Usage : python Bench/bench_ledger.py [--rows 20000000] [--run-rows 200000] [--days 90] [--path DIR]
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tracemalloc
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Src.Ledger import PlanLedger, COLUMNS, DAY_NS, PAYMENT
+
+
+def fill(ledger, rows, run_rows, days, n_banks, n_cur, rng):
+    ledger.banks[:] = [f"B{k}" for k in range(n_banks)]
+    ledger.currencies[:] = [f"C{k}" for k in range(n_cur)]
+    ledger.bank_index = {b: k for k, b in enumerate(ledger.banks)}
+    ledger.cur_index = {c: k for k, c in enumerate(ledger.currencies)}
+    ledger._save_labels()
+    n_runs = -(-rows // run_rows)
+    t0 = 1_700_000_000 * 10 ** 9
+    values = np.exp(rng.uniform(-3, 1, n_cur))
+    for r in range(n_runs):
+        n = min(run_rows, rows - r * run_rows)
+        kind = (rng.random(n) < 0.5).astype(np.int8)
+        cur = rng.integers(0, n_cur, n)
+        ledger.append_rows({"kind": kind, "src": rng.integers(0, n_banks, n), "dst": rng.integers(0, n_banks, n),
+                            "currency": cur, "counter": np.where(kind == PAYMENT, rng.integers(0, n_cur, n), -1),
+                            "amount": rng.lognormal(8, 1.5, n), "rate": values[cur]},
+                           timestamp=t0 + int(r / n_runs * days * DAY_NS))
+
+
+def timed(label, columns, n_rows, fn):
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    mb = n_rows * sum(np.dtype(COLUMNS[c]).itemsize for c in columns) / 2 ** 20
+    print(f"{label:>34} {elapsed:>8.3f}s {n_rows / elapsed / 1e6:>9.1f} M lignes/s {mb / elapsed:>8.0f} Mo/s")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Débit du registre des plans")
+    parser.add_argument("--rows", type=int, default=20_000_000)
+    parser.add_argument("--run-rows", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--banks", type=int, default=1000)
+    parser.add_argument("--currencies", type=int, default=30)
+    parser.add_argument("--path", default=None, help="dossier du registre (temporaire par défaut)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    path = args.path or tempfile.mkdtemp(prefix="ledger_")
+    try:
+        ledger = PlanLedger(path)
+        if len(ledger) < args.rows:
+            t0 = time.perf_counter()
+            fill(ledger, args.rows, args.run_rows, args.days, args.banks, args.currencies,
+                 np.random.default_rng(args.seed))
+            elapsed = time.perf_counter() - t0
+            print(f"écriture : {len(ledger):,} lignes, {len(ledger.runs)} runs en {elapsed:.2f}s "
+                  f"({len(ledger) / elapsed / 1e6:.1f} M lignes/s)")
+        ledger = PlanLedger(path)  # reopen: memmaps only
+        n = len(ledger)
+        size = sum(os.path.getsize(ledger._file(c)) for c in COLUMNS) / 2 ** 20
+        print(f"registre : {n:,} lignes, {size:,.0f} Mo sur disque")
+        tracemalloc.start()
+
+        timed("par devise (valeur)", ["currency", "amount", "rate"], n,
+              lambda: ledger.aggregate(("currency",), value="value"))
+        timed("par jour (nombre)", ["timestamp", "amount"], n, lambda: ledger.aggregate(("day",), value="count"))
+        timed("par banque émettrice x devise", ["src", "currency", "amount"], n,
+              lambda: ledger.aggregate(("src", "currency")))
+        timed("paiements par devise x contrepartie", ["kind", "currency", "counter", "amount"], n,
+              lambda: ledger.aggregate(("currency", "counter"), kind=PAYMENT))
+        start = ledger.runs[0]["timestamp"]
+        month = sum(b - a for a, b in ledger.segments(start, start + 30 * DAY_NS))
+        timed("mouvement net, 30 premiers jours", ["src", "dst", "currency", "amount"], month,
+              lambda: ledger.net_positions(start, start + 30 * DAY_NS))
+        print(f"pic d'allocations pendant les agrégats : {tracemalloc.get_traced_memory()[1] / 2 ** 20:,.0f} Mo "
+              f"(morceaux de {ledger.chunk:,} lignes)")
+        tracemalloc.stop()
+        last = ledger.runs[-1]
+        timed("rejeu du dernier run (dicts)", ["kind", "src", "dst", "currency", "counter", "amount"],
+              last["stop"] - last["start"], lambda: ledger.replay(last["run"]))
+    finally:
+        if args.path is None:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark : compensation bilatérale et multilatérale (Src/Netting.py).
+
+Ordres aléatoires (graine fixe) entre n banques dans plusieurs devises. Pour chaque taille : temps,
+nombre d'ordres et volume avant / après, écart maximal des positions nettes (doit rester ~0).
+
+Usage : python Bench/bench_netting.py [--banks 100 1000 10000] [--orders 100000 1000000] [--currencies 4]
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Src.Optimizer import TransferBatch
+from Src.Netting import positions, bilateral_net, multilateral_net, netting_report
+
+
+def random_orders(n_banks, n_orders, n_cur, rng):
+    src = rng.integers(0, n_banks, n_orders)
+    dst = (src + rng.integers(1, n_banks, n_orders)) % n_banks
+    cur = rng.integers(0, n_cur, n_orders)
+    amount = np.round(rng.lognormal(6, 1.5, n_orders), 2)
+    return TransferBatch([f"B{k}" for k in range(n_banks)], [f"C{k}" for k in range(n_cur)], src, dst, cur, amount)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de la compensation des transferts")
+    parser.add_argument("--banks", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--orders", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--currencies", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'banks':>6} {'orders':>9} {'mode':>13} {'time(s)':>8} {'after':>9} "
+          f"{'volume before':>15} {'volume after':>15} {'max pos err':>12}")
+    for n in args.banks:
+        for m in args.orders:
+            batch = random_orders(n, m, args.currencies, np.random.default_rng(args.seed))
+            ref = positions(n, args.currencies, batch.src, batch.dst, batch.cur, batch.amount)
+            for name, net in (("bilateral", bilateral_net), ("multilateral", multilateral_net)):
+                t0 = time.perf_counter()
+                out = net(batch)
+                dt = time.perf_counter() - t0
+                total = netting_report(batch, out)["total"]
+                err = np.abs(positions(n, args.currencies, out.src, out.dst, out.cur, out.amount) - ref).max()
+                print(f"{n:>6} {m:>9} {name:>13} {dt:>8.3f} {total['count_after']:>9} "
+                      f"{total['volume_before']:>15,.0f} {total['volume_after']:>15,.0f} {err:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark : optimiseur exact (PL creux) et aperçu rapide (appariement trié) contre l'heuristique
+gloutonne historique.
+
+Instances aléatoires (graine fixe) : n banques, devises EUR / USD (+ autres devises pour l'exact seul),
+soldes et besoins tirés autour de la même moyenne. Pour chaque instance : temps, valeur des paiements,
+besoins non couverts après application du plan.
+
+Usage : python Bench/bench_optimizer.py [--banks 10 100 1000 5000] [--currencies 2 4] [--seed 0]
+"""
+import os
+import sys
+import copy
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Src.Optimizer import (optimize_transfers_greedy, solve_exact, match_transfers, to_matrices, plan_cost,
+                           plan_shortfall, currency_values)
+
+CURRENCIES = ["EUR", "USD", "GBP", "CHF", "JPY", "CAD"]
+EUR_VALUE = {"EUR": 1.0, "USD": 0.86, "GBP": 1.15, "CHF": 1.07, "JPY": 0.0058, "CAD": 0.62}
+
+
+def random_instance(n_banks, n_cur, rng):
+    """Dicts au format DataLoader ; taux cohérents (valeur EUR) avec un petit écart aléatoire."""
+    curs = CURRENCIES[:n_cur]
+    banks = [f"B{k}" for k in range(n_banks)]
+    balances, required = {}, {}
+    for c in curs:
+        scale = 10000 / EUR_VALUE[c]
+        bal = rng.uniform(0.2, 1.8, n_banks) * scale
+        req = rng.uniform(0.2, 1.8, n_banks) * scale
+        for b, x, y in zip(banks, bal.tolist(), req.tolist()):
+            balances[(b, c)] = x
+            required[(b, c)] = y
+    rates = {(f, c): EUR_VALUE[f] / EUR_VALUE[c] * rng.uniform(0.99, 1.01) for f in curs for c in curs if f != c}
+    return banks, balances, required, rates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exact / rapide contre glouton")
+    parser.add_argument("--banks", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--currencies", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'banks':>6} {'cur':>4} {'method':>7} {'time(s)':>9} {'payments':>14} {'shortfall':>14} "
+          f"{'transfers':>10}")
+    for n_cur in args.currencies:
+        for n in args.banks:
+            banks, balances, required, rates = random_instance(n, n_cur, np.random.default_rng(args.seed))
+            names, curs, bal, req, R = to_matrices(banks, balances, required, rates)
+            rows = []
+
+            t0 = time.perf_counter()
+            result = solve_exact(names, curs, bal, req, R)
+            t_exact = time.perf_counter() - t0
+            rows.append(("exact", t_exact, result["transfers"], result["conversions"]))
+
+            t0 = time.perf_counter()
+            tr, conv = match_transfers(names, curs, bal, req, R)
+            rows.append(("fast", time.perf_counter() - t0, tr.as_dict(), conv.as_dict()))
+
+            if n_cur == 2:
+                # the greedy baseline only knows EUR / USD and mutates its input
+                t0 = time.perf_counter()
+                tr, conv = optimize_transfers_greedy(banks, copy.deepcopy(balances), required, rates)
+                rows.append(("greedy", time.perf_counter() - t0, tr, conv))
+
+            pos = {c: k for k, c in enumerate(curs)}
+            w = currency_values(R)
+            for method, elapsed, tr, conv in rows:
+                short = plan_shortfall(banks, balances, required, tr, conv)
+                short_value = sum(v * w[pos[c]] for (_, c), v in short.items())
+                print(f"{n:>6} {n_cur:>4} {method:>7} {elapsed:>9.3f} {plan_cost(conv, curs, R):>14,.0f} "
+                      f"{short_value:>14,.0f} {len(tr):>10}")
+
+
+if __name__ == "__main__":
+    main()
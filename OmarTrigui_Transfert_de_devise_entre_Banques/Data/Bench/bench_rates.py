@@ -0,0 +1,70 @@
+"""
+Benchmark : moteur de meilleurs taux (RateEngine).
+
+Graphe de taux aléatoire (graine fixe) : C devises, une fraction des couples cotée, taux cohérents
+avec une valeur par devise et un écart acheteur / vendeur (pas d'arbitrage).
+Pour chaque taille : Floyd-Warshall complet, mise à jour incrémentale d'un taux (amélioration puis
+dégradation d'un arc utilisé), et lecture d'un taux.
+
+Usage : python Bench/bench_rates.py [--currencies 10 50 200] [--density 0.3] [--ticks 50] [--seed 0]
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Src.RateEngine import RateEngine
+
+
+def random_rates(C, density, rng):
+    value = rng.uniform(0.01, 2.0, C)
+    R = np.full((C, C), np.nan)
+    quoted = rng.random((C, C)) < density
+    R[quoted] = (value[:, None] / value[None, :] * rng.uniform(0.97, 0.999, (C, C)))[quoted]
+    return value, R
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du moteur de meilleurs taux")
+    parser.add_argument("--currencies", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'cur':>5} {'full(s)':>9} {'better(ms)':>11} {'worse(ms)':>10} {'lookup(us)':>11} {'check':>6}")
+    for C in args.currencies:
+        rng = np.random.default_rng(args.seed)
+        value, R = random_rates(C, args.density, rng)
+        t0 = time.perf_counter()
+        engine = RateEngine(range(C), R)
+        full = time.perf_counter() - t0
+
+        better = worse = 0.0
+        for _ in range(args.ticks):
+            u, v = rng.choice(C, 2, replace=False)
+            t0 = time.perf_counter()
+            engine.update_rate(u, v, value[u] / value[v] * 0.999)
+            better += time.perf_counter() - t0
+            path = engine.path(u, (v + 1) % C if (v + 1) % C != u else (v + 2) % C)
+            if len(path) >= 2:
+                t0 = time.perf_counter()
+                engine.update_rate(path[0], path[1], value[path[0]] / value[path[1]] * 0.9)
+                worse += time.perf_counter() - t0
+
+        pairs = [(int(i), int(j)) for i, j in rng.integers(0, C, (1000, 2)) if i != j]
+        t0 = time.perf_counter()
+        for pair in pairs:
+            engine.get(pair)
+        lookup = (time.perf_counter() - t0) / max(len(pairs), 1)
+
+        ref = RateEngine(range(C), engine.direct)
+        same = np.allclose(np.nan_to_num(engine.best, nan=-1), np.nan_to_num(ref.best, nan=-1))
+        print(f"{C:>5} {full:>9.3f} {better / args.ticks * 1e3:>11.2f} {worse / args.ticks * 1e3:>10.2f} "
+              f"{lookup * 1e6:>11.2f} {'ok' if same else 'DIFF':>6}")
+
+
+if __name__ == "__main__":
+    main()
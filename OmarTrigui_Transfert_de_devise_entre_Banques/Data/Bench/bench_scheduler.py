@@ -0,0 +1,59 @@
+"""
+Benchmark : planification intrajournalière à horizon glissant (Src/Scheduler.py).
+
+Instance aléatoire de bench_optimizer (graine fixe), T fenêtres : besoins modulés par un profil
+en cloche sur la journée, flux externes aléatoires. Temps de construction du modèle, puis temps
+par pas (seconds membres / résolution / extraction) pour chaque horizon k demandé, comparé à un
+PL complet sur toute la journée (k = T).
+
+Usage : python Bench/bench_scheduler.py [--banks 100] [--currencies 3] [--windows 24] [--horizons 1 2 4 8]
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_optimizer import random_instance
+from Src.Optimizer import to_matrices
+from Src.Scheduler import RollingScheduler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du planificateur à horizon glissant")
+    parser.add_argument("--banks", type=int, default=100)
+    parser.add_argument("--currencies", type=int, default=3)
+    parser.add_argument("--windows", type=int, default=24)
+    parser.add_argument("--horizons", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--flow-vol", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    banks, balances, required, rates = random_instance(args.banks, args.currencies, rng)
+    banks, currencies, bal, req, R = to_matrices(banks, balances, required, rates)
+    T = args.windows
+    profile = 0.8 + 0.4 * np.sin(np.linspace(0, np.pi, T))
+    flows = rng.normal(0.0, args.flow_vol, (T,) + bal.shape) * bal[None]
+
+    print(f"banks={args.banks} currencies={args.currencies} windows={T}")
+    print(f"{'k':>4} {'build s':>8} {'rhs ms':>8} {'solve ms':>9} {'max ms':>8} {'extract ms':>11} "
+          f"{'cost':>14} {'shortfall':>12}")
+    for k in sorted(set(args.horizons) | {T}):
+        scheduler = RollingScheduler(banks, currencies, bal, req[None] * profile[:, None, None], flows, R, horizon=k)
+        t0 = time.perf_counter()
+        steps = scheduler.run()
+        total = time.perf_counter() - t0
+        times = scheduler.timings() * 1e3
+        cost = sum(s["cost"] or 0.0 for s in steps)
+        short = sum(float(s["shortfall"].sum()) for s in steps)
+        label = f"{k}" if k < T else f"{k}*"
+        print(f"{label:>4} {scheduler.build_time:>8.3f} {times[:, 0].mean():>8.2f} {times[:, 1].mean():>9.1f} "
+              f"{times[:, 1].max():>8.1f} {times[:, 2].mean():>11.2f} {cost:>14,.0f} {short:>12,.0f}  ({total:.2f}s)")
+    print("* k = T : journée entière à chaque pas")
+
+
+if __name__ == "__main__":
+    main()
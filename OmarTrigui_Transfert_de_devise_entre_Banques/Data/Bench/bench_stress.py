@@ -0,0 +1,65 @@
+"""
+Benchmark : stress test Monte-Carlo du plan de transferts (Src/Stress.py).
+
+Instance aléatoire de bench_optimizer (graine fixe), plan exact, puis S scénarios de change et de
+soldes : temps de l'évaluation vectorisée, temps de ré-optimisation des scénarios en rupture
+(pool de processus), et temps estimé d'un optimize_transfers par scénario (mesuré sur quelques-uns).
+
+Usage : python Bench/bench_stress.py [--banks 100] [--currencies 2] [--scenarios 10000] [--max-reopt 500] [--workers 4]
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_optimizer import random_instance
+from Src.Optimizer import optimize_transfers, to_matrices, solve_exact
+from Src.Stress import StressEngine
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du stress test Monte-Carlo")
+    parser.add_argument("--banks", type=int, default=100)
+    parser.add_argument("--currencies", type=int, default=2)
+    parser.add_argument("--scenarios", type=int, default=10_000)
+    parser.add_argument("--fx-vol", type=float, default=0.006)
+    parser.add_argument("--bal-vol", type=float, default=0.01)
+    parser.add_argument("--max-reopt", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    banks, balances, required, rates = random_instance(args.banks, args.currencies, np.random.default_rng(args.seed))
+    transfers, conversions = optimize_transfers(banks, balances, required, rates)
+    engine = StressEngine.from_dicts(banks, balances, required, rates, transfers, conversions)
+
+    t0 = time.perf_counter()
+    engine.run(args.scenarios, args.fx_vol, args.bal_vol, seed=args.seed, reoptimize=False)
+    t_eval = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    result = engine.run(args.scenarios, args.fx_vol, args.bal_vol, seed=args.seed,
+                        max_reopt=args.max_reopt, workers=args.workers)
+    t_full = time.perf_counter() - t0
+
+    # naive reference: one exact solve per scenario, timed on a few
+    _, currencies, bal, req, R = to_matrices(banks, balances, required, rates)
+    rng = np.random.default_rng(args.seed)
+    z, shock = engine.sample(5, args.fx_vol, args.bal_vol, rng=rng)
+    t0 = time.perf_counter()
+    for k in range(len(z)):
+        solve_exact(banks, currencies, bal * shock[k], req, engine.scenario_rates(z[k]))
+    t_naive = (time.perf_counter() - t0) / len(z) * args.scenarios
+
+    print(f"banks={args.banks} currencies={args.currencies} scenarios={args.scenarios}")
+    print(f"evaluation vectorisée : {t_eval:.3f}s | avec ré-optimisation : {t_full:.2f}s "
+          f"| un PL par scénario (estimé) : {t_naive:.1f}s")
+    for key, value in result.summary().items():
+        print(f"  {key:>24} : {value:,.4f}" if isinstance(value, float) else f"  {key:>24} : {value}")
+
+
+if __name__ == "__main__":
+    main()
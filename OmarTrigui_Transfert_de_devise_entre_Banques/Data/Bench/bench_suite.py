@@ -0,0 +1,173 @@
+"""
+Suite de benchmarks sur instances synthétiques (Src/Generator.py) : chargement, optimisation et
+visualisation chronométrés séparément, contrôle de faisabilité, comparaison à une référence.
+
+Pour chaque configuration, Banks.csv / Rates.csv sont générés (graine fixe) puis :
+  load       DataLoader sans cache (lecture CSV) et avec cache npz
+  optimize   optimize_transfers (exact) et optimize_transfers_fast (aperçu rapide)
+  visualize  visualize_graph sur une Figure Agg, rendu compris
+  contrôles  plan exact : aucun compte sous min(solde, 0) ni sous son besoin (les instances générées
+             sont couvrables : besoins = tightness x soldes par banque et par devise) ; aperçu rapide :
+             aucun compte à découvert, comptes non couverts comptés et comparés à la référence
+
+Références : --save écrit Bench/baseline_suite.json ; sans --save, les mesures sont comparées à ce
+fichier et le code de sortie vaut 1 si un temps dépasse la référence de plus de --time-tol (relatif),
+si le coût des paiements, les besoins non couverts ou les découverts augmentent, ou si un contrôle échoue.
+
+Usage : python Bench/bench_suite.py [--configs small medium large xl] [--repeat 3] [--save] [--time-tol 0.5]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import scipy
+from Src.DataLoader import DataLoader
+from Src.Generator import InstanceSpec, write_instance
+from Src.Optimizer import (optimize_transfers, optimize_transfers_fast, to_matrices, plan_cost, plan_shortfall,
+                           currency_values)
+from Src.Visualizer import visualize_graph
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_suite.json")
+
+# name -> (InstanceSpec arguments, methods)
+CONFIGS = {
+    "small": (dict(n_banks=50, n_currencies=3), ("exact", "fast")),
+    "medium": (dict(n_banks=300, n_currencies=6), ("exact", "fast")),
+    "large": (dict(n_banks=1000, n_currencies=10), ("exact", "fast")),
+    # exact LP with 1000 x 30 accounts and 870 currency pairs is beyond a benchmark run
+    "xl": (dict(n_banks=1000, n_currencies=30), ("fast",)),
+    "noisy": (dict(n_banks=300, n_currencies=6, imbalance=1.0, rate_noise=0.05, rate_density=0.5), ("exact", "fast")),
+}
+
+OPTIMIZERS = {
+    "exact": optimize_transfers,
+    "fast": lambda *args: tuple(batch.as_dict() for batch in optimize_transfers_fast(*args)),
+}
+
+
+def best_of(repeat, fn):
+    """(meilleur temps sur repeat appels, résultat du dernier appel)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def run_config(name, data_dir, repeat):
+    params, methods = CONFIGS[name]
+    spec = InstanceSpec(**params)
+    write_instance(spec, data_dir)
+
+    def load(use_cache):
+        loader = DataLoader(data_dir, use_cache=use_cache)
+        banks, balances, required = loader.load_banks_data()
+        return banks, balances, required, loader.load_rates()
+
+    t_cold, _ = best_of(repeat, lambda: load(False))
+    load(True)  # builds the npz cache
+    t_warm, (banks, balances, required, rates) = best_of(repeat, lambda: load(True))
+    _, currencies, _, _, R = to_matrices(banks, balances, required, rates)
+    w = dict(zip(currencies, currency_values(R).tolist()))
+    floor = {k: min(v, 0.0) for k, v in balances.items()}
+
+    results = {}
+    for method in methods:
+        t_opt, (transfers, conversions) = best_of(repeat, lambda: OPTIMIZERS[method](banks, balances, required, rates))
+
+        def draw():
+            figure = Figure(figsize=(10, 7))
+            canvas = FigureCanvasAgg(figure)
+            visualize_graph(transfers, conversions, figure.add_subplot())
+            canvas.draw()
+            figure.clear()
+        t_vis, _ = best_of(repeat, draw)
+
+        short = plan_shortfall(banks, balances, required, transfers, conversions)
+        overdraft = plan_shortfall(banks, balances, floor, transfers, conversions)
+        # the fast preview may leave needs uncovered (tracked against the baseline) but never overdraws
+        checks = {"overdraft": not overdraft, "covered": not short} if method == "exact" else {"overdraft": not overdraft}
+        results[method] = {
+            "load_s": t_cold, "load_cached_s": t_warm, "optimize_s": t_opt, "visualize_s": t_vis,
+            "transfers": len(transfers), "conversions": len(conversions),
+            "cost": plan_cost(conversions, currencies, R),
+            "short_accounts": len(short), "short_value": float(sum(v * w[c] for (_, c), v in short.items())),
+            "overdraft_accounts": len(overdraft),
+            "checks": checks,
+        }
+    return spec.as_dict(), results
+
+
+def compare(name, method, cur, base, time_tol, min_time):
+    """Liste des régressions de cur par rapport à base (mêmes configuration et méthode)."""
+    issues = []
+    for key in ("load_s", "load_cached_s", "optimize_s", "visualize_s"):
+        if key in base and cur[key] > base[key] * (1 + time_tol) and cur[key] - base[key] > min_time:
+            issues.append(f"{key} {base[key]:.3f}s -> {cur[key]:.3f}s")
+    for key in ("cost", "short_value", "overdraft_accounts"):
+        if key in base and cur[key] > base[key] * (1 + 1e-4) + 1e-6:
+            issues.append(f"{key} {base[key]:,.2f} -> {cur[key]:,.2f}")
+    return [f"{name}/{method}: {issue}" for issue in issues]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de benchmarks sur instances synthétiques")
+    parser.add_argument("--configs", nargs="+", default=list(CONFIGS), choices=list(CONFIGS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", action="store_true", help="enregistre les mesures comme référence")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--time-tol", type=float, default=0.5, help="ralentissement relatif toléré")
+    parser.add_argument("--min-time", type=float, default=0.02, help="écart absolu ignoré (s)")
+    parser.add_argument("--instances", default=None, help="dossier où garder les CSV générés")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("configs", {})
+
+    report, failures = {}, []
+    print(f"{'config':>7} {'method':>6} {'load':>7} {'cached':>7} {'optimize':>9} {'visualize':>10} "
+          f"{'transfers':>10} {'payments':>14} {'short':>6} {'overdr':>6} {'checks':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.instances or tmp
+        for name in args.configs:
+            spec, results = run_config(name, os.path.join(root, name), args.repeat)
+            report[name] = {"spec": spec, "results": results}
+            for method, r in results.items():
+                ok = all(r["checks"].values())
+                print(f"{name:>7} {method:>6} {r['load_s']:>7.3f} {r['load_cached_s']:>7.3f} {r['optimize_s']:>9.3f} "
+                      f"{r['visualize_s']:>10.3f} {r['transfers']:>10} {r['cost']:>14,.0f} {r['short_accounts']:>6} "
+                      f"{r['overdraft_accounts']:>6} {('OK' if ok else 'ÉCHEC') if r['checks'] else '-':>7}")
+                if not ok:
+                    failures.append(f"{name}/{method}: contrôle échoué {r['checks']}")
+                base = baseline.get(name)
+                if base is not None and base["spec"] == spec and method in base["results"]:
+                    failures += compare(name, method, r, base["results"][method], args.time_tol, args.min_time)
+
+    if args.save:
+        meta = {"python": platform.python_version(), "numpy": np.__version__, "scipy": scipy.__version__,
+                "machine": platform.machine(), "processor": platform.processor()}
+        with open(args.baseline, "w") as f:
+            json.dump({"meta": meta, "configs": report}, f, indent=1, sort_keys=True)
+        print(f"référence enregistrée : {args.baseline}")
+    elif not baseline:
+        print("pas de référence : python Bench/bench_suite.py --save")
+    for failure in failures:
+        print("RÉGRESSION", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Benchmark : rendu du graphe des transferts (Src/Visualizer.py).
+
+Plans aléatoires (graine fixe) de m transferts entre n banques, chacun avec son paiement.
+Compare la version annotée (une flèche + un texte par flux, jusqu'à --annotated-max flux)
+au rendu par collections (premier rendu, rendu répété avec positions en cache, filtre par devise).
+Temps mesurés jusqu'au canvas.draw() (backend Agg).
+
+Usage : python Bench/bench_visualizer.py [--sizes 20:100 100:1000 1000:20000] [--top-k 200] [--annotated-max 2000]
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Src.Visualizer import GraphRenderer, visualize_graph_annotated
+
+
+def random_plan(n_banks, n_transfers, rng):
+    src = rng.integers(0, n_banks, n_transfers)
+    dst = (src + rng.integers(1, n_banks, n_transfers)) % n_banks
+    cur = rng.choice(["EUR", "USD"], n_transfers)
+    amount = rng.lognormal(7, 1.5, n_transfers)
+    transfers, conversions = {}, {}
+    for s, d, c, a in zip(src.tolist(), dst.tolist(), cur.tolist(), amount.tolist()):
+        transfers[(f"B{s}", f"B{d}", c)] = transfers.get((f"B{s}", f"B{d}", c), 0.0) + a
+        other = "EUR" if c == "USD" else "USD"
+        key = (f"B{d}", f"B{s}", other, c)
+        conversions[key] = conversions.get(key, 0.0) + a * 1.03
+    return transfers, conversions
+
+
+def timed(draw, fig):
+    t0 = time.perf_counter()
+    draw()
+    fig.canvas.draw()
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du rendu du graphe des transferts")
+    parser.add_argument("--sizes", nargs="+", default=["20:100", "100:1000", "1000:20000"],
+                        help="couples banques:transferts")
+    parser.add_argument("--top-k", type=int, default=200)
+    parser.add_argument("--annotated-max", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'banks':>6} {'transfers':>10} {'flows':>7} {'shown':>6} {'annotated(s)':>13} "
+          f"{'first(s)':>9} {'cached(s)':>10} {'USD only(s)':>12}")
+    for size in args.sizes:
+        n, m = (int(v) for v in size.split(":"))
+        transfers, conversions = random_plan(n, m, np.random.default_rng(args.seed))
+        t_ann = float("nan")
+        if len(transfers) + len(conversions) <= args.annotated_max:
+            fig, ax = plt.subplots(figsize=(10, 7))
+            t_ann = timed(lambda: visualize_graph_annotated(transfers, conversions, ax), fig)
+            plt.close(fig)
+
+        fig, ax = plt.subplots(figsize=(10, 7))
+        renderer = GraphRenderer(ax, top_k=args.top_k)
+        info = {}
+        t_first = timed(lambda: info.update(renderer.draw(transfers, conversions)), fig)
+        t_cached = timed(lambda: renderer.draw(transfers, conversions), fig)
+        renderer.currencies = ["USD"]
+        t_usd = timed(lambda: renderer.draw(transfers, conversions), fig)
+        plt.close(fig)
+        print(f"{n:>6} {m:>10} {info['flows']:>7} {info['shown']:>6} {t_ann:>13.3f} "
+              f"{t_first:>9.3f} {t_cached:>10.3f} {t_usd:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
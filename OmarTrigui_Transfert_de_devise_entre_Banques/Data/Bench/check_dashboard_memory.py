@@ -0,0 +1,134 @@
+"""
+Vérification : la mémoire reste stable sur N optimisations successives (fenêtre de résultats unique).
+
+Avec un affichage (DISPLAY), BankApp est créée pour de vrai : à chaque tour, les soldes du tableau
+sont perturbés puis run_optimization() est appelé (exact et aperçu rapide en alternance).
+Sans affichage, le même plan passe par PlanView.update() (Src/Dashboard.py), la partie de
+ResultsDashboard.show() sans Tk, sur une Figure Agg.
+Mesures : mémoire Python (tracemalloc), RSS, nombre de widgets Tk et de figures pyplot ouvertes.
+Code de sortie 1 si la mémoire croît de plus de --max-growth Mo entre le tour --warmup et le dernier.
+La croissance résiduelle vient du cache LRU des métriques de texte de matplotlib (étiquettes de
+montants toutes différentes) : borné, il se stabilise vers 5 Mo après quelques milliers de rendus.
+
+Usage : python Bench/check_dashboard_memory.py [--runs 1000] [--warmup 100] [--max-growth 2]
+"""
+import os
+import sys
+import argparse
+import tracemalloc
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import matplotlib
+if not os.environ.get("DISPLAY"):
+    matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from Src.Optimizer import optimize_transfers, optimize_transfers_fast
+from Src.Dashboard import PlanView
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        return float("nan")
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(w) for w in widget.winfo_children())
+
+
+class HeadlessRun:
+    """ResultsDashboard.show() sans Tk : PlanView sur une Figure Agg."""
+
+    def __init__(self):
+        from Src.DataLoader import DataLoader
+        from Src.RateEngine import RateEngine
+        loader = DataLoader("Data")
+        self.banks, self.balances, self.required = loader.load_banks_data()
+        self.base = dict(self.balances)
+        self.rates = RateEngine.from_loader(loader)
+        self.figure = Figure(figsize=(10, 7))
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.view = PlanView(self.figure.add_subplot())
+
+    def step(self, k, rng):
+        for key, value in self.base.items():
+            self.balances[key] = value * rng.uniform(0.8, 1.2)
+        if k % 2:
+            t, c = optimize_transfers_fast(list(self.banks), self.balances, self.required, self.rates)
+            transfers, conversions = t.as_dict(), c.as_dict()
+        else:
+            transfers, conversions = optimize_transfers(list(self.banks), self.balances, self.required, self.rates)
+        self.view.update(transfers, conversions)
+        self.canvas.draw()
+
+    def widgets(self):
+        return 0
+
+    def close(self):
+        self.figure.clear()
+
+
+class TkRun:
+    """BankApp réelle, fenêtre principale masquée."""
+
+    def __init__(self):
+        import tkinter as tk
+        from Src.gui import BankApp
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.app = BankApp(self.root)
+        model = self.app.table.model
+        self.base = [bal for _, _, bal, _ in model.rows(0, len(model))]
+
+    def step(self, k, rng):
+        model = self.app.table.model
+        for row, bal in enumerate(self.base):
+            model.set_value(row, "Balance", bal * rng.uniform(0.8, 1.2))
+        self.app.table.refresh()
+        self.app.run_optimization(fast=bool(k % 2))
+        self.root.update()
+
+    def widgets(self):
+        return count_widgets(self.root)
+
+    def close(self):
+        self.app.on_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mémoire de la fenêtre de résultats sur N optimisations")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--max-growth", type=float, default=2.0, help="croissance tolérée (Mo)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    run = TkRun() if os.environ.get("DISPLAY") else HeadlessRun()
+    print(f"mode : {'Tk' if isinstance(run, TkRun) else 'sans affichage'}")
+    rng = np.random.default_rng(args.seed)
+    tracemalloc.start()
+    ref = None
+    print(f"{'run':>6} {'python MiB':>11} {'rss MiB':>9} {'widgets':>8} {'figures':>8}")
+    for k in range(1, args.runs + 1):
+        run.step(k, rng)
+        if k == args.warmup:
+            ref = (tracemalloc.get_traced_memory()[0], run.widgets(), len(plt.get_fignums()))
+        if k % max(1, args.runs // 10) == 0 or k == args.warmup:
+            print(f"{k:>6} {tracemalloc.get_traced_memory()[0] / 2 ** 20:>11.2f} {rss_mb():>9.1f} "
+                  f"{run.widgets():>8} {len(plt.get_fignums()):>8}")
+    end = (tracemalloc.get_traced_memory()[0], run.widgets(), len(plt.get_fignums()))
+    run.close()
+    growth = (end[0] - ref[0]) / 2 ** 20
+    ok = growth <= args.max_growth and end[1] == ref[1] and end[2] == ref[2]
+    print(f"croissance après {args.warmup} tours : {growth:+.2f} Mo, widgets {ref[1]} -> {end[1]}, "
+          f"figures {ref[2]} -> {end[2]} : {'OK' if ok else 'ÉCHEC'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Vérification : reprise du registre des plans (Src/Ledger.py) après un ajout interrompu.
+
+Pour chaque coupure, 3 runs sont écrits, puis un 4e ajout est interrompu : octets en trop dans
+les colonnes et ligne de runs.jsonl tronquée (au milieu, ou juste avant son retour à la ligne).
+Le registre est rouvert, un run est ajouté, puis le registre est rouvert une seconde fois :
+on attend 4 runs, des colonnes de la bonne longueur et la colonne run cohérente avec runs.jsonl.
+Code de sortie 1 si un cas échoue.
+
+Usage : python Bench/check_ledger_recovery.py
+"""
+import os
+import sys
+import json
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Src.Ledger import PlanLedger, COLUMNS
+
+
+def rows(n, rng):
+    return {"kind": np.zeros(n, dtype=np.int8), "src": rng.integers(0, 5, n), "dst": rng.integers(0, 5, n),
+            "currency": rng.integers(0, 3, n), "counter": np.full(n, -1), "amount": rng.uniform(1, 100, n),
+            "rate": np.ones(n)}
+
+
+def tear(path, cut):
+    """Ajout interrompu : colonnes écrites en partie, ligne de runs.jsonl coupée (cut : garde cut(ligne) octets)."""
+    for name in COLUMNS:
+        with open(os.path.join(path, name + ".col"), "ab") as f:
+            f.write(b"\x00" * 5)
+    line = json.dumps({"run": 3, "timestamp": 0, "start": 0, "stop": 0, "reference": "", "meta": {}}) + "\n"
+    with open(os.path.join(path, "runs.jsonl"), "a") as f:
+        f.write(line[:cut(line)])
+
+
+def check(cut, rng):
+    with tempfile.TemporaryDirectory() as path:
+        ledger = PlanLedger(path)
+        for n in (4, 7, 2):
+            ledger.append_rows(rows(n, rng))
+        tear(path, cut)
+        PlanLedger(path).append_rows(rows(5, rng))
+        ledger = PlanLedger(path)
+        run = np.asarray(ledger.column("run"))
+        expected = np.repeat(np.arange(len(ledger.runs)), [r["stop"] - r["start"] for r in ledger.runs])
+        sizes = {name: os.path.getsize(os.path.join(path, name + ".col")) // np.dtype(dtype).itemsize
+                 for name, dtype in COLUMNS.items()}
+        return (len(ledger.runs) == 4 and len(ledger) == 18 and set(sizes.values()) == {18}
+                and np.array_equal(run, expected))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    cases = {"ligne coupée au milieu": lambda line: len(line) // 2,
+             "ligne sans retour à la ligne": lambda line: len(line) - 1}
+    ok = True
+    for label, cut in cases.items():
+        passed = check(cut, rng)
+        ok &= passed
+        print(f"{label:<30} {'OK' if passed else 'ÉCHEC'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
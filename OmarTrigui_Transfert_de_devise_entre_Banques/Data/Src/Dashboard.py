@@ -0,0 +1,160 @@
+#Fenêtre de résultats persistante : mise à jour sur place à chaque optimisation
+
+import difflib
+import tkinter as tk
+from tkinter import ttk
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from Src.Visualizer import GraphRenderer
+from Src.Netting import net_transfers
+
+COLUMNS = (("Type", "Type"), ("From", "De"), ("To", "Vers"), ("Currency", "Devise"), ("Amount", "Montant"))
+
+
+# ------------ contenu (sans Tk) ------------
+def plan_rows(transfers, conversions):
+    """Lignes du tableau : {iid: valeurs}, l'iid identifie le flux d'un plan à l'autre."""
+    rows = {}
+    for (src, dst, cur), amt in transfers.items():
+        rows[f"T|{src}|{dst}|{cur}"] = ("Transfert", src, dst, cur, f"{amt:,.2f}")
+    for (dst, src, from_cur, to_cur), amt in conversions.items():
+        rows[f"C|{dst}|{src}|{from_cur}|{to_cur}"] = ("Paiement", dst, src, f"{from_cur} -> {to_cur}", f"{amt:,.2f}")
+    return rows
+
+
+def plan_lines(transfers, conversions):
+    """Texte des explications, ligne par ligne (même contenu que l'ancienne fenêtre)."""
+    lines = ["Transferts :"]
+    lines += [f"- {src} transfère {amt:,.2f} {cur} à {dst}" for (src, dst, cur), amt in transfers.items()]
+    lines += ["", "Conversions :"]
+    lines += [f"- {dst} reçoit {to_cur} et paie {amt:,.2f} {from_cur} à {src}"
+              for (dst, src, from_cur, to_cur), amt in conversions.items()]
+    # Règlement compensé : transferts et paiements réduits aux positions nettes
+    netted, report = net_transfers(transfers, conversions)
+    total = report["total"]
+    lines += ["", f"Compensation multilatérale : {total['count_before']} ordres ({total['volume_before']:,.2f}) "
+                  f"-> {total['count_after']} ordres ({total['volume_after']:,.2f})"]
+    lines += [f"- {src} règle {amt:,.2f} {cur} à {dst}" for (src, dst, cur), amt in netted.as_dict().items()]
+    return lines
+
+
+def diff_rows(old, new):
+    """(iids supprimés, {iid: valeurs} modifiés, [(iid, valeurs)] ajoutés dans l'ordre de new)."""
+    removed = [iid for iid in old if iid not in new]
+    changed = {iid: v for iid, v in new.items() if iid in old and old[iid] != v}
+    added = [(iid, v) for iid, v in new.items() if iid not in old]
+    return removed, changed, added
+
+
+def text_edits(old, new):
+    """Opérations (début, fin, nouvelles lignes) sur les lignes de old, à appliquer de la fin vers le début."""
+    matcher = difflib.SequenceMatcher(a=old, b=new, autojunk=False)
+    return [(i1, i2, new[j1:j2]) for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()) if tag != "equal"]
+
+
+class PlanView:
+    """
+    Contenu de la fenêtre de résultats, sans Tk : texte, lignes du tableau et graphe du dernier plan.
+    update() dessine le nouveau plan et renvoie les différences avec le précédent, que
+    ResultsDashboard applique à ses widgets.
+    """
+
+    def __init__(self, ax, top_k=200):
+        self.renderer = GraphRenderer(ax, top_k=top_k)
+        self.lines = []
+        self.rows = {}
+
+    def update(self, transfers, conversions):
+        """-> (opérations sur le texte (text_edits), différence du tableau (diff_rows), infos du graphe)."""
+        lines = plan_lines(transfers, conversions)
+        rows = plan_rows(transfers, conversions)
+        edits = text_edits(self.lines, lines)
+        table = diff_rows(self.rows, rows)
+        info = self.renderer.draw(transfers, conversions)
+        self.lines, self.rows = lines, rows
+        return edits, table, info
+
+
+class ResultsDashboard:
+    """
+    Une seule fenêtre de résultats (onglets explications / détail / graphe), créée au premier
+    appel de show() puis mise à jour sur place : texte et tableau modifiés par différence avec le
+    plan précédent, artistes du graphe réutilisés (PlanView). Fermer la fenêtre la masque ;
+    destroy() ferme la figure et détruit les widgets.
+    """
+
+    def __init__(self, master, top_k=200):
+        self.master = master
+        self.top_k = top_k
+        self.window = None
+
+    def _build(self):
+        self.window = tk.Toplevel(self.master)
+        self.window.title("Résultats de l'optimisation")
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)
+        self.status = tk.Label(self.window, text="", anchor="w")
+        self.status.pack(fill="x", padx=10, pady=(5, 0))
+        notebook = ttk.Notebook(self.window)
+        notebook.pack(fill="both", expand=True, padx=10, pady=10)
+
+        tab_text = tk.Frame(notebook)
+        tk.Label(tab_text, text="Explications étape par étape", font=("Helvetica", 14), fg="red").pack(pady=5)
+        self.text = tk.Text(tab_text, height=20, width=80, state="disabled")
+        self.text.pack(fill="both", expand=True)
+        notebook.add(tab_text, text="Explications")
+
+        tab_table = tk.Frame(notebook)
+        self.tree = ttk.Treeview(tab_table, columns=[c for c, _ in COLUMNS], show="headings")
+        for col, label in COLUMNS:
+            self.tree.heading(col, text=label)
+        scroll = ttk.Scrollbar(tab_table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+        notebook.add(tab_table, text="Détail")
+
+        tab_graph = tk.Frame(notebook)
+        # Figure hors pyplot : pas de registre global, libérée avec la fenêtre
+        self.figure = Figure(figsize=(10, 7))
+        self.view = PlanView(self.figure.add_subplot(), top_k=self.top_k)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=tab_graph)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        notebook.add(tab_graph, text="Graphe")
+
+    def show(self, transfers, conversions, title=""):
+        if self.window is None:
+            self._build()
+        edits, table, info = self.view.update(transfers, conversions)
+        self._update_text(edits)
+        self._update_table(*table)
+        self.canvas.draw_idle()
+        self.status.config(text=f"{title}{len(transfers)} transferts, {len(conversions)} conversions, "
+                                f"{info['shown']} flux affichés sur {info['flows']}")
+        self.window.deiconify()
+        self.window.lift()
+
+    def _update_text(self, edits):
+        if not edits:
+            return
+        self.text.config(state="normal")
+        for start, stop, new in edits:
+            self.text.delete(f"{start + 1}.0", f"{stop + 1}.0")
+            if new:
+                self.text.insert(f"{start + 1}.0", "".join(line + "\n" for line in new))
+        self.text.config(state="disabled")
+
+    def _update_table(self, removed, changed, added):
+        if removed:
+            self.tree.delete(*removed)
+        for iid, values in changed.items():
+            self.tree.item(iid, values=values)
+        for iid, values in added:
+            self.tree.insert("", "end", iid=iid, values=values)
+
+    def destroy(self):
+        if self.window is None:
+            return
+        self.figure.clear()
+        self.canvas.get_tk_widget().destroy()
+        self.window.destroy()
+        self.window = None
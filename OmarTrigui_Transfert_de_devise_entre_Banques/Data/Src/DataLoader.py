@@ -1,45 +1,198 @@
 import pandas as pd
+import numpy as np
 import os
 
+# Types explicites : banque / devise en catégories (codes entiers), montants en float64
+BANK_DTYPES = {"bank": "category", "currency": "category", "balance": np.float64, "required": np.float64}
+RATE_DTYPES = {"from_currency": "category", "to_currency": "category", "rate": np.float64}
+CACHE_VERSION = 1
+
+
+class BankMatrices:
+    """
+    Soldes et besoins sous forme de matrices denses banque x devise.
+    banks, currencies : libellés triés (indépendants de la taille des morceaux de lecture)
+    balance, required : np.ndarray (n_banks, n_currencies) float64
+    present : masque des couples (banque, devise) présents dans le fichier
+    """
+
+    def __init__(self, banks, currencies, balance, required, present):
+        self.banks = list(banks)
+        self.currencies = list(currencies)
+        self.balance = balance
+        self.required = required
+        self.present = present
+
+    def to_dicts(self):
+        """Même format que l'ancien load_banks_data : (banks, balances, required)."""
+        b_idx, c_idx = np.nonzero(self.present)
+        keys = list(zip(np.asarray(self.banks, dtype=object)[b_idx].tolist(),
+                        np.asarray(self.currencies, dtype=object)[c_idx].tolist()))
+        balances = dict(zip(keys, self.balance[b_idx, c_idx].tolist()))
+        required = dict(zip(keys, self.required[b_idx, c_idx].tolist()))
+        return list(self.banks), balances, required
+
+
+def _merge_codes(series, labels, index):
+    """
+    Codes globaux d'une colonne catégorielle lue par morceaux : seules les catégories du morceau
+    (peu nombreuses) sont comparées au dictionnaire global, les lignes restent des entiers.
+    """
+    cats = series.cat.categories.astype(str).str.strip()
+    local = np.empty(len(cats), dtype=np.int64)
+    for k, name in enumerate(cats):
+        code = index.get(name)
+        if code is None:
+            code = index[name] = len(labels)
+            labels.append(name)
+        local[k] = code
+    codes = series.cat.codes.to_numpy()
+    return np.where(codes >= 0, local[np.maximum(codes, 0)], -1)
+
+
+def _sorted_labels(labels, *codes):
+    """Trie les libellés et renumérote les codes en conséquence."""
+    order = np.argsort(np.asarray(labels, dtype=str), kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return [labels[k] for k in order.tolist()], tuple(rank[c] for c in codes)
+
+
+def _last_wins(rows, cols, n_cols, *values):
+    """Garde la dernière occurrence de chaque couple (ligne, colonne), comme l'écrasement d'un dict."""
+    flat = rows * n_cols + cols
+    _, first_rev = np.unique(flat[::-1], return_index=True)
+    keep = len(flat) - 1 - first_rev
+    return (rows[keep], cols[keep]) + tuple(v[keep] for v in values)
+
+
 class DataLoader:
-    def __init__(self, data_dir="Data"):
-        base_dir = os.path.dirname(os.path.abspath(__file__))  
+    def __init__(self, data_dir="Data", chunksize=1_000_000, use_cache=True):
+        base_dir = os.path.dirname(os.path.abspath(__file__))
 
-        # 📌 On remonte au dossier Data puis Data2
-        self.data_dir = os.path.join(base_dir, "..", "Data")  # -> .../Data/Data
+        # 📌 On remonte au dossier Data puis Data2 ; un chemin absolu est pris tel quel
+        self.data_dir = os.path.join(base_dir, "..", data_dir)  # -> .../Data/Data
 
         self.banks_file = os.path.join(self.data_dir, "Banks.csv")
         self.rates_file = os.path.join(self.data_dir, "Rates.csv")
+        self.cache_dir = os.path.join(self.data_dir, ".cache")
+        self.chunksize = chunksize
+        self.use_cache = use_cache
 
-    def load_banks_data(self):
-        df = pd.read_csv(self.banks_file)
-        df = df.dropna(how='all')  # Supprimer les lignes vides
-        
-        banks_set = set()
-        balances = {}
-        required = {}
-        for _, row in df.iterrows():
-            bank = str(row['bank']).strip()
-            currency = str(row['currency']).strip()
-            balance = float(row['balance'])
-            req = float(row['required'])
-            banks_set.add(bank)
-            balances[(bank, currency)] = balance
-            required[(bank, currency)] = req
-        banks = list(banks_set)
-        return banks, balances, required
+    # ------------ cache binaire (invalidé par mtime / taille du CSV) ------------
+    def _cache_path(self, csv_path, tag=""):
+        # tag : résultat dérivé du même CSV (ex. "best" pour les meilleurs taux de RateEngine)
+        name = os.path.basename(csv_path) + (f".{tag}" if tag else "")
+        return os.path.join(self.cache_dir, name + ".npz")
 
-    def load_rates(self):
-        df = pd.read_csv(self.rates_file)
-        df = df.dropna(how='all')  # Supprimer les lignes vides
-        
-        rates = {}
-        for _, row in df.iterrows():
-            from_cur = str(row['from_currency']).strip()
-            to_cur = str(row['to_currency']).strip()
-            rate = float(row['rate'])
-            rates[(from_cur, to_cur)] = rate
-        return rates
+    def _read_cache(self, csv_path, tag=""):
+        if not self.use_cache:
+            return None
+        path = self._cache_path(csv_path, tag)
+        if not os.path.exists(path):
+            return None
+        st = os.stat(csv_path)
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                meta = npz["meta"]
+                if meta.tolist() != [CACHE_VERSION, st.st_mtime_ns, st.st_size]:
+                    return None
+                return {k: npz[k] for k in npz.files if k != "meta"}
+        except (OSError, ValueError, KeyError):
+            # cache corrompu ou d'un autre format : on relit le CSV
+            return None
+
+    def _write_cache(self, csv_path, tag="", **arrays):
+        if not self.use_cache:
+            return
+        st = os.stat(csv_path)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_path(csv_path, tag)
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, meta=np.array([CACHE_VERSION, st.st_mtime_ns, st.st_size], dtype=np.int64), **arrays)
+        os.replace(tmp, path)
+
+    # ------------ lecture vectorisée ------------
+    def load_bank_matrices(self):
+        """Banks.csv -> BankMatrices, lecture par morceaux de chunksize lignes."""
+        cached = self._read_cache(self.banks_file)
+        if cached is not None:
+            return BankMatrices(cached["banks"].tolist(), cached["currencies"].tolist(),
+                                cached["balance"], cached["required"], cached["present"])
+
+        banks, currencies = [], []
+        bank_index, cur_index = {}, {}
+        parts = []
+        reader = pd.read_csv(self.banks_file, dtype=BANK_DTYPES, chunksize=self.chunksize,
+                             usecols=list(BANK_DTYPES), skipinitialspace=True)
+        for df in reader:
+            df = df.dropna(how='all')  # Supprimer les lignes vides
+            b = _merge_codes(df["bank"], banks, bank_index)
+            c = _merge_codes(df["currency"], currencies, cur_index)
+            ok = (b >= 0) & (c >= 0)
+            parts.append((b[ok], c[ok], df["balance"].to_numpy()[ok], df["required"].to_numpy()[ok]))
 
+        shape = (len(banks), len(currencies))
+        balance = np.zeros(shape)
+        required = np.zeros(shape)
+        present = np.zeros(shape, dtype=bool)
+        if parts:
+            b, c, bal, req = (np.concatenate(p) for p in zip(*parts))
+            banks, (b,) = _sorted_labels(banks, b)
+            currencies, (c,) = _sorted_labels(currencies, c)
+            b, c, bal, req = _last_wins(b, c, shape[1], bal, req)
+            balance[b, c] = bal
+            required[b, c] = req
+            present[b, c] = True
 
+        self._write_cache(self.banks_file, banks=np.asarray(banks, dtype=str),
+                          currencies=np.asarray(currencies, dtype=str),
+                          balance=balance, required=required, present=present)
+        return BankMatrices(banks, currencies, balance, required, present)
 
+    def load_rate_matrix(self, currencies=None):
+        """
+        Rates.csv -> (currencies, R) avec R[i, j] = taux from i to j (NaN si absent, 1 sur la diagonale).
+        currencies : ordre imposé (ex. BankMatrices.currencies) ; les devises inconnues sont ajoutées à la fin.
+        """
+        cached = self._read_cache(self.rates_file)
+        if cached is not None:
+            labels = cached["currencies"].tolist()
+            src, dst, val = cached["src"], cached["dst"], cached["rate"]
+        else:
+            labels, index, parts = [], {}, []
+            reader = pd.read_csv(self.rates_file, dtype=RATE_DTYPES, chunksize=self.chunksize,
+                                 usecols=list(RATE_DTYPES), skipinitialspace=True)
+            for df in reader:
+                df = df.dropna(how='all')  # Supprimer les lignes vides
+                s = _merge_codes(df["from_currency"], labels, index)
+                d = _merge_codes(df["to_currency"], labels, index)
+                ok = (s >= 0) & (d >= 0)
+                parts.append((s[ok], d[ok], df["rate"].to_numpy()[ok]))
+            if parts:
+                src, dst, val = (np.concatenate(p) for p in zip(*parts))
+                labels, (src, dst) = _sorted_labels(labels, src, dst)
+                src, dst, val = _last_wins(src, dst, max(len(labels), 1), val)
+            else:
+                src = dst = np.zeros(0, dtype=np.int64)
+                val = np.zeros(0)
+            self._write_cache(self.rates_file, currencies=np.asarray(labels, dtype=str), src=src, dst=dst, rate=val)
+
+        order = list(currencies) if currencies is not None else []
+        order += [c for c in labels if c not in set(order)]
+        pos = {c: k for k, c in enumerate(order)}
+        remap = np.array([pos[c] for c in labels], dtype=np.int64)
+        R = np.full((len(order), len(order)), np.nan)
+        np.fill_diagonal(R, 1.0)
+        if len(val):
+            R[remap[src], remap[dst]] = val
+        return order, R
+
+    def load_banks_data(self):
+        return self.load_bank_matrices().to_dicts()
+
+    def load_rates(self):
+        currencies, R = self.load_rate_matrix()
+        src, dst = np.nonzero(~np.isnan(R) & ~np.eye(len(currencies), dtype=bool))
+        labels = np.asarray(currencies, dtype=object)
+        return dict(zip(zip(labels[src].tolist(), labels[dst].tolist()), R[src, dst].tolist()))
@@ -0,0 +1,102 @@
+#Génération d'instances synthétiques au format Banks.csv / Rates.csv (graine fixe)
+
+import os
+import numpy as np
+import pandas as pd
+from Src.DataLoader import BankMatrices
+
+# Devises usuelles puis codes génériques ; valeur EUR approximative des premières, tirée au hasard ensuite
+ISO_CODES = ["EUR", "USD", "GBP", "CHF", "JPY", "CAD", "AUD", "SEK", "NOK", "DKK", "PLN", "CZK", "HUF", "TND",
+             "MAD", "CNY", "HKD", "SGD", "INR", "BRL", "MXN", "ZAR", "TRY", "KRW", "NZD", "ILS", "AED", "SAR",
+             "THB", "IDR"]
+EUR_VALUE = {"EUR": 1.0, "USD": 0.86, "GBP": 1.15, "CHF": 1.07, "JPY": 0.0058, "CAD": 0.62, "AUD": 0.56,
+             "SEK": 0.09, "NOK": 0.085, "DKK": 0.134, "PLN": 0.235, "CZK": 0.041, "HUF": 0.0026, "TND": 0.29,
+             "MAD": 0.093, "CNY": 0.12}
+
+
+class InstanceSpec:
+    """
+    Paramètres d'une instance synthétique.
+    n_banks, n_currencies : taille (codes ISO puis C31, C32... au-delà de 30 devises)
+    imbalance : dispersion de l'écart solde - besoin (0 : chaque banque exactement à son besoin)
+    tightness : besoins / soldes en valeur, par banque et par devise (< 1 : marge pour les paiements)
+    rate_noise : écart relatif des taux cotés aux taux croisés cohérents (0 : aucun arbitrage)
+    rate_density : part des couples de devises cotés (les couples avec EUR le sont toujours)
+    coverage : part des couples banque x devise présents dans Banks.csv
+    """
+
+    def __init__(self, n_banks=100, n_currencies=3, imbalance=0.8, tightness=0.9, rate_noise=0.01,
+                 rate_density=1.0, coverage=1.0, seed=0):
+        self.n_banks = n_banks
+        self.n_currencies = n_currencies
+        self.imbalance = imbalance
+        self.tightness = tightness
+        self.rate_noise = rate_noise
+        self.rate_density = rate_density
+        self.coverage = coverage
+        self.seed = seed
+
+    def as_dict(self):
+        return dict(vars(self))
+
+    def __repr__(self):
+        return "InstanceSpec(" + ", ".join(f"{k}={v}" for k, v in vars(self).items()) + ")"
+
+
+def currency_codes(n):
+    return ISO_CODES[:n] + [f"C{k + 1:02d}" for k in range(len(ISO_CODES), n)]
+
+
+def generate_instance(spec):
+    """InstanceSpec -> (BankMatrices, currencies, R) ; R[f, c] NaN pour un couple non coté."""
+    rng = np.random.default_rng(spec.seed)
+    n, C = spec.n_banks, spec.n_currencies
+    currencies = currency_codes(C)
+    value = np.array([EUR_VALUE.get(c, 0.0) for c in currencies])
+    unknown = value == 0
+    value[unknown] = np.exp(rng.uniform(np.log(1e-3), np.log(2.0), unknown.sum()))
+
+    # bank sizes are heavy-tailed; each bank splits its size over currencies
+    size = rng.lognormal(0.0, 1.0, n) * 10000
+    mix = rng.dirichlet(np.full(C, 0.5), n)
+    mix[:, 0] += 0.2
+    mix /= mix.sum(axis=1, keepdims=True)
+    scale = size[:, None] * mix * C / value[None, :]
+    balance = scale * np.maximum(1.0 + spec.imbalance * rng.uniform(-1.0, 1.0, (n, C)), 0.0)
+    required = scale * np.maximum(1.0 + spec.imbalance * rng.uniform(-1.0, 1.0, (n, C)), 0.0)
+    present = rng.random((n, C)) < spec.coverage
+    present[np.arange(n), rng.integers(0, C, n)] = True
+    balance[~present] = 0.0
+    required[~present] = 0.0
+
+    # fit required (in value) to tightness x balance per bank and per currency: every bank can pay for
+    # what it receives and every currency holds enough in total
+    req_value = required * value
+    rows = spec.tightness * (balance * value).sum(axis=1)
+    cols = spec.tightness * (balance * value).sum(axis=0)
+    for _ in range(50):
+        req_value *= (rows / np.maximum(req_value.sum(axis=1), 1e-300))[:, None]
+        req_value *= (cols / np.maximum(req_value.sum(axis=0), 1e-300))[None, :]
+    required = req_value / value
+
+    R = value[:, None] / value[None, :] * np.exp(rng.normal(0.0, spec.rate_noise, (C, C)))
+    quoted = rng.random((C, C)) < spec.rate_density
+    quoted[0, :] = quoted[:, 0] = True
+    R[~quoted] = np.nan
+    np.fill_diagonal(R, 1.0)
+    banks = [f"B{k:0{len(str(n - 1))}d}" for k in range(n)]
+    return BankMatrices(banks, currencies, balance, required, present), currencies, R
+
+
+def write_instance(spec, data_dir):
+    """Écrit Banks.csv / Rates.csv (schéma de DataLoader) dans data_dir ; renvoie generate_instance(spec)."""
+    matrices, currencies, R = generate_instance(spec)
+    os.makedirs(data_dir, exist_ok=True)
+    b, c = np.nonzero(matrices.present)
+    pd.DataFrame({"bank": np.asarray(matrices.banks)[b], "currency": np.asarray(currencies)[c],
+                  "balance": matrices.balance[b, c].round(2), "required": matrices.required[b, c].round(2)}
+                 ).to_csv(os.path.join(data_dir, "Banks.csv"), index=False)
+    f, t = np.nonzero(~np.isnan(R) & ~np.eye(len(currencies), dtype=bool))
+    pd.DataFrame({"from_currency": np.asarray(currencies)[f], "to_currency": np.asarray(currencies)[t],
+                  "rate": R[f, t]}).to_csv(os.path.join(data_dir, "Rates.csv"), index=False, float_format="%.10g")
+    return matrices, currencies, R
@@ -0,0 +1,275 @@
+#Ingestion en continu des ordres de paiement (asyncio) et positions nettes incrémentales
+
+import asyncio
+import time
+import numpy as np
+from Src.DataLoader import BankMatrices
+from Src.Optimizer import optimize_transfers
+
+# Une ligne par ordre : horodatage (time.time() de l'émetteur),banque débitée,banque créditée,devise,montant
+# banque débitée vide : dépôt externe ; banque créditée vide : retrait externe
+FIELDS = ("timestamp", "src_bank", "dst_bank", "currency", "amount")
+
+
+class NetPositions:
+    """
+    Soldes / besoins banque x devise mis à jour en O(1) par ordre (tableaux numpy, croissance par doublement).
+    short[b, c] : required - balance > threshold ; apply() renvoie le nombre de cases qui changent d'état.
+    """
+
+    def __init__(self, matrices, threshold=0.0):
+        self.banks = list(matrices.banks)
+        self.currencies = list(matrices.currencies)
+        self.bank_index = {b: k for k, b in enumerate(self.banks)}
+        self.cur_index = {c: k for k, c in enumerate(self.currencies)}
+        self.threshold = threshold
+        self.balance = np.array(matrices.balance, dtype=np.float64)
+        self.required = np.array(matrices.required, dtype=np.float64)
+        self.present = np.array(matrices.present, dtype=bool)
+        self.short = self.required - self.balance > threshold
+
+    def _bank(self, name):
+        k = self.bank_index.get(name)
+        if k is None:
+            k = self.bank_index[name] = len(self.banks)
+            self.banks.append(name)
+            if k == len(self.balance):
+                self._grow(2 * k + 1, self.balance.shape[1])
+        return k
+
+    def _currency(self, name):
+        k = self.cur_index.get(name)
+        if k is None:
+            k = self.cur_index[name] = len(self.currencies)
+            self.currencies.append(name)
+            if k == self.balance.shape[1]:
+                self._grow(self.balance.shape[0], 2 * k + 1)
+        return k
+
+    def _grow(self, n_banks, n_cur):
+        for name in ("balance", "required", "present", "short"):
+            old = getattr(self, name)
+            new = np.zeros((n_banks, n_cur), dtype=old.dtype)
+            new[:old.shape[0], :old.shape[1]] = old
+            setattr(self, name, new)
+
+    def _move(self, b, c, delta):
+        self.balance[b, c] += delta
+        self.present[b, c] = True
+        short = self.required[b, c] - self.balance[b, c] > self.threshold
+        crossed = short != self.short[b, c]
+        self.short[b, c] = short
+        return int(crossed)
+
+    def apply(self, src, dst, currency, amount):
+        c = self._currency(currency)
+        crossed = 0
+        if src:
+            crossed += self._move(self._bank(src), c, -amount)
+        if dst:
+            crossed += self._move(self._bank(dst), c, amount)
+        return crossed
+
+    def matrices(self):
+        """Copie figée des positions (BankMatrices), indépendante des ordres suivants."""
+        n, m = len(self.banks), len(self.currencies)
+        return BankMatrices(self.banks[:], self.currencies[:], self.balance[:n, :m].copy(),
+                            self.required[:n, :m].copy(), self.present[:n, :m].copy())
+
+    def n_short(self):
+        return int(self.short.sum())
+
+
+class LatencyBuffer:
+    """Tampon circulaire de latences (secondes) pour les percentiles."""
+
+    def __init__(self, size=100_000):
+        self.values = np.zeros(size)
+        self.count = 0
+
+    def add(self, value):
+        self.values[self.count % len(self.values)] = value
+        self.count += 1
+
+    def percentiles(self, q=(50, 95, 99)):
+        if not self.count:
+            return {f"p{p}": float("nan") for p in q}
+        data = self.values[:min(self.count, len(self.values))]
+        return {f"p{p}": float(v) for p, v in zip(q, np.percentile(data, q))}
+
+
+class IngestionService:
+    """
+    Lit un flux d'ordres (fichier suivi en continu ou socket TCP), met à jour les positions nettes et
+    relance l'optimisation quand des déficits franchissent le seuil.
+
+    Anti-rebond : l'optimisation part debounce secondes après le dernier franchissement, au plus
+    max_delay secondes après le premier ; elle tourne dans un thread (run_in_executor) sur une copie
+    des positions, sans bloquer la lecture. on_plan(plan, info) reçoit le résultat de optimize.
+    """
+
+    def __init__(self, positions, rates, optimize=optimize_transfers, interet=0.03,
+                 debounce=0.2, max_delay=2.0, on_plan=None):
+        self.positions = positions
+        self.rates = rates
+        self.optimize = optimize
+        self.interet = interet
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.on_plan = on_plan
+        self.n_messages = 0
+        self.n_errors = 0
+        self.n_plans = 0
+        self.first_seen = None
+        self.last_seen = None
+        self.ingest_latency = LatencyBuffer()
+        self.plan_latency = LatencyBuffer(10_000)
+        self.last_plan = None
+        self.last_error = None
+        self._first_cross = None   # réception locale du premier franchissement en attente
+        self._last_cross = None
+        self._trigger = None       # horodatage émetteur de ce franchissement (mesure de latence)
+        self._wake = None
+        self._stop = None
+        self._stopping = False     # stop() demandé avant le démarrage de run()
+        self.port = None
+
+    # ------------ messages ------------
+    def handle_line(self, line):
+        """Applique un ordre ; les lignes mal formées sont comptées puis ignorées."""
+        parts = line.strip().split(",")
+        if len(parts) != len(FIELDS):
+            if line.strip():
+                self.n_errors += 1
+            return
+        try:
+            ts, amount = float(parts[0]), float(parts[4])
+        except ValueError:
+            self.n_errors += 1
+            return
+        crossed = self.positions.apply(parts[1].strip(), parts[2].strip(), parts[3].strip(), amount)
+        now = time.time()
+        self.n_messages += 1
+        if self.first_seen is None:
+            self.first_seen = now
+        self.last_seen = now
+        self.ingest_latency.add(now - ts)
+        if crossed:
+            # debounce on the local clock: producer timestamps may lag it (replayed file)
+            if self._first_cross is None:
+                self._first_cross, self._trigger = now, ts
+            self._last_cross = now
+            if self._wake is not None:
+                self._wake.set()
+
+    def handle_chunk(self, lines):
+        for line in lines:
+            self.handle_line(line)
+
+    # ------------ sources ------------
+    async def tail_file(self, path, poll=0.05, from_start=True):
+        """Suit un fichier en ajout continu (à la tail -f) jusqu'à stop()."""
+        with open(path, "r", encoding="utf-8") as f:
+            if not from_start:
+                f.seek(0, 2)
+            pending = ""
+            while not self._stop.is_set():
+                data = f.read()
+                if not data:
+                    try:
+                        await asyncio.wait_for(self._stop.wait(), poll)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                lines = (pending + data).split("\n")
+                pending = lines.pop()  # ligne incomplète : attend la suite
+                self.handle_chunk(lines)
+                await asyncio.sleep(0)
+
+    async def serve(self, host="127.0.0.1", port=0):
+        """Serveur TCP jusqu'à stop() : une ligne par ordre. Port réel dans self.port une fois ouvert."""
+        async def client(reader, writer):
+            try:
+                while not self._stop.is_set():
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    self.handle_line(line.decode("utf-8"))
+            finally:
+                writer.close()
+        server = await asyncio.start_server(client, host, port)
+        self.port = server.sockets[0].getsockname()[1]
+        async with server:
+            await self._stop.wait()
+
+    # ------------ ré-optimisation ------------
+    async def _reoptimizer(self):
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            await self._wake.wait()
+            if self._stop.is_set():
+                break
+            now = time.time()
+            due = min(self._last_cross + self.debounce, self._first_cross + self.max_delay)
+            if due > now:
+                await asyncio.sleep(due - now)
+                continue
+            self._wake.clear()
+            trigger = self._trigger
+            self._first_cross = self._last_cross = self._trigger = None
+            snapshot = self.positions.matrices()
+            banks, balances, required = snapshot.to_dicts()
+            t0 = time.perf_counter()
+            try:
+                plan = await loop.run_in_executor(None, lambda: self.optimize(banks, balances, required, self.rates,
+                                                                               interet=self.interet))
+            except Exception as e:
+                # failure on one snapshot must not kill the worker: the next crossing retries
+                self.last_error = f"{type(e).__name__}: {e}"
+                continue
+            done = time.time()
+            self.n_plans += 1
+            self.plan_latency.add(done - trigger)
+            self.last_plan = plan
+            if self.on_plan is not None:
+                self.on_plan(plan, {"positions": snapshot, "solve_time": time.perf_counter() - t0,
+                                    "latency": done - trigger, "messages": self.n_messages})
+
+    async def run(self, *sources):
+        """Lance les sources (coroutines tail_file / serve) et la ré-optimisation jusqu'à stop()."""
+        self._stop = asyncio.Event()
+        self._wake = asyncio.Event()
+        if self._stopping:
+            self._stop.set()
+        if self._first_cross is not None:
+            self._wake.set()
+        worker = asyncio.create_task(self._reoptimizer())
+        try:
+            await asyncio.gather(*sources)
+        finally:
+            self._stop.set()
+            self._wake.set()
+            await worker
+
+    def stop(self):
+        self._stopping = True
+        if self._stop is not None:
+            self._stop.set()
+        if self._wake is not None:
+            self._wake.set()
+
+    # ------------ métriques ------------
+    def metrics(self):
+        span = (self.last_seen - self.first_seen) if self.n_messages > 1 else 0.0
+        return {"messages": self.n_messages, "errors": self.n_errors, "plans": self.n_plans,
+                "throughput": self.n_messages / span if span > 0 else float("nan"),
+                "in_deficit": self.positions.n_short(),
+                "ingest_latency": self.ingest_latency.percentiles(),
+                "plan_latency": self.plan_latency.percentiles()}
+
+
+def format_metrics(m):
+    ing, plan = m["ingest_latency"], m["plan_latency"]
+    return (f"{m['messages']:,} ordres ({m['throughput']:,.0f}/s), {m['errors']} rejetés, "
+            f"{m['in_deficit']} déficits, {m['plans']} plans | latence ingestion p50 {ing['p50'] * 1e3:.1f} ms "
+            f"p99 {ing['p99'] * 1e3:.1f} ms | bout en bout p50 {plan['p50'] * 1e3:.0f} ms")
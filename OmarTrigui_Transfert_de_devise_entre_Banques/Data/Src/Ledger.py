@@ -0,0 +1,300 @@
+#Registre des plans calculés : stockage colonne par colonne, en ajout seul, lu par memmap
+
+import os
+import json
+import time
+import numpy as np
+from Src.Optimizer import TransferBatch, ConversionBatch, currency_values
+from Src.RateEngine import RateEngine
+from Src.Netting import from_dicts
+
+# Une ligne par mouvement : transfert (kind 0, src -> dst en currency) ou paiement (kind 1, payeur src ->
+# bénéficiaire dst en currency pour recevoir counter). rate : valeur d'une unité de currency dans la
+# devise de référence du run (amount * rate est comparable d'une devise à l'autre).
+COLUMNS = {"run": np.int32, "timestamp": np.int64, "kind": np.int8, "src": np.int32, "dst": np.int32,
+           "currency": np.int16, "counter": np.int16, "amount": np.float64, "rate": np.float64}
+TRANSFER, PAYMENT = 0, 1
+DAY_NS = 86_400 * 10 ** 9
+
+
+class PlanLedger:
+    """
+    Registre en ajout seul des plans de transferts, dans un dossier :
+      <colonne>.col  valeurs brutes (dtype de COLUMNS), une ligne par mouvement
+      labels.json    libellés des banques / devises (les codes ne changent jamais)
+      runs.jsonl     un run par ligne : id, horodatage (ns), lignes [start, stop), référence, meta
+
+    Les colonnes sont écrites avant la ligne de runs.jsonl : un ajout interrompu laisse des octets en
+    trop, tronqués à l'ouverture suivante. Les lectures passent par np.memmap, par morceaux de chunk
+    lignes : l'historique n'est jamais chargé en entier. Toutes les lignes d'un run partagent son
+    horodatage ; un filtre de dates se résout donc sur runs.jsonl en segments de lignes contigus.
+    """
+
+    def __init__(self, path, chunk=1 << 22, durable=False):
+        self.path = path
+        self.chunk = chunk
+        self.durable = durable
+        os.makedirs(path, exist_ok=True)
+        self.banks, self.currencies = [], []
+        labels = os.path.join(path, "labels.json")
+        if os.path.exists(labels):
+            with open(labels) as f:
+                data = json.load(f)
+            self.banks, self.currencies = data["banks"], data["currencies"]
+        self.bank_index = {b: k for k, b in enumerate(self.banks)}
+        self.cur_index = {c: k for k, c in enumerate(self.currencies)}
+        self.runs = []
+        runs = os.path.join(path, "runs.jsonl")
+        if os.path.exists(runs):
+            with open(runs) as f:
+                lines = f.readlines()
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn last line
+                if not line.endswith("\n"):
+                    break  # cut just before its newline: still incomplete
+                self.runs.append(record)
+            if len(self.runs) < len(lines):
+                # drop the torn tail, or the next append would be written onto it
+                with open(runs + ".tmp", "w") as f:
+                    f.writelines(lines[:len(self.runs)])
+                os.replace(runs + ".tmp", runs)
+        self.n_rows = self.runs[-1]["stop"] if self.runs else 0
+        for name, dtype in COLUMNS.items():
+            col = self._file(name)
+            size = self.n_rows * np.dtype(dtype).itemsize
+            if not os.path.exists(col) or os.path.getsize(col) != size:
+                with open(col, "ab") as f:
+                    f.truncate(size)
+        self._maps = {}
+
+    def __len__(self):
+        return self.n_rows
+
+    def _file(self, name):
+        return os.path.join(self.path, name + ".col")
+
+    # ------------ écriture ------------
+    def _codes(self, labels, names, index):
+        for name in names:
+            if name not in index:
+                index[name] = len(labels)
+                labels.append(name)
+        return np.array([index[name] for name in names], dtype=np.int64)
+
+    def _save_labels(self):
+        path = os.path.join(self.path, "labels.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump({"banks": self.banks, "currencies": self.currencies}, f)
+        os.replace(path + ".tmp", path)
+
+    def _values(self, rates, reference):
+        """Valeur de chaque devise du registre dans reference (NaN sans taux)."""
+        if rates is None:
+            return np.full(len(self.currencies), np.nan)
+        order = [reference] + [c for c in self.currencies if c != reference]
+        if isinstance(rates, RateEngine):
+            R = rates.matrix_for(order)
+        else:
+            pos = {c: k for k, c in enumerate(order)}
+            R = np.full((len(order), len(order)), np.nan)
+            np.fill_diagonal(R, 1.0)
+            for (f, t), v in rates.items():
+                if f in pos and t in pos:
+                    R[pos[f], pos[t]] = v
+        w = currency_values(R)
+        return w[[order.index(c) for c in self.currencies]]
+
+    def append(self, transfers, conversions=None, rates=None, timestamp=None, reference="EUR", meta=None):
+        """
+        Ajoute un plan (dicts de optimize_transfers ou TransferBatch / ConversionBatch) comme un nouveau run.
+        rates : dict ou RateEngine pour la colonne rate ; timestamp : ns depuis l'époque (maintenant par défaut).
+        Renvoie l'id du run.
+        """
+        if not isinstance(transfers, TransferBatch):
+            transfers, conversions = from_dicts(transfers, conversions)
+        if conversions is None:
+            empty = np.zeros(0, dtype=np.int64)
+            conversions = ConversionBatch(transfers.banks, transfers.currencies, empty, empty, empty, empty,
+                                          np.zeros(0))
+        known = len(self.banks), len(self.currencies)
+        bank_codes = self._codes(self.banks, list(transfers.banks), self.bank_index)
+        cur_codes = self._codes(self.currencies, list(transfers.currencies), self.cur_index)
+        # conversions may carry their own label lists
+        pay_banks = self._codes(self.banks, list(conversions.banks), self.bank_index)
+        pay_curs = self._codes(self.currencies, list(conversions.currencies), self.cur_index)
+        if (len(self.banks), len(self.currencies)) != known:
+            self._save_labels()
+
+        run = len(self.runs)
+        timestamp = time.time_ns() if timestamp is None else int(timestamp)
+        reference = reference if reference in self.cur_index else (self.currencies[0] if self.currencies else "")
+        values = self._values(rates, reference)
+        nt, nc = len(transfers), len(conversions)
+        cur = np.concatenate([cur_codes[transfers.cur], pay_curs[conversions.from_cur]])
+        columns = {
+            "run": np.full(nt + nc, run), "timestamp": np.full(nt + nc, timestamp),
+            "kind": np.repeat([TRANSFER, PAYMENT], [nt, nc]),
+            "src": np.concatenate([bank_codes[transfers.src], pay_banks[conversions.payer]]),
+            "dst": np.concatenate([bank_codes[transfers.dst], pay_banks[conversions.payee]]),
+            "currency": cur,
+            "counter": np.concatenate([np.full(nt, -1), pay_curs[conversions.to_cur]]),
+            "amount": np.concatenate([transfers.amount, conversions.amount]),
+            "rate": values[cur] if len(values) else np.zeros(0),
+        }
+        return self._append_rows(columns, timestamp, reference, meta)
+
+    def append_rows(self, columns, timestamp=None, reference="", meta=None):
+        """Ajout direct de colonnes de codes (mêmes noms que COLUMNS, run et timestamp remplis ici)."""
+        n = len(columns["amount"])
+        timestamp = time.time_ns() if timestamp is None else int(timestamp)
+        columns = dict(columns, run=np.full(n, len(self.runs)), timestamp=np.full(n, timestamp))
+        return self._append_rows(columns, timestamp, reference, meta)
+
+    def _append_rows(self, columns, timestamp, reference, meta):
+        run, n = len(self.runs), len(columns["amount"])
+        for name, dtype in COLUMNS.items():
+            with open(self._file(name), "ab") as f:
+                f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+                if self.durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+        record = {"run": run, "timestamp": timestamp, "start": self.n_rows, "stop": self.n_rows + n,
+                  "reference": reference, "meta": meta or {}}
+        with open(os.path.join(self.path, "runs.jsonl"), "a") as f:
+            f.write(json.dumps(record) + "\n")
+            if self.durable:
+                f.flush()
+                os.fsync(f.fileno())
+        self.runs.append(record)
+        self.n_rows += n
+        return run
+
+    # ------------ lecture ------------
+    def column(self, name):
+        """Colonne entière en memmap (lecture seule), sans copie."""
+        cached = self._maps.get(name)
+        if cached is not None and len(cached) == self.n_rows:
+            return cached
+        if self.n_rows == 0:
+            return np.zeros(0, dtype=COLUMNS[name])
+        self._maps[name] = np.memmap(self._file(name), dtype=COLUMNS[name], mode="r", shape=(self.n_rows,))
+        return self._maps[name]
+
+    def segments(self, start=None, end=None, runs=None):
+        """Segments de lignes [a, b) des runs retenus (horodatage dans [start, end), ids dans runs)."""
+        keep = set(runs) if runs is not None else None
+        out = []
+        for r in self.runs:
+            if (start is not None and r["timestamp"] < start) or (end is not None and r["timestamp"] >= end):
+                continue
+            if keep is not None and r["run"] not in keep:
+                continue
+            if out and out[-1][1] == r["start"]:
+                out[-1][1] = r["stop"]
+            elif r["stop"] > r["start"]:
+                out.append([r["start"], r["stop"]])
+        return out
+
+    def scan(self, columns, start=None, end=None, runs=None, chunk=None):
+        """Itère sur des morceaux {colonne: tableau} des lignes retenues (vues memmap, sans copie)."""
+        chunk = chunk or self.chunk
+        maps = {name: self.column(name) for name in columns}
+        for a, b in self.segments(start, end, runs):
+            for lo in range(a, b, chunk):
+                hi = min(lo + chunk, b)
+                yield {name: m[lo:hi] for name, m in maps.items()}
+
+    def replay(self, run):
+        """Plan d'un run -> (transfers, conversions) au format de optimize_transfers."""
+        part = next(self.scan(["kind", "src", "dst", "currency", "counter", "amount"], runs=[run],
+                              chunk=max(1, self.runs[run]["stop"] - self.runs[run]["start"])), None)
+        transfers, conversions = {}, {}
+        if part is None:
+            return transfers, conversions
+        b = np.asarray(self.banks, dtype=object)
+        c = np.asarray(self.currencies, dtype=object)
+        t = part["kind"] == TRANSFER
+        for key, a in zip(zip(b[part["src"][t]].tolist(), b[part["dst"][t]].tolist(),
+                              c[part["currency"][t]].tolist()), part["amount"][t].tolist()):
+            transfers[key] = transfers.get(key, 0.0) + a
+        p = ~t
+        for key, a in zip(zip(b[part["src"][p]].tolist(), b[part["dst"][p]].tolist(), c[part["currency"][p]].tolist(),
+                              c[part["counter"][p]].tolist()), part["amount"][p].tolist()):
+            conversions[key] = conversions.get(key, 0.0) + a
+        return transfers, conversions
+
+    def aggregate(self, by=("currency",), start=None, end=None, runs=None, kind=None, value="amount"):
+        """
+        Somme des lignes retenues par clé, une passe bincount par morceau.
+        by : parmi "src", "dst", "currency", "counter", "kind", "run", "day" (jour UTC de l'horodatage)
+        value : "amount" (devise de la ligne), "value" (amount * rate, devise de référence) ou "count"
+        kind : TRANSFER, PAYMENT ou None (les deux)
+        Renvoie {tuple de libellés: somme} pour les clés non nulles.
+        """
+        segs = self.segments(start, end, runs)
+        if not segs:
+            return {}
+        day0 = min(r["timestamp"] for r in self.runs) // DAY_NS
+        sizes = {"src": len(self.banks), "dst": len(self.banks), "currency": len(self.currencies),
+                 "counter": len(self.currencies) + 1, "kind": 2, "run": len(self.runs),
+                 "day": max(r["timestamp"] for r in self.runs) // DAY_NS - day0 + 1}
+        radix = [sizes[k] for k in by]
+        total = np.zeros(int(np.prod(radix, dtype=np.int64)) if by else 1)
+        hits = np.zeros(len(total), dtype=np.int64)
+        needed = {k if k != "day" else "timestamp" for k in by} | {"amount"}
+        needed |= ({"kind"} if kind is not None else set()) | ({"rate"} if value == "value" else set())
+        for part in self.scan(sorted(needed), start, end, runs):
+            key = np.zeros(len(part["amount"]), dtype=np.int64)
+            for k, size in zip(by, radix):
+                if k == "day":
+                    code = part["timestamp"] // DAY_NS - day0
+                elif k == "counter":
+                    code = part["counter"].astype(np.int64) + 1
+                else:
+                    code = part[k]
+                key = key * size + code
+            if value == "count":
+                w = None
+            elif value == "value":
+                w = part["amount"] * part["rate"]
+            else:
+                w = part["amount"]
+            if kind is not None:
+                sel = part["kind"] == kind
+                key = key[sel]
+                w = w[sel] if w is not None else None
+            hits += np.bincount(key, minlength=len(total))
+            total += np.bincount(key, weights=w, minlength=len(total)) if w is not None else 0.0
+        if value == "count":
+            total = hits.astype(np.float64)
+        out = {}
+        for flat in np.flatnonzero(hits).tolist():
+            codes = np.unravel_index(flat, radix) if by else ()
+            out[tuple(self._label(k, int(code), day0) for k, code in zip(by, codes))] = float(total[flat])
+        return out
+
+    def _label(self, key, code, day0):
+        if key in ("src", "dst"):
+            return self.banks[code]
+        if key == "currency":
+            return self.currencies[code]
+        if key == "counter":
+            return self.currencies[code - 1] if code else None
+        if key == "day":
+            return time.strftime("%Y-%m-%d", time.gmtime((day0 + code) * 86_400))
+        return code
+
+    def net_positions(self, start=None, end=None, runs=None, value="amount"):
+        """Mouvement net (reçu - envoyé) banque x devise sur la période : (banks, currencies, matrice)."""
+        n, C = len(self.banks), len(self.currencies)
+        net = np.zeros(n * C)
+        cols = ["src", "dst", "currency", "amount"] + (["rate"] if value == "value" else [])
+        for part in self.scan(cols, start, end, runs):
+            w = part["amount"] * part["rate"] if value == "value" else part["amount"]
+            cur = part["currency"].astype(np.int64)
+            net += np.bincount(part["dst"].astype(np.int64) * C + cur, weights=w, minlength=n * C)
+            net -= np.bincount(part["src"].astype(np.int64) * C + cur, weights=w, minlength=n * C)
+        return list(self.banks), list(self.currencies), net.reshape(n, C)
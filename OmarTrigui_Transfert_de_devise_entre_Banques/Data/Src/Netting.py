@@ -0,0 +1,171 @@
+#Compensation (netting) des transferts : moins d'ordres pour les mêmes positions nettes
+
+import numpy as np
+from Src.Optimizer import TransferBatch, ConversionBatch, _sweep
+
+
+def positions(n_banks, n_cur, src, dst, cur, amount):
+    """Position nette (reçu - envoyé) banque x devise, une seule passe bincount."""
+    size = n_banks * n_cur
+    got = np.bincount(dst * n_cur + cur, weights=amount, minlength=size)
+    sent = np.bincount(src * n_cur + cur, weights=amount, minlength=size)
+    return (got - sent).reshape(n_banks, n_cur)
+
+
+def plan_flows(transfers, conversions=None):
+    """
+    Tous les mouvements d'un plan comme un seul TransferBatch : les transferts, plus les paiements
+    (payer -> payee en from_cur) si conversions est fourni.
+    """
+    if conversions is None or not len(conversions):
+        return transfers
+    return TransferBatch(transfers.banks, transfers.currencies,
+                         np.concatenate([transfers.src, conversions.payer]),
+                         np.concatenate([transfers.dst, conversions.payee]),
+                         np.concatenate([transfers.cur, conversions.from_cur]),
+                         np.concatenate([transfers.amount, conversions.amount]))
+
+
+def from_dicts(transfers, conversions=None, banks=None, currencies=None):
+    """Dicts de optimize_transfers -> (TransferBatch, ConversionBatch ou None)."""
+    banks = list(banks) if banks is not None else sorted({b for k in transfers for b in k[:2]}
+                                                          | {b for k in (conversions or {}) for b in k[:2]})
+    currencies = list(currencies) if currencies is not None else sorted({k[2] for k in transfers}
+                                                                        | {c for k in (conversions or {}) for c in k[2:]})
+    b_pos = {b: k for k, b in enumerate(banks)}
+    c_pos = {c: k for k, c in enumerate(currencies)}
+
+    def codes(keys, i, pos):
+        return np.fromiter((pos[k[i]] for k in keys), dtype=np.int64, count=len(keys))
+
+    keys = list(transfers)
+    batch = TransferBatch(banks, currencies, codes(keys, 0, b_pos), codes(keys, 1, b_pos), codes(keys, 2, c_pos),
+                          np.fromiter(transfers.values(), dtype=np.float64, count=len(keys)))
+    if conversions is None:
+        return batch, None
+    keys = list(conversions)
+    pays = ConversionBatch(banks, currencies, codes(keys, 0, b_pos), codes(keys, 1, b_pos), codes(keys, 2, c_pos),
+                           codes(keys, 3, c_pos), np.fromiter(conversions.values(), dtype=np.float64, count=len(keys)))
+    return batch, pays
+
+
+def bilateral_net(batch, tol=1e-9):
+    """
+    Compensation bilatérale : ordres parallèles additionnés et ordres opposés A -> B / B -> A annulés,
+    par devise. Les contreparties sont conservées (au plus un ordre par paire de banques et devise).
+    """
+    n, C = len(batch.banks), len(batch.currencies)
+    src, dst = batch.src, batch.dst
+    lo, hi = np.minimum(src, dst), np.maximum(src, dst)
+    sign = np.where(src < dst, 1.0, -1.0)
+    keys, inv = np.unique((batch.cur * n + lo) * n + hi, return_inverse=True)
+    net = np.bincount(inv.ravel(), weights=sign * batch.amount, minlength=len(keys))
+    keep = (np.abs(net) > tol) & (keys % n != (keys // n) % n)
+    keys, net = keys[keep], net[keep]
+    lo, hi, cur = (keys // n) % n, keys % n, keys // (n * n)
+    return TransferBatch(batch.banks, batch.currencies, np.where(net > 0, lo, hi), np.where(net > 0, hi, lo),
+                         cur, np.abs(net))
+
+
+def _pair_equal(give, take, amounts_g, amounts_t, tol):
+    """
+    Apparie un payeur et un receveur de même montant (à tol près) : un seul ordre les solde tous deux.
+    Renvoie (indices give appariés, indices take appariés) alignés.
+    """
+    # float keys: an int64 cast would overflow above 2**63 * tol (about 9.2e9 for tol=1e-9)
+    kg = np.round(amounts_g / tol)
+    kt = np.round(amounts_t / tol)
+    og, ot = np.argsort(kg, kind="stable"), np.argsort(kt, kind="stable")
+    kg, kt = kg[og], kt[ot]
+    common, ig, it = np.intersect1d(kg, kt, assume_unique=False, return_indices=True)
+    if not len(common):
+        return og[:0], ot[:0]
+    # rank of each element inside its run of equal keys
+    rank_g = np.arange(len(kg)) - np.searchsorted(kg, kg, side="left")
+    rank_t = np.arange(len(kt)) - np.searchsorted(kt, kt, side="left")
+    n_g = np.searchsorted(kg, common, side="right") - ig
+    n_t = np.searchsorted(kt, common, side="right") - it
+    limit = np.minimum(n_g, n_t)
+    pos_g = np.searchsorted(common, kg).clip(max=len(common) - 1)
+    pos_t = np.searchsorted(common, kt).clip(max=len(common) - 1)
+    sel_g = (common[pos_g] == kg) & (rank_g < limit[pos_g])
+    sel_t = (common[pos_t] == kt) & (rank_t < limit[pos_t])
+    return og[sel_g], ot[sel_t]
+
+
+def multilateral_net(batch, tol=1e-9, match_equal=True):
+    """
+    Compensation multilatérale par devise : seules les positions nettes (reçu - envoyé) subsistent,
+    ce qui annule les cycles et raccourcit les chaînes A -> B -> C en A -> C.
+    Les positions sont ensuite réglées par appariement trié (balayage des sommes cumulées), après
+    avoir apparié les payeurs et receveurs de même montant : au plus payeurs + receveurs - 1 ordres
+    par devise. Les contreparties ne sont pas conservées (règlement via une chambre de compensation).
+    """
+    n, C = len(batch.banks), len(batch.currencies)
+    net = positions(n, C, batch.src, batch.dst, batch.cur, batch.amount)
+    src, dst, cur, amount = [], [], [], []
+    for c in range(C):
+        give = np.flatnonzero(net[:, c] < -tol)
+        take = np.flatnonzero(net[:, c] > tol)
+        if not len(give) or not len(take):
+            continue
+        out, inn = -net[give, c], net[take, c]
+        if match_equal:
+            eg, et = _pair_equal(give, take, out, inn, tol)
+            a = np.minimum(out[eg], inn[et])
+            src.append(give[eg]); dst.append(take[et]); cur.append(np.full(len(eg), c)); amount.append(a)
+            out, inn = out.copy(), inn.copy()
+            out[eg] -= a
+            inn[et] -= a
+            rest_g, rest_t = out > tol, inn > tol
+            give, out, take, inn = give[rest_g], out[rest_g], take[rest_t], inn[rest_t]
+            if not len(give) or not len(take):
+                continue
+        og, ot = np.argsort(-out, kind="stable"), np.argsort(-inn, kind="stable")
+        gi, ti, a = _sweep(out[og], inn[ot])
+        keep = a > tol
+        src.append(give[og][gi[keep]]); dst.append(take[ot][ti[keep]])
+        cur.append(np.full(int(keep.sum()), c)); amount.append(a[keep])
+
+    empty = np.zeros(0, dtype=np.int64)
+    return TransferBatch(batch.banks, batch.currencies,
+                         np.concatenate(src).astype(np.int64) if src else empty,
+                         np.concatenate(dst).astype(np.int64) if dst else empty,
+                         np.concatenate(cur).astype(np.int64) if cur else empty,
+                         np.concatenate(amount) if amount else np.zeros(0))
+
+
+def netting_report(before, after):
+    """Par devise et au total : nombre d'ordres et volume avant / après compensation."""
+    C = len(before.currencies)
+    rows = {}
+    counts_b = np.bincount(before.cur, minlength=C)
+    counts_a = np.bincount(after.cur, minlength=C)
+    vol_b = np.bincount(before.cur, weights=before.amount, minlength=C)
+    vol_a = np.bincount(after.cur, weights=after.amount, minlength=C)
+    for c, name in enumerate(before.currencies):
+        if counts_b[c] or counts_a[c]:
+            rows[name] = {"count_before": int(counts_b[c]), "count_after": int(counts_a[c]),
+                          "volume_before": float(vol_b[c]), "volume_after": float(vol_a[c])}
+    total = {"count_before": len(before), "count_after": len(after),
+             "volume_before": float(before.amount.sum()), "volume_after": float(after.amount.sum())}
+    return {"currencies": rows, "total": total}
+
+
+def net_transfers(transfers, conversions=None, mode="multilateral", tol=1e-9):
+    """
+    Compense un plan (dicts de optimize_transfers ou batches de optimize_transfers_fast).
+    conversions fourni : les paiements sont compensés avec les transferts (mêmes comptes, mêmes devises).
+    mode : "multilateral" (minimum d'ordres) ou "bilateral" (contreparties conservées).
+    Renvoie (TransferBatch compensé, rapport).
+    """
+    if isinstance(transfers, dict):
+        transfers, conversions = from_dicts(transfers, conversions)
+    flows = plan_flows(transfers, conversions)
+    if mode == "multilateral":
+        netted = multilateral_net(flows, tol=tol)
+    elif mode == "bilateral":
+        netted = bilateral_net(flows, tol=tol)
+    else:
+        raise ValueError(f"Mode de compensation inconnu : {mode}")
+    return netted, netting_report(flows, netted)
@@ -1,12 +1,21 @@
-def optimize_transfers(banks, balances, required, rates, interet=0.03):
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+from Src.RateEngine import RateEngine
+from Src.Utils import CostEngine
+
+
+def optimize_transfers_greedy(banks, balances, required, rates, interet=0.03, costs=None):
     """
     Optimisation des transferts et conversions entre banques.
-    
+
     transfers[(b_src, b_dst, cur)] : montant transféré de b_src à b_dst dans la devise cur.
     conversions[(b_dst, b_src, from_cur, to_cur)] : montant payé par b_dst à b_src dans from_cur pour recevoir to_cur.
-    
+
     Chaque transfert déclenche automatiquement un paiement (conversion) avec le taux interbancaire et l'intérêt.
+    costs : CostEngine (par défaut, intérêt seul)
     """
+    costs = costs if costs is not None else CostEngine(interet=interet)
     transfers = {}
     conversions = {}
 
@@ -33,7 +42,7 @@ def optimize_transfers(banks, balances, required, rates, interet=0.03):
                 # --- Conversion automatique pour payer b_src ---
                 other_cur = 'EUR' if cur == 'USD' else 'USD'
                 rate = rates.get((other_cur, cur), 1)
-                amount_to_pay = transfer * rate * (1 + interet)
+                amount_to_pay = costs.pay(transfer, rate)
                 conversions[(b_dst, b_src, other_cur, cur)] = amount_to_pay
 
                 if deficit <= 0:
@@ -42,3 +51,434 @@ def optimize_transfers(banks, balances, required, rates, interet=0.03):
                 break
 
     return transfers, conversions
+
+
+# ------------ dicts <-> matrices ------------
+def to_matrices(banks, balances, required, rates):
+    """
+    Dicts de DataLoader -> (banks, currencies, balance, required, R) ; R[f, c] = rates[(f, c)], NaN si absent.
+    rates peut être un RateEngine : R est alors sa matrice des meilleurs taux (chemins indirects compris).
+    """
+    banks = list(banks)
+    rate_currencies = rates.currencies if isinstance(rates, RateEngine) else {c for pair in rates for c in pair}
+    currencies = sorted({c for (_, c) in balances} | {c for (_, c) in required} | set(rate_currencies))
+    b_pos = {b: k for k, b in enumerate(banks)}
+    c_pos = {c: k for k, c in enumerate(currencies)}
+    bal = np.zeros((len(banks), len(currencies)))
+    req = np.zeros((len(banks), len(currencies)))
+    for (b, c), v in balances.items():
+        if b in b_pos:
+            bal[b_pos[b], c_pos[c]] = v
+    for (b, c), v in required.items():
+        if b in b_pos:
+            req[b_pos[b], c_pos[c]] = v
+    if isinstance(rates, RateEngine):
+        return banks, currencies, bal, req, rates.matrix_for(currencies)
+    R = np.full((len(currencies), len(currencies)), np.nan)
+    np.fill_diagonal(R, 1.0)
+    for (f, c), v in rates.items():
+        R[c_pos[f], c_pos[c]] = v
+    return banks, currencies, bal, req, R
+
+
+def currency_values(R, ref=0):
+    """Valeur d'une unité de chaque devise dans la devise de référence (taux direct, inverse, sinon 1)."""
+    w = R[:, ref].copy()
+    inv = 1.0 / R[ref, :]
+    w = np.where(np.isnan(w), inv, w)
+    return np.where(np.isfinite(w) & (w > 0), w, 1.0)
+
+
+def _sweep(give, take):
+    """
+    Appariement « coin nord-ouest » de deux vecteurs de même somme, sans boucle :
+    renvoie (indices give, indices take, montants) des segments entre sommes cumulées.
+    """
+    cg, ct = np.cumsum(give), np.cumsum(take)
+    total = min(cg[-1], ct[-1]) if len(cg) and len(ct) else 0.0
+    bps = np.unique(np.concatenate([[0.0], cg, ct]))
+    bps = bps[bps <= total]
+    start, amount = bps[:-1], np.diff(bps)
+    gi = np.minimum(np.searchsorted(cg, start, side="right"), len(cg) - 1)
+    ti = np.minimum(np.searchsorted(ct, start, side="right"), len(ct) - 1)
+    return gi, ti, amount
+
+
+# ------------ exact model ------------
+def conversion_matrix(R):
+    """X[c, f] = unités de f pour une unité de c : taux direct R[c, f], sinon inverse de R[f, c]."""
+    with np.errstate(divide="ignore"):
+        inv = 1.0 / R.T
+    X = np.where(np.isfinite(R), R, inv)
+    return np.where(np.isfinite(X) & (X > 0), X, np.nan)
+
+
+class ExactLayout:
+    """
+    Indexation des variables d'une fenêtre du modèle exact (voir solve_exact) :
+    out, inn, z, u, short, à partir de l'offset base dans le vecteur des variables.
+    engine : CostEngine (taux de paiement majorés, frais linéaires)
+    """
+
+    def __init__(self, n, C, R, engine, base=0):
+        X = conversion_matrix(R)
+        self.n, self.C = n, C
+        self.engine = engine
+        self.pairs = [(f, c) for c in range(C) for f in range(C) if f != c and np.isfinite(X[c, f])]
+        self.P = P = len(self.pairs)
+        rate = engine.payment_rate(X)
+        self.gain = np.array([rate[c, f] for f, c in self.pairs])
+        self.pf = np.array([f for f, _ in self.pairs], dtype=np.int64)
+        self.pc = np.array([c for _, c in self.pairs], dtype=np.int64)
+        self.paid = np.zeros(C, dtype=bool)
+        self.paid[self.pc] = True
+        self.nC, self.nP = nC, nP = n * C, n * P
+        self.OUT, self.IN, self.Z, self.U, self.S = (base, base + nC, base + 2 * nC, base + 2 * nC + nP,
+                                                     base + 2 * nC + 2 * nP)
+        self.size = 3 * nC + 2 * nP
+        self.bc = np.arange(nC)
+        self.c_of = self.bc % C
+        self.bp = np.arange(nP)
+        self.bp_b, self.bp_p = self.bp // P, self.bp % P
+
+    def costs(self, w, penalty):
+        """Objectif de la fenêtre : paiements valorisés, frais, pénalité."""
+        cost = np.zeros(self.size)
+        nC, nP = self.nC, self.nP
+        if self.P:
+            cost[2 * nC:2 * nC + nP] = self.gain[self.bp_p] * w[self.pf[self.bp_p]]
+        if self.engine.lp_fee_rate:
+            cost[nC:2 * nC] = self.engine.lp_fee_rate * w[self.c_of]
+        cost[2 * nC + 2 * nP:] = penalty * w[self.c_of]
+        return cost
+
+    def equalities(self, n_vars, row=0):
+        """Équilibres E1..E4 de la fenêtre : (rows, cols, vals, nombre de lignes)."""
+        C, P, nC, nP = self.C, self.P, self.nC, self.nP
+        bc, c_of, bp, bp_b, bp_p = self.bc, self.c_of, self.bp, self.bp_b, self.bp_p
+        start = row
+        rows, cols, vals = [], [], []
+        # E1: per currency, total sent = total received
+        rows += [row + c_of, row + c_of]; cols += [self.OUT + bc, self.IN + bc]; vals += [np.ones(nC), -np.ones(nC)]
+        row += C
+        if P:
+            # E2 / E3: split of inn / out over payment currencies (only for paid currencies)
+            bcp = bp_b * C + self.pc[bp_p]
+            sel = bc[self.paid[c_of]]
+            rows += [row + bcp, row + sel]; cols += [self.Z + bp, self.IN + sel]; vals += [np.ones(nP), -np.ones(len(sel))]
+            row += nC
+            rows += [row + bcp, row + sel]; cols += [self.U + bp, self.OUT + sel]; vals += [np.ones(nP), -np.ones(len(sel))]
+            row += nC
+            # E4: per (f, c), payments made = payments received
+            rows += [row + bp_p, row + bp_p]; cols += [self.Z + bp, self.U + bp]; vals += [np.ones(nP), -np.ones(nP)]
+            row += P
+        return rows, cols, vals, row - start
+
+    def unpaid(self):
+        """Colonnes out / inn des devises sans aucune devise de paiement : fixées à 0 (pas de transfert gratuit)."""
+        bc = self.bc[~self.paid[self.c_of]]
+        return np.concatenate([self.OUT + bc, self.IN + bc])
+
+    def delta(self, n_vars):
+        """final - balance de la fenêtre : matrice creuse (n x C, n_vars)."""
+        nC, bc, bp, bp_b, bp_p = self.nC, self.bc, self.bp, self.bp_b, self.bp_p
+        rows, cols, vals = [bc, bc], [self.IN + bc, self.OUT + bc], [np.ones(nC), -np.ones(nC)]
+        if self.P:
+            bk = bp_b * self.C + self.pf[bp_p]
+            rows += [bk, bk]; cols += [self.U + bp, self.Z + bp]; vals += [self.gain[bp_p], -self.gain[bp_p]]
+        return sp.csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=(nC, n_vars))
+
+    def short(self, n_vars):
+        return sp.csr_matrix((np.ones(self.nC), (self.bc, self.S + self.bc)), shape=(self.nC, n_vars))
+
+    def scales(self, w):
+        """Facteurs d'échelle (valeur de référence) des variables et des équilibres de la fenêtre."""
+        col_w = np.concatenate([w[self.c_of], w[self.c_of], w[self.pc[self.bp_p]], w[self.pc[self.bp_p]], w[self.c_of]])
+        eq_w = np.concatenate([w, w[self.c_of], w[self.c_of], w[self.pc]]) if self.P else w
+        return col_w, eq_w
+
+    def plan(self, x, banks, currencies, tol=1e-7):
+        """Montants agrégés de la fenêtre -> dicts transfers / conversions (balayage des sommes cumulées)."""
+        n, C, P = self.n, self.C, self.P
+        transfers, conversions = {}, {}
+        names, curs = list(banks), list(currencies)
+
+        def add(src, dst, c, amount, f, g):
+            for s, d, a in zip(src.tolist(), dst.tolist(), amount.tolist()):
+                if s == d or a <= tol:
+                    continue
+                key = (names[s], names[d], curs[c])
+                transfers[key] = transfers.get(key, 0.0) + a
+                key = (names[d], names[s], curs[f], curs[c])
+                conversions[key] = conversions.get(key, 0.0) + a * float(g)
+
+        zm = x[self.Z:self.Z + self.nP].reshape(n, P)
+        um = x[self.U:self.U + self.nP].reshape(n, P)
+        for p, (f, c) in enumerate(self.pairs):
+            if zm[:, p].sum() > tol:
+                gi, ti, amount = _sweep(um[:, p], zm[:, p])
+                add(gi, ti, c, amount, f, self.gain[p])
+        return transfers, conversions
+
+
+def solve_exact(banks, currencies, balance, required, R, interet=0.03, penalty=1e3, tol=1e-7, method="highs-ipm",
+                costs=None):
+    """
+    Plan de transferts exact (PL creux, HiGHS) pour un nombre quelconque de devises.
+
+    Une banque excédentaire en c peut envoyer au plus son excédent, une banque déficitaire en c reçoit
+    au plus son déficit. Le bénéficiaire paie la source dans une devise f != c, au taux c -> f (X[c, f])
+    majoré de l'intérêt : paiement = transfert * X[c, f] * (1 + interet). Une devise sans taux vers
+    aucune autre ne peut pas être payée : elle n'est pas transférable, ses déficits restent en short.
+    costs : CostEngine (écart de conversion, frais de transfert) ; par défaut intérêt seul. Le PL en
+    prend la partie linéaire, le plan obtenu est ensuite chiffré en entier (pricing).
+    Le couple source / bénéficiaire n'intervenant pas dans le coût, le modèle est agrégé par banque
+    (compensation par devise et par couple (f, c)) : O(banques x devises²) variables.
+      out[b, c], inn[b, c] : montants envoyés / reçus en c
+      z[b, (f, c)] : part de inn[b, c] payée en f ; u[b, (f, c)] : part de out[b, c] réglée en f
+      short[b, c] : besoin non couvert (pénalisé)
+    Contraintes : solde final >= min(solde, 0) (un compte à découvert ne peut plus payer) et
+    solde final + short >= besoin.
+    Objectif : valeur des paiements (en devise de référence) + penalty x valeur des besoins non couverts.
+    Les montants agrégés sont ensuite appariés banque à banque par un balayage des sommes cumulées.
+    method : méthode HiGHS de scipy (point intérieur + crossover par défaut, le simplexe dual
+    souffre de la forte dégénérescence du modèle au-delà de quelques centaines de banques).
+
+    Renvoie un dict : status, cost, shortfall (matrice), final (matrice), transfers, conversions, pricing.
+    """
+    costs = costs if costs is not None else CostEngine(interet=interet)
+    balance = np.asarray(balance, dtype=np.float64)
+    required = np.asarray(required, dtype=np.float64)
+    n, C = balance.shape
+    w = currency_values(R)
+    L = ExactLayout(n, C, R, costs)
+    nC, nP, n_vars = L.nC, L.nP, L.size
+    bp_b, bp_p = L.bp_b, L.bp_p
+
+    # bounds: senders up to their surplus, receivers up to their deficit
+    gap = (balance - required).ravel()
+    upper = np.full(n_vars, np.inf)
+    upper[L.OUT:L.OUT + nC] = np.maximum(gap, 0.0)
+    upper[L.IN:L.IN + nC] = np.maximum(-gap, 0.0)
+    upper[L.unpaid()] = 0.0
+
+    cost = L.costs(w, penalty)
+    rows, cols, vals, n_eq = L.equalities(n_vars)
+    A_eq = sp.csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                         shape=(n_eq, n_vars))
+    b_eq = np.zeros(n_eq)
+
+    # final[b, k] = balance + delta @ x
+    delta = L.delta(n_vars)
+    short = L.short(n_vars)
+    flat_bal, flat_req = balance.ravel(), required.ravel()
+    # -delta <= max(balance, 0)  ;  -delta - short <= balance - required
+    A_ub = sp.vstack([-delta, -delta - short]).tocsr()
+    b_ub = np.concatenate([np.maximum(flat_bal, 0.0), flat_bal - flat_req])
+
+    # drop columns that are fixed to 0 (z without deficit, u without surplus)
+    keep = upper > 0
+    if L.P:
+        keep[L.Z:L.Z + nP] = upper[L.IN + bp_b * C + L.pc[bp_p]] > 0
+        keep[L.U:L.U + nP] = upper[L.OUT + bp_b * C + L.pc[bp_p]] > 0
+    cols = np.flatnonzero(keep)
+
+    # solve in reference-currency value units: amounts of e.g. JPY and EUR differ by orders of magnitude
+    col_w, eq_w = L.scales(w)
+    col_w = col_w[cols]
+    ub_w = np.concatenate([w[L.c_of], w[L.c_of]])
+    Dc = sp.diags(1.0 / col_w)
+    res = linprog(cost[cols] / col_w,
+                  A_ub=sp.diags(ub_w) @ A_ub[:, cols] @ Dc, b_ub=ub_w * b_ub,
+                  A_eq=sp.diags(eq_w) @ A_eq[:, cols] @ Dc, b_eq=eq_w * b_eq,
+                  bounds=np.column_stack([np.zeros(len(cols)), upper[cols] * col_w]), method=method)
+    if res.status != 0:
+        return {"status": res.message, "cost": None, "transfers": {}, "conversions": {}}
+    x = np.zeros(n_vars)
+    x[cols] = np.where(res.x > tol, res.x, 0.0) / col_w
+    final = (flat_bal + delta @ x).reshape(n, C)
+    shortfall = x[L.S:L.S + nC].reshape(n, C)
+    transfers, conversions = L.plan(x, banks, currencies, tol)
+    return {"status": "OPTIMAL", "cost": float(cost[:L.S] @ x[:L.S]), "shortfall": shortfall, "final": final,
+            "transfers": transfers, "conversions": conversions,
+            "pricing": costs.price_plan(transfers, conversions, currencies, w)}
+
+
+def plan_cost(conversions, currencies, R):
+    """Valeur des paiements d'un plan (même mesure que l'objectif de solve_exact, hors pénalités)."""
+    w = currency_values(R)
+    pos = {c: k for k, c in enumerate(currencies)}
+    return float(sum(amount * w[pos[f]] for (_, _, f, _), amount in conversions.items()))
+
+
+def plan_shortfall(banks, balances, required, transfers, conversions):
+    """Applique un plan (sans modifier les dicts) et renvoie {(banque, devise): besoin non couvert > 0}."""
+    final = dict(balances)
+    for (src, dst, cur), amount in transfers.items():
+        final[(src, cur)] = final.get((src, cur), 0.0) - amount
+        final[(dst, cur)] = final.get((dst, cur), 0.0) + amount
+    for (dst, src, from_cur, _), amount in conversions.items():
+        final[(dst, from_cur)] = final.get((dst, from_cur), 0.0) - amount
+        final[(src, from_cur)] = final.get((src, from_cur), 0.0) + amount
+    return {k: req - final.get(k, 0.0) for k, req in required.items() if req - final.get(k, 0.0) > 1e-6}
+
+
+def optimize_transfers(banks, balances, required, rates, interet=0.03, costs=None):
+    """
+    Optimisation exacte des transferts et conversions entre banques (voir solve_exact).
+    Mêmes entrées / sorties que l'heuristique optimize_transfers_greedy, sans modifier balances.
+
+    transfers[(b_src, b_dst, cur)] : montant transféré de b_src à b_dst dans la devise cur.
+    conversions[(b_dst, b_src, from_cur, to_cur)] : montant payé par b_dst à b_src dans from_cur pour recevoir to_cur.
+    """
+    banks, currencies, bal, req, R = to_matrices(banks, balances, required, rates)
+    result = solve_exact(banks, currencies, bal, req, R, interet=interet, costs=costs)
+    if result["status"] != "OPTIMAL":
+        raise RuntimeError("Optimisation impossible : " + str(result["status"]))
+    return result["transfers"], result["conversions"]
+
+
+# ------------ fast heuristic (array batches) ------------
+class TransferBatch:
+    """
+    Transferts sous forme de tableaux : src, dst, cur (codes), amount.
+    as_dict() construit (une seule fois) le dict {(b_src, b_dst, cur): montant} de optimize_transfers.
+    """
+
+    def __init__(self, banks, currencies, src, dst, cur, amount):
+        self.banks = banks
+        self.currencies = currencies
+        self.src = src
+        self.dst = dst
+        self.cur = cur
+        self.amount = amount
+        self._dict = None
+
+    def __len__(self):
+        return len(self.amount)
+
+    def as_dict(self):
+        if self._dict is None:
+            b = np.asarray(self.banks, dtype=object)
+            c = np.asarray(self.currencies, dtype=object)
+            keys = zip(b[self.src].tolist(), b[self.dst].tolist(), c[self.cur].tolist())
+            self._dict = {}
+            for key, a in zip(keys, self.amount.tolist()):
+                self._dict[key] = self._dict.get(key, 0.0) + a
+        return self._dict
+
+
+class ConversionBatch:
+    """
+    Paiements sous forme de tableaux : payer (bénéficiaire du transfert), payee (source),
+    from_cur, to_cur (codes), amount (montant payé en from_cur).
+    as_dict() -> {(b_dst, b_src, from_cur, to_cur): montant}, comme optimize_transfers.
+    """
+
+    def __init__(self, banks, currencies, payer, payee, from_cur, to_cur, amount):
+        self.banks = banks
+        self.currencies = currencies
+        self.payer = payer
+        self.payee = payee
+        self.from_cur = from_cur
+        self.to_cur = to_cur
+        self.amount = amount
+        self._dict = None
+
+    def __len__(self):
+        return len(self.amount)
+
+    def as_dict(self):
+        if self._dict is None:
+            b = np.asarray(self.banks, dtype=object)
+            c = np.asarray(self.currencies, dtype=object)
+            keys = zip(b[self.payer].tolist(), b[self.payee].tolist(),
+                       c[self.from_cur].tolist(), c[self.to_cur].tolist())
+            self._dict = {}
+            for key, a in zip(keys, self.amount.tolist()):
+                self._dict[key] = self._dict.get(key, 0.0) + a
+        return self._dict
+
+
+def match_transfers(banks, currencies, balance, required, R, interet=0.03, tol=1e-9, costs=None):
+    """
+    Heuristique rapide : excédents / déficits de toutes les banques et devises en une fois,
+    puis, pour chaque devise, appariement des excédents et des déficits triés par montant décroissant
+    (balayage à deux pointeurs sur les sommes cumulées, O(B log B)).
+    Chaque bénéficiaire ne reçoit que ce qu'il peut payer (valeur de ses excédents, intérêt compris) ;
+    le paiement est réparti sur ses devises excédentaires convertibles, au prorata de leur valeur,
+    au taux X[c, f] * (1 + interet) comme solve_exact (costs : CostEngine, par défaut intérêt seul).
+    Les paiements sont réservés sur les excédents avant l'appariement : seul le reste est transférable.
+    Comme dans solve_exact, une devise sans taux vers aucune autre n'est pas transférable.
+    N'altère pas balance / required. Renvoie (TransferBatch, ConversionBatch).
+    """
+    costs = costs if costs is not None else CostEngine(interet=interet)
+    balance = np.asarray(balance, dtype=np.float64)
+    required = np.asarray(required, dtype=np.float64)
+    n, C = balance.shape
+    gap = balance - required
+    surplus = np.maximum(gap, 0.0)
+    deficit = np.maximum(-gap, 0.0)
+    w = currency_values(R)
+    X = conversion_matrix(R)
+    convertible = np.isfinite(X) & ~np.eye(C, dtype=bool)   # [received c, paid f]
+    paid = convertible.any(axis=1)
+
+    # payment shares: share[b, c, f] of what b receives in c is paid in f
+    value = surplus * w
+    weights = value[:, None, :] * convertible[None, :, :]
+    total = weights.sum(axis=2, keepdims=True)
+    share = np.divide(weights, total, out=np.zeros_like(weights), where=total > 0)
+    # a receiver cannot pay more than the value of its surpluses: scale down its deficits
+    need = (deficit * w * costs.markup * paid).sum(axis=1)
+    budget = value.sum(axis=1)
+    scale = np.where(need > budget, budget / np.where(need > 0, need, 1.0), 1.0)
+    demand = np.where(paid, deficit * scale[:, None], 0.0)
+    # received currencies that the receiver cannot pay in at all
+    demand[(total[:, :, 0] <= 0) & paid] = 0.0
+    # payments are reserved out of the receivers' surpluses before matching, so that the same
+    # surplus is never both sent away and used to pay (no overdraft)
+    rate = np.where(convertible, X, 0.0)
+    reserve = costs.pay(demand[:, :, None] * share, rate[None, :, :]).sum(axis=1)   # (n, C) in paid f
+    ratio = np.divide(surplus, reserve, out=np.full_like(surplus, np.inf), where=reserve > tol)
+    fit = np.minimum(ratio.min(axis=1), 1.0)
+    demand = demand * fit[:, None]
+    available = np.maximum(surplus - reserve * fit[:, None], 0.0)
+
+    src, dst, cur, amount = [], [], [], []
+    for c in range(C):
+        give = np.flatnonzero(available[:, c] > tol)
+        take = np.flatnonzero(demand[:, c] > tol)
+        if not len(give) or not len(take):
+            continue
+        give = give[np.argsort(-available[give, c], kind="stable")]
+        take = take[np.argsort(-demand[take, c], kind="stable")]
+        gi, ti, a = _sweep(available[give, c], demand[take, c])
+        keep = a > tol
+        src.append(give[gi[keep]])
+        dst.append(take[ti[keep]])
+        cur.append(np.full(int(keep.sum()), c, dtype=np.int64))
+        amount.append(a[keep])
+
+    empty_i, empty_f = np.zeros(0, dtype=np.int64), np.zeros(0)
+    src = np.concatenate(src) if src else empty_i
+    dst = np.concatenate(dst) if dst else empty_i
+    cur = np.concatenate(cur) if cur else empty_i
+    amount = np.concatenate(amount) if amount else empty_f
+    transfers = TransferBatch(banks, currencies, src, dst, cur, amount)
+
+    # one payment per (transfer, paid currency) with a positive share
+    t_idx, f_idx = np.nonzero(share[dst, cur] > 0) if len(dst) else (empty_i, empty_i)
+    c_t = cur[t_idx]
+    pay = costs.pay(amount[t_idx] * share[dst[t_idx], c_t, f_idx], X[c_t, f_idx])
+    conversions = ConversionBatch(banks, currencies, dst[t_idx], src[t_idx], f_idx, c_t, pay)
+    return transfers, conversions
+
+
+def optimize_transfers_fast(banks, balances, required, rates, interet=0.03, costs=None):
+    """
+    Aperçu rapide (voir match_transfers) à partir des dicts de DataLoader, sans les modifier.
+    Renvoie (TransferBatch, ConversionBatch) ; .as_dict() donne le format de optimize_transfers.
+    """
+    banks, currencies, bal, req, R = to_matrices(banks, balances, required, rates)
+    return match_transfers(banks, currencies, bal, req, R, interet=interet, costs=costs)
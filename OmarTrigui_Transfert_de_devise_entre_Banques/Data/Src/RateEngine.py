@@ -0,0 +1,231 @@
+#Moteur de taux : meilleur taux de conversion (direct ou indirect) entre toutes les devises
+
+from collections.abc import Mapping
+import numpy as np
+
+
+class RateEngine(Mapping):
+    """
+    Matrice devise x devise des meilleurs taux, tous chemins de conversion confondus.
+
+    Les taux sont passés en log : le meilleur produit de taux le long d'un chemin est le plus court
+    chemin pour les poids -log(taux) (Floyd-Warshall vectorisé, O(C³)).
+    hop_cost : frais par conversion (un chemin à k étapes paie k fois), 0 par défaut.
+    Un cycle de poids négatif est une opportunité d'arbitrage : il est signalé dans arbitrage_cycles,
+    et les couples dont le meilleur chemin toucherait ce cycle retombent sur le taux direct.
+
+    S'utilise comme le dict rates de DataLoader : engine[(from_cur, to_cur)], engine.get(...), en O(1).
+    update_rate(from_cur, to_cur, rate) ne recalcule que les entrées concernées.
+    """
+
+    def __init__(self, currencies, R, hop_cost=0.0, tol=1e-12):
+        self.currencies = list(currencies)
+        self.index = {c: k for k, c in enumerate(self.currencies)}
+        self.hop_cost = hop_cost
+        self.tol = tol
+        R = np.asarray(R, dtype=np.float64).copy()
+        np.fill_diagonal(R, 1.0)
+        self.direct = R
+        self.recompute()
+
+    # ------------ construction ------------
+    @classmethod
+    def from_dict(cls, rates, hop_cost=0.0):
+        currencies = sorted({c for pair in rates for c in pair})
+        pos = {c: k for k, c in enumerate(currencies)}
+        R = np.full((len(currencies), len(currencies)), np.nan)
+        for (f, t), v in rates.items():
+            R[pos[f], pos[t]] = v
+        return cls(currencies, R, hop_cost=hop_cost)
+
+    @classmethod
+    def from_loader(cls, loader, hop_cost=0.0):
+        """Taux de Rates.csv via DataLoader ; la matrice des meilleurs taux est mise en cache avec le CSV."""
+        currencies, R = loader.load_rate_matrix()
+        cached = loader._read_cache(loader.rates_file, tag="best")
+        if cached is not None and float(cached["hop_cost"]) == hop_cost \
+                and np.array_equal(cached["direct"], R, equal_nan=True):
+            engine = cls.__new__(cls)
+            engine.currencies = list(currencies)
+            engine.index = {c: k for k, c in enumerate(engine.currencies)}
+            engine.hop_cost, engine.tol = hop_cost, 1e-12
+            engine.direct = cached["direct"]
+            engine.dist, engine.next = cached["dist"], cached["next"]
+            engine._finish()
+            return engine
+        engine = cls(currencies, R, hop_cost=hop_cost)
+        loader._write_cache(loader.rates_file, tag="best", direct=engine.direct, dist=engine.dist,
+                            next=engine.next, hop_cost=np.float64(hop_cost))
+        return engine
+
+    def _weights(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            W = -np.log(self.direct) + np.log1p(self.hop_cost)
+        W[~(self.direct > 0)] = np.inf
+        np.fill_diagonal(W, 0.0)
+        return W
+
+    def recompute(self):
+        """Floyd-Warshall complet : dist (poids log) et next (successeur sur le meilleur chemin)."""
+        W = self._weights()
+        C = len(self.currencies)
+        dist = W.copy()
+        nxt = np.where(np.isfinite(W), np.arange(C)[None, :], -1)
+        for k in range(C):
+            via = dist[:, k:k + 1] + dist[k:k + 1, :]
+            better = via < dist - self.tol
+            if better.any():
+                dist = np.where(better, via, dist)
+                nxt = np.where(better, nxt[:, k:k + 1], nxt)
+        self.dist, self.next = dist, nxt
+        self._finish()
+
+    def _finish(self):
+        """Détection d'arbitrage puis matrice des meilleurs taux (lecture O(1))."""
+        diag = np.diag(self.dist)
+        self.arbitrage_nodes = np.flatnonzero(diag < -self.tol)
+        self.arbitrage_cycles = [self.cycle(k) for k in self._distinct_cycles()]
+        with np.errstate(over="ignore"):
+            best = np.exp(-self.dist)
+        np.fill_diagonal(best, 1.0)
+        if len(self.arbitrage_nodes):
+            # pairs whose best path can run through an arbitrage cycle: unbounded, use the direct rate
+            touch = np.isfinite(self.dist[:, self.arbitrage_nodes]).any(axis=1)[:, None] \
+                & np.isfinite(self.dist[self.arbitrage_nodes, :]).any(axis=0)[None, :]
+            best = np.where(touch, self.direct, best)
+        else:
+            touch = np.zeros(best.shape, dtype=bool)
+        best[~np.isfinite(best) | (best <= 0)] = np.nan
+        self.best, self._unbounded = best, touch
+
+    def _distinct_cycles(self):
+        seen, starts = set(), []
+        for k in self.arbitrage_nodes.tolist():
+            if k in seen:
+                continue
+            seen |= {self.index[c] for c in self.cycle(k)}
+            starts.append(k)
+        return starts
+
+    # ------------ queries ------------
+    def path(self, from_cur, to_cur):
+        """Chaîne de devises du meilleur chemin (liste vide si aucun)."""
+        i, j = self.index[from_cur], self.index[to_cur]
+        if self._unbounded[i, j]:
+            return [from_cur, to_cur] if not np.isnan(self.best[i, j]) else []
+        if self.next[i, j] < 0:
+            return []
+        out = [from_cur]
+        for _ in range(len(self.currencies)):
+            if i == j:
+                break
+            i = int(self.next[i, j])
+            out.append(self.currencies[i])
+        return out
+
+    def cycle(self, k):
+        """Devises d'un cycle d'arbitrage passant par (ou menant à) la devise d'indice k."""
+        C = len(self.currencies)
+        v = k
+        for _ in range(C):
+            # walk far enough to be on the cycle itself
+            v = int(self.next[v, k]) if self.next[v, k] >= 0 else v
+        out, u = [self.currencies[v]], int(self.next[v, v])
+        while u >= 0 and u != v and len(out) <= C:
+            out.append(self.currencies[u])
+            u = int(self.next[u, v])
+        return out
+
+    def matrix_for(self, currencies):
+        """Meilleurs taux réordonnés selon currencies (NaN pour les devises inconnues)."""
+        pos = np.array([self.index.get(c, -1) for c in currencies])
+        M = np.full((len(pos), len(pos)), np.nan)
+        ok = pos >= 0
+        M[np.ix_(ok, ok)] = self.best[np.ix_(pos[ok], pos[ok])]
+        np.fill_diagonal(M, 1.0)
+        return M
+
+    def __getitem__(self, pair):
+        f, t = pair
+        v = self.best[self.index[f], self.index[t]] if f in self.index and t in self.index else np.nan
+        if f == t or np.isnan(v):
+            raise KeyError(pair)
+        return float(v)
+
+    def __iter__(self):
+        rows, cols = np.nonzero(~np.isnan(self.best) & ~np.eye(len(self.currencies), dtype=bool))
+        return ((self.currencies[i], self.currencies[j]) for i, j in zip(rows.tolist(), cols.tolist()))
+
+    def __len__(self):
+        return int((~np.isnan(self.best)).sum() - np.count_nonzero(~np.isnan(np.diag(self.best))))
+
+    # ------------ incremental update ------------
+    def update_rate(self, from_cur, to_cur, rate):
+        """
+        Nouveau taux direct from_cur -> to_cur (nouvelle devise ajoutée si besoin).
+        Baisse du poids (meilleur taux) : relaxation d[i, j] = min(d[i, j], d[i, u] + w + d[v, j]), O(C²).
+        Hausse : seules les sources dont un meilleur chemin utilisait l'arc sont recalculées.
+        """
+        for c in (from_cur, to_cur):
+            if c not in self.index:
+                self._add_currency(c)
+        u, v = self.index[from_cur], self.index[to_cur]
+        if u == v:
+            return
+        old = self._weights()[u, v]
+        self.direct[u, v] = rate
+        new = self._weights()[u, v]
+        if len(self.arbitrage_nodes):
+            # distances are not meaningful around a negative cycle
+            self.recompute()
+            return
+        d = self.dist
+        if new <= old:
+            via = d[:, u:u + 1] + new + d[v:v + 1, :]
+            better = via < d - self.tol
+            if better.any():
+                # for sources routed through (u, v) the first hop is the first hop towards u (or v itself)
+                first = np.where(np.arange(len(d)) == u, v, self.next[:, u])
+                self.next = np.where(better, first[:, None], self.next)
+                self.dist = np.where(better, via, d)
+        else:
+            with np.errstate(invalid="ignore"):
+                gap = np.abs(d[:, u:u + 1] + old + d[v:v + 1, :] - d)
+            used = np.isfinite(old) & (gap <= 1e-9 * (1 + np.abs(d)))
+            np.fill_diagonal(used, False)
+            sources = np.flatnonzero(used.any(axis=1))
+            if len(sources):
+                self._recompute_rows(sources)
+        self._finish()
+
+    def _recompute_rows(self, sources):
+        """
+        Floyd-Warshall restreint aux lignes sources, O(|sources| x C²) : les autres lignes sont déjà
+        des plus courts chemins (l'arc dégradé ne les raccourcit pas) et restent inchangées.
+        """
+        W = self._weights()
+        C = len(self.currencies)
+        self.dist[sources] = W[sources]
+        self.next[sources] = np.where(np.isfinite(W[sources]), np.arange(C)[None, :], -1)
+        for k in range(C):
+            D = self.dist[sources]
+            via = D[:, k:k + 1] + self.dist[k:k + 1, :]
+            better = via < D - self.tol
+            if better.any():
+                self.dist[sources] = np.where(better, via, D)
+                self.next[sources] = np.where(better, self.next[sources, k:k + 1], self.next[sources])
+
+    def _add_currency(self, c):
+        C = len(self.currencies)
+        self.currencies.append(c)
+        self.index[c] = C
+        R = np.full((C + 1, C + 1), np.nan)
+        R[:C, :C] = self.direct
+        R[C, C] = 1.0
+        self.direct = R
+        for name, fill in (("dist", np.inf), ("next", -1)):
+            M = np.full((C + 1, C + 1), fill, dtype=getattr(self, name).dtype)
+            M[:C, :C] = getattr(self, name)
+            setattr(self, name, M)
+        self.dist[C, C] = 0.0
+        self.next[C, C] = C
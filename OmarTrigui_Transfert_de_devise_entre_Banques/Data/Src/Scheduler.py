@@ -0,0 +1,165 @@
+#Planification intrajournalière : réseau banque x devise déplié dans le temps, horizon glissant
+
+import time
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+from Src.Optimizer import ExactLayout, currency_values, to_matrices
+from Src.Utils import CostEngine
+
+
+class RollingScheduler:
+    """
+    Journée découpée en T fenêtres de règlement. required[t] : soldes exigés à la fin de la fenêtre t,
+    flows[t] : flux externes prévus pendant la fenêtre t (encaissements > 0, décaissements < 0), (T, n, C).
+
+    Le PL couvre k fenêtres : une copie du modèle de solve_exact par fenêtre, reliées par les soldes
+    cumulés (solde fin de t = solde d'ouverture + flux et transferts des fenêtres <= t). Les matrices
+    sont construites et mises à l'échelle une seule fois ; à chaque pas seuls les seconds membres
+    changent. step() optimise les k fenêtres suivantes, engage la première et avance d'une fenêtre.
+
+    time_weight : surcoût relatif des fenêtres les plus tôt, pour ne transférer qu'au moment du besoin.
+    costs : CostEngine (par défaut intérêt seul), comme solve_exact.
+    """
+
+    def __init__(self, banks, currencies, balance, required, flows, R, horizon=4, interet=0.03,
+                 penalty=1e3, time_weight=1e-3, tol=1e-7, method="highs-ipm", costs=None):
+        self.banks, self.currencies = list(banks), list(currencies)
+        self.required = np.asarray(required, dtype=np.float64)
+        self.flows = np.asarray(flows, dtype=np.float64)
+        if self.required.ndim == 2:
+            self.required = np.broadcast_to(self.required, self.flows.shape)
+        self.T, n, C = self.flows.shape
+        self.balance = np.array(balance, dtype=np.float64)
+        self.k = k = max(1, min(horizon, self.T))
+        self.tol, self.method = tol, method
+        self.window = 0
+        self.steps = []
+
+        t0 = time.perf_counter()
+        w = currency_values(R)
+        self.costs = costs if costs is not None else CostEngine(interet=interet)
+        L = ExactLayout(n, C, R, self.costs)
+        self.layouts = [L] + [ExactLayout(n, C, R, self.costs, base=t * L.size) for t in range(1, k)]
+        n_vars = k * L.size
+        cost = np.concatenate([L.costs(w, 0.0) * (1 + time_weight * (k - 1 - t)) for t in range(k)])
+        for lay in self.layouts:
+            cost[lay.S:lay.S + lay.nC] = penalty * w[lay.c_of]
+
+        rows, cols, vals, n_eq = [], [], [], 0
+        for lay in self.layouts:
+            r, c, v, m = lay.equalities(n_vars, n_eq)
+            rows += r; cols += c; vals += v; n_eq += m
+        A_eq = sp.csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                             shape=(n_eq, n_vars))
+
+        # cumulative deltas: rows of window t sum the transfers of windows 0..t
+        deltas = [lay.delta(n_vars) for lay in self.layouts]
+        self.delta0 = deltas[0]
+        cum, blocks = None, []
+        for lay, d in zip(self.layouts, deltas):
+            cum = d if cum is None else cum + d
+            blocks += [-cum, -cum - lay.short(n_vars)]
+        A_ub = sp.vstack(blocks).tocsr()
+
+        # same scaling as solve_exact (reference-currency value units), applied once
+        col_w = np.concatenate([lay.scales(w)[0] for lay in self.layouts])
+        eq_w = np.concatenate([lay.scales(w)[1] for lay in self.layouts])
+        self.ub_w = np.tile(w[L.c_of], 2 * k)
+        Dc = sp.diags(1.0 / col_w)
+        self.col_w = col_w
+        self.cost = cost
+        self.c_s = cost / col_w
+        self.A_ub = (sp.diags(self.ub_w) @ A_ub @ Dc).tocsr()
+        self.A_eq = (sp.diags(eq_w) @ A_eq @ Dc).tocsr()
+        self.b_eq = np.zeros(n_eq)
+        # transfers of currencies without any payment currency are fixed to 0, as in solve_exact
+        upper = np.full(n_vars, np.inf)
+        for lay in self.layouts:
+            upper[lay.unpaid()] = 0.0
+        self.bounds = np.column_stack([np.zeros(n_vars), upper])
+        self.build_time = time.perf_counter() - t0
+
+    @classmethod
+    def from_dicts(cls, banks, balances, required, rates, required_profile, flows, **kwargs):
+        """
+        Dicts de DataLoader (soldes d'ouverture, besoins de référence) + profils (T, n, C) :
+        required_profile multiplie les besoins de référence par fenêtre (ou (T,) pour toutes les cases).
+        """
+        banks, currencies, bal, req, R = to_matrices(banks, balances, required, rates)
+        profile = np.asarray(required_profile, dtype=np.float64)
+        if profile.ndim == 1:
+            profile = profile[:, None, None]
+        return cls(banks, currencies, bal, req[None] * profile, flows, R, **kwargs)
+
+    def _window_data(self):
+        """Besoins et flux cumulés des k fenêtres de l'horizon ; au-delà de la journée : aucun besoin, aucun flux."""
+        n, C = self.balance.shape
+        req = np.zeros((self.k, n, C))
+        flw = np.zeros((self.k, n, C))
+        stop = min(self.window + self.k, self.T)
+        req[:stop - self.window] = self.required[self.window:stop]
+        flw[:stop - self.window] = self.flows[self.window:stop]
+        return req, np.cumsum(flw, axis=0)
+
+    def rhs(self):
+        """Seconds membres des inégalités (mis à l'échelle) pour la position courante."""
+        req, cumflow = self._window_data()
+        base = (self.balance[None] + cumflow).reshape(self.k, -1)
+        b_ub = np.concatenate([np.concatenate([np.maximum(b, 0.0), b - r])
+                               for b, r in zip(base, req.reshape(self.k, -1))])
+        return self.ub_w * b_ub
+
+    def step(self, realised=None):
+        """
+        Optimise les k fenêtres suivantes, engage la première. realised : flux externes observés
+        de la fenêtre (n, C), à la place de la prévision, pour le solde d'ouverture suivant.
+        Renvoie le rapport du pas (plan engagé et temps par phase).
+        """
+        if self.done:
+            raise IndexError("journée terminée")
+        t0 = time.perf_counter()
+        b_ub = self.rhs()
+        t1 = time.perf_counter()
+        # no surplus / deficit caps as in solve_exact: they are taken from a single opening position,
+        # while here a bank may pass on in window t what it received earlier. The balance rows already
+        # keep every account above min(balance, 0) at the end of each window.
+        res = linprog(self.c_s, A_ub=self.A_ub, b_ub=b_ub, A_eq=self.A_eq, b_eq=self.b_eq,
+                      bounds=self.bounds, method=self.method)
+        t2 = time.perf_counter()
+        n, C = self.balance.shape
+        report = {"window": self.window, "status": "OPTIMAL" if res.status == 0 else res.message}
+        flows = self.flows[self.window] if realised is None else np.asarray(realised, dtype=np.float64)
+        if res.status == 0:
+            x = np.where(res.x > self.tol, res.x, 0.0) / self.col_w
+            L = self.layouts[0]
+            transfers, conversions = L.plan(x, self.banks, self.currencies, self.tol)
+            self.balance = self.balance + flows + (self.delta0 @ x).reshape(n, C)
+            shortfall = x[L.S:L.S + L.nC].reshape(n, C)
+            cost = float(self.cost[:L.S] @ x[:L.S])
+        else:
+            # nothing committed: the window settles external flows only
+            transfers, conversions = {}, {}
+            self.balance = self.balance + flows
+            shortfall = np.maximum(self.required[self.window] - self.balance, 0.0)
+            cost = None
+        t3 = time.perf_counter()
+        report.update(transfers=transfers, conversions=conversions, cost=cost, shortfall=shortfall,
+                      balance=self.balance.copy(), rhs_time=t1 - t0, solve_time=t2 - t1, extract_time=t3 - t2)
+        self.steps.append(report)
+        self.window += 1
+        return report
+
+    @property
+    def done(self):
+        return self.window >= self.T
+
+    def run(self):
+        """Toute la journée, fenêtre par fenêtre ; renvoie la liste des rapports."""
+        while not self.done:
+            self.step()
+        return self.steps
+
+    def timings(self):
+        """Temps par pas (s) : tableau (pas, [rhs, solve, extract])."""
+        return np.array([[s["rhs_time"], s["solve_time"], s["extract_time"]] for s in self.steps])
@@ -0,0 +1,201 @@
+#Stress test Monte-Carlo : chocs de change et de soldes appliqués au plan courant
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from Src.Optimizer import solve_exact, currency_values, to_matrices
+from Src.Netting import from_dicts
+from Src.Utils import CostEngine
+
+
+def _reoptimize(args):
+    """Tâche du pool : ré-optimisation d'un scénario en rupture (fonction de module, picklable)."""
+    s, banks, currencies, balance, required, R, costs = args
+    result = solve_exact(banks, currencies, balance, required, R, costs=costs)
+    if result["status"] != "OPTIMAL":
+        return s, np.nan, np.nan
+    w = currency_values(R)
+    return s, result["pricing"]["total"], float((result["shortfall"] * w[None, :]).sum())
+
+
+class StressResult:
+    """
+    Résultats par scénario (tableaux de longueur S), montants en devise de référence :
+      cost : coût du plan (paiements + frais de transfert, CostEngine) ; gap : valeur des besoins non couverts ;
+      overdraft : valeur des découverts créés par le plan ; broken : comptes rompus ;
+      breach : plan en rupture (au moins un compte rompu) ;
+      loss : (cost + gap) - (cost + gap) du scénario central ;
+      reopt_cost, reopt_gap : après ré-optimisation (NaN si non ré-optimisé).
+    """
+
+    def __init__(self, base_cost, base_gap, cost, gap, overdraft, broken, reopt_cost, reopt_gap):
+        self.base_cost = base_cost
+        self.base_gap = base_gap
+        self.cost = cost
+        self.gap = gap
+        self.overdraft = overdraft
+        self.broken = broken
+        self.breach = broken > 0
+        self.loss = cost + gap - (base_cost + base_gap)
+        self.reopt_cost = reopt_cost
+        self.reopt_gap = reopt_gap
+
+    def __len__(self):
+        return len(self.cost)
+
+    def reopt_loss(self):
+        """Perte après ré-optimisation là où elle a eu lieu, perte du plan courant ailleurs."""
+        redone = ~np.isnan(self.reopt_cost)
+        out = self.loss.copy()
+        out[redone] = self.reopt_cost[redone] + self.reopt_gap[redone] - (self.base_cost + self.base_gap)
+        return out
+
+    def summary(self, levels=(0.95, 0.99)):
+        out = {"scenarios": len(self), "breach_probability": float(self.breach.mean()),
+               "gap_probability": float((self.gap > self.base_gap + 1e-6).mean()),
+               "overdraft_probability": float((self.overdraft > 1e-6).mean()),
+               "mean_broken_accounts": float(self.broken.mean()),
+               "reoptimized": int((~np.isnan(self.reopt_cost)).sum()),
+               "mean_loss": float(self.loss.mean())}
+        for name, loss in (("loss", self.loss), ("reopt_loss", self.reopt_loss())):
+            for q in levels:
+                var = float(np.quantile(loss, q))
+                out[f"{name}_var{int(q * 100)}"] = var
+                out[f"{name}_es{int(q * 100)}"] = float(loss[loss >= var].mean())
+        return out
+
+
+class StressEngine:
+    """
+    Évalue un plan fixe (transferts + paiements) sous S scénarios en un seul calcul vectorisé.
+
+    Chocs : log-rendements z[s, c] ~ N(0, fx_vol²) des devises contre la devise de référence
+    (indice 0, non choquée), éventuellement corrélés (fx_corr) ; soldes multipliés par
+    exp(bal_vol * N(0, 1)) case par case.
+    Sous un scénario, un transfert reste fixé dans sa devise ; le paiement associé, fixé au taux
+    X[c, f], devient amount * X_s[c, f] / X[c, f] = amount * exp(z_c - z_f).
+    Un compte est rompu si le plan y crée un découvert, ou si un besoin couvert dans le scénario
+    central ne l'est plus, au-delà de breach_tol x max(besoin, |solde|). Un scénario est en rupture
+    dès qu'un compte est rompu ; seuls ceux-là sont ré-optimisés (solve_exact), en parallèle dans un
+    pool de processus.
+    Le coût d'un scénario est chiffré par costs (CostEngine) : paiements revalorisés, plus les frais de
+    transfert aux valeurs du scénario (un transfert peut changer de palier).
+    """
+
+    def __init__(self, banks, currencies, balance, required, R, transfers, conversions, interet=0.03, costs=None):
+        self.banks = list(banks)
+        self.currencies = list(currencies)
+        self.balance = np.asarray(balance, dtype=np.float64)
+        self.required = np.asarray(required, dtype=np.float64)
+        self.R = np.asarray(R, dtype=np.float64)
+        self.costs = costs if costs is not None else CostEngine(interet=interet)
+        if isinstance(transfers, dict):
+            transfers, conversions = from_dicts(transfers, conversions, self.banks, self.currencies)
+        self.t_cur, self.t_amount = transfers.cur, transfers.amount
+        n, C = self.balance.shape
+        # transfers: fixed change of balances
+        self.delta_t = np.zeros((n, C))
+        np.add.at(self.delta_t, (transfers.dst, transfers.cur), transfers.amount)
+        np.add.at(self.delta_t, (transfers.src, transfers.cur), -transfers.amount)
+        # payments aggregated per (bank, paid f, received c): they scale with exp(z_c - z_f)
+        self.pay_net = np.zeros((n, C, C))
+        self.pay_total = np.zeros((C, C))
+        if conversions is not None and len(conversions):
+            np.add.at(self.pay_net, (conversions.payee, conversions.from_cur, conversions.to_cur), conversions.amount)
+            np.add.at(self.pay_net, (conversions.payer, conversions.from_cur, conversions.to_cur), -conversions.amount)
+            np.add.at(self.pay_total, (conversions.from_cur, conversions.to_cur), conversions.amount)
+        self.w = currency_values(self.R)
+        central = self.balance + self.delta_t + self.pay_net.sum(axis=2)
+        self.scale = np.maximum(self.required, np.abs(self.balance)) + 1.0
+        self.covered = central >= self.required - 1e-9 * self.scale
+
+    @classmethod
+    def from_dicts(cls, banks, balances, required, rates, transfers, conversions, interet=0.03, costs=None):
+        """Mêmes entrées que optimize_transfers, plus le plan qu'il a renvoyé."""
+        banks, currencies, bal, req, R = to_matrices(banks, balances, required, rates)
+        return cls(banks, currencies, bal, req, R, transfers, conversions, interet=interet, costs=costs)
+
+    def sample(self, n_scenarios, fx_vol=0.01, bal_vol=0.05, fx_corr=None, rng=None):
+        """(z, balance_shock) : z (S, C) avec z[:, 0] = 0, balance_shock (S, n, C) multiplicatif."""
+        rng = rng if rng is not None else np.random.default_rng()
+        n, C = self.balance.shape
+        vol = np.broadcast_to(np.asarray(fx_vol, dtype=np.float64), (C,)).copy()
+        vol[0] = 0.0
+        z = rng.standard_normal((n_scenarios, C))
+        if fx_corr is not None and C > 1:
+            # correlation between non-reference currencies
+            z[:, 1:] = z[:, 1:] @ np.linalg.cholesky(np.asarray(fx_corr, dtype=np.float64)[1:, 1:]).T
+        z *= vol[None, :]
+        shock = np.exp(bal_vol * rng.standard_normal((n_scenarios, n, C))) if bal_vol else np.ones((n_scenarios, n, C))
+        return z, shock
+
+    def evaluate(self, z, shock, breach_tol=5e-3):
+        """
+        Coût, besoins non couverts, découverts et nombre de comptes rompus du plan pour un lot
+        de scénarios (tableaux (S,)).
+        """
+        ratio = np.exp(z[:, None, :] - z[:, :, None])                      # [s, f, c] = exp(z_c - z_f)
+        final = self.balance[None] * shock + self.delta_t[None] + np.einsum("bfc,sfc->sbf", self.pay_net, ratio)
+        w = self.w[None, :] * np.exp(z)                                    # (S, C) scenario values
+        cost = np.einsum("fc,sfc,sf->s", self.pay_total, ratio, w)
+        if self.costs.has_transfer_fees and len(self.t_amount):
+            cost += self.costs.transfer_fees(self.t_amount, self.t_cur, w).sum(axis=1)
+        gap = np.einsum("sbc,sc->s", np.maximum(self.required[None] - final, 0.0), w)
+        # overdraft created by the plan (accounts already negative before the plan do not count)
+        floor = np.minimum(self.balance[None] * shock, 0.0)
+        overdraft = np.einsum("sbc,sc->s", np.maximum(floor - final, 0.0), w)
+        limit = breach_tol * self.scale[None]
+        broken = (self.covered[None] & (self.required[None] - final > limit)) | (floor - final > limit)
+        return cost, gap, overdraft, broken.sum(axis=(1, 2))
+
+    def scenario_rates(self, z):
+        """Matrice des taux du scénario : R_s[f, c] = R[f, c] * exp(z_f - z_c)."""
+        return self.R * np.exp(z[:, None] - z[None, :])
+
+    def run(self, n_scenarios=1000, fx_vol=0.006, bal_vol=0.01, fx_corr=None, seed=0, chunk=500,
+            breach_tol=5e-3, reoptimize=True, max_reopt=None, workers=None):
+        """
+        Lance S scénarios par lots de chunk (mémoire O(chunk x banques x devises)), puis
+        ré-optimise les scénarios en rupture (au plus max_reopt, les plus coûteux d'abord).
+        workers : taille du pool (None = nombre de CPU, 0 = sans pool).
+        """
+        rng = np.random.default_rng(seed)
+        base_cost, base_gap, _, _ = self.evaluate(np.zeros((1, len(self.currencies))),
+                                                  np.ones((1,) + self.balance.shape))
+        base_cost, base_gap = float(base_cost[0]), float(base_gap[0])
+
+        cost, gap, overdraft = (np.empty(n_scenarios) for _ in range(3))
+        broken = np.zeros(n_scenarios, dtype=np.int64)
+        stored = {}   # breached scenarios: (z, shocked balance) for re-optimisation
+        for start in range(0, n_scenarios, chunk):
+            stop = min(start + chunk, n_scenarios)
+            z, shock = self.sample(stop - start, fx_vol, bal_vol, fx_corr, rng)
+            cost[start:stop], gap[start:stop], overdraft[start:stop], broken[start:stop] = \
+                self.evaluate(z, shock, breach_tol)
+            hit = broken[start:stop] > 0
+            if reoptimize:
+                for k in np.flatnonzero(hit).tolist():
+                    stored[start + k] = (z[k], self.balance * shock[k])
+
+        reopt_cost = np.full(n_scenarios, np.nan)
+        reopt_gap = np.full(n_scenarios, np.nan)
+        if reoptimize and stored:
+            order = sorted(stored, key=lambda s: -(cost[s] + gap[s] + overdraft[s]))
+            if max_reopt is not None:
+                order = order[:max_reopt]
+            tasks = [(s, self.banks, self.currencies, stored[s][1], self.required,
+                      self.scenario_rates(stored[s][0]), self.costs) for s in order]
+            if workers == 0:
+                results = map(_reoptimize, tasks)
+                self._collect(results, reopt_cost, reopt_gap)
+            else:
+                with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+                    size = workers or os.cpu_count() or 1
+                    self._collect(pool.map(_reoptimize, tasks, chunksize=max(1, len(tasks) // (4 * size))),
+                                  reopt_cost, reopt_gap)
+        return StressResult(base_cost, base_gap, cost, gap, overdraft, broken, reopt_cost, reopt_gap)
+
+    @staticmethod
+    def _collect(results, reopt_cost, reopt_gap):
+        for s, c, g in results:
+            reopt_cost[s], reopt_gap[s] = c, g
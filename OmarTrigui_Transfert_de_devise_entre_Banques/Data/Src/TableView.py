@@ -0,0 +1,155 @@
+#Tableau des soldes / besoins : lignes virtuelles sur les matrices de BankMatrices, modifications suivies
+
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+
+COLUMNS = (("Bank", "Banque"), ("Currency", "Devise"), ("Balance", "Solde"), ("Required", "Besoin"))
+EDITABLE = {"Balance": "balance", "Required": "required"}
+
+
+class BankTable:
+    """
+    Modèle du tableau : une ligne par couple (banque, devise) présent dans BankMatrices, valeurs lues
+    et écrites directement dans matrices.balance / matrices.required (pas de copie par ligne).
+    Les lignes modifiées sont notées dans dirty ; sync() ne recopie qu'elles dans les dicts.
+    """
+
+    def __init__(self, matrices):
+        self.matrices = matrices
+        self.b_idx, self.c_idx = np.nonzero(matrices.present)
+        self.banks = np.asarray(matrices.banks, dtype=object)
+        self.currencies = np.asarray(matrices.currencies, dtype=object)
+        self.dirty = set()
+
+    def __len__(self):
+        return len(self.b_idx)
+
+    def rows(self, start, stop):
+        """Valeurs affichées des lignes [start, stop)."""
+        b, c = self.b_idx[start:stop], self.c_idx[start:stop]
+        return list(zip(self.banks[b].tolist(), self.currencies[c].tolist(),
+                        self.matrices.balance[b, c].tolist(), self.matrices.required[b, c].tolist()))
+
+    def set_value(self, row, column, value):
+        """Modifie Solde / Besoin d'une ligne ; ValueError si la colonne n'est pas modifiable ou value invalide."""
+        if column not in EDITABLE:
+            raise ValueError(f"colonne non modifiable : {column}")
+        value = float(value)
+        getattr(self.matrices, EDITABLE[column])[self.b_idx[row], self.c_idx[row]] = value
+        self.dirty.add(row)
+
+    def sync(self, balances, required):
+        """Recopie les lignes modifiées dans les dicts de DataLoader ; renvoie leur nombre."""
+        for row in self.dirty:
+            b, c = self.b_idx[row], self.c_idx[row]
+            key = (self.banks[b], self.currencies[c])
+            balances[key] = float(self.matrices.balance[b, c])
+            required[key] = float(self.matrices.required[b, c])
+        count = len(self.dirty)
+        self.dirty.clear()
+        return count
+
+
+class VirtualTable(tk.Frame):
+    """
+    Treeview de page_size lignes réutilisées : le défilement ne fait que réécrire les valeurs des
+    lignes visibles (O(page_size)), quelle que soit la taille du modèle. Double-clic sur Solde /
+    Besoin : saisie en place, écrite dans le modèle (BankTable.set_value).
+    """
+
+    def __init__(self, master, page_size=15):
+        super().__init__(master)
+        self.page_size = page_size
+        self.model = None
+        self.offset = 0
+        self.editor = None
+        self.tree = ttk.Treeview(self, columns=[c for c, _ in COLUMNS], show="headings", height=page_size,
+                                 selectmode="browse")
+        for col, text in COLUMNS:
+            self.tree.heading(col, text=text)
+        self.scroll = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scroll.pack(side="right", fill="y")
+        self.items = [self.tree.insert("", "end", iid=f"r{k}", values=()) for k in range(page_size)]
+        self.tree.bind("<Double-1>", self._edit)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(seq, self._wheel)
+
+    def set_model(self, model):
+        self._close_editor()
+        self.model = model
+        self.offset = 0
+        self.refresh()
+
+    def refresh(self):
+        n = len(self.model) if self.model is not None else 0
+        self.offset = max(0, min(self.offset, n - self.page_size))
+        rows = self.model.rows(self.offset, self.offset + self.page_size) if n else []
+        attached = set(self.tree.get_children())
+        for pos, iid in enumerate(self.items):
+            if pos < len(rows):
+                if iid not in attached:
+                    self.tree.move(iid, "", pos)
+                self.tree.item(iid, values=rows[pos])
+            elif iid in attached:
+                self.tree.detach(iid)  # short model: hide unused rows
+        if n:
+            self.scroll.set(self.offset / n, min(1.0, (self.offset + self.page_size) / n))
+        else:
+            self.scroll.set(0.0, 1.0)
+
+    # ------------ défilement ------------
+    def _yview(self, action, amount, unit=None):
+        n = len(self.model) if self.model is not None else 0
+        if action == "moveto":
+            self.offset = int(float(amount) * n)
+        elif action == "scroll":
+            step = self.page_size if unit == "pages" else 1
+            self.offset += int(amount) * step
+        self._close_editor()
+        self.refresh()
+
+    def _wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self._yview("scroll", -3)
+        else:
+            self._yview("scroll", 3)
+        return "break"
+
+    # ------------ saisie en place ------------
+    def _edit(self, event):
+        iid = self.tree.identify_row(event.y)
+        column = self.tree.identify_column(event.x)
+        if not iid or not column:
+            return
+        name = COLUMNS[int(column[1:]) - 1][0]
+        if name not in EDITABLE:
+            return
+        row = self.offset + self.items.index(iid)
+        x, y, w, h = self.tree.bbox(iid, column)
+        self._close_editor()
+        self.editor = tk.Entry(self.tree)
+        self.editor.insert(0, self.tree.set(iid, name))
+        self.editor.select_range(0, "end")
+        self.editor.place(x=x, y=y, width=w, height=h)
+        self.editor.focus_set()
+        self.editor.bind("<Return>", lambda e: self._commit(row, name))
+        self.editor.bind("<FocusOut>", lambda e: self._commit(row, name))
+        self.editor.bind("<Escape>", lambda e: self._close_editor())
+
+    def _commit(self, row, name):
+        if self.editor is None:
+            return
+        text = self.editor.get()
+        self._close_editor()
+        try:
+            self.model.set_value(row, name, text)
+        except ValueError:
+            self.bell()
+        self.refresh()
+
+    def _close_editor(self):
+        if self.editor is not None:
+            editor, self.editor = self.editor, None
+            editor.destroy()
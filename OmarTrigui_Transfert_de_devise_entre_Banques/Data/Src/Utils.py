@@ -1,5 +1,8 @@
 #Fonctions utilitaires (frais, conversions)
 
+import numpy as np
+
+
 def compute_transfer_cost(amount, fee_rate):
     return amount * fee_rate
 
@@ -11,3 +14,100 @@ def usd_to_eur(amount_usd, rate):
 
 def eur_to_usd(amount_eur, rate):
     return amount_eur * rate
+
+
+class CostEngine:
+    """
+    Frais et coûts d'un plan, appliqués à des tableaux entiers (scalaires acceptés).
+
+    tiers : paliers des frais de transfert ((seuil, taux), ...) par seuil croissant, en devise de
+            référence : un transfert de valeur v paie v x le taux du dernier palier de seuil <= v
+    fixed_fee : frais fixe par transfert (devise de référence)
+    spread : écart de conversion, fraction du montant converti
+    interet : intérêt du paiement
+
+    Un paiement pour q unités de c reçues coûte q * X[c, f] * (1 + spread) * (1 + interet) unités de f.
+    Les PL n'utilisent que la partie linéaire (markup, lp_fee_rate) ; paliers et frais fixes sont
+    appliqués au plan obtenu (price).
+    """
+
+    def __init__(self, tiers=((0.0, 0.0),), fixed_fee=0.0, spread=0.0, interet=0.03):
+        tiers = sorted(tiers)
+        self.thresholds = np.array([t for t, _ in tiers], dtype=np.float64)
+        self.fee_rates = np.array([r for _, r in tiers], dtype=np.float64)
+        self.fixed_fee = fixed_fee
+        self.spread = spread
+        self.interet = interet
+
+    @property
+    def markup(self):
+        return (1 + self.spread) * (1 + self.interet)
+
+    @property
+    def lp_fee_rate(self):
+        """Taux proportionnel minimal des paliers : borne inférieure linéaire des frais de transfert."""
+        return float(self.fee_rates.min()) if len(self.fee_rates) else 0.0
+
+    @property
+    def has_transfer_fees(self):
+        return bool(self.fixed_fee or self.fee_rates.any())
+
+    def payment_rate(self, X):
+        """Unités de f payées par unité de c reçue : X[c, f] majoré (matrice ou tableau de taux)."""
+        return np.asarray(X) * self.markup
+
+    def pay(self, amount, rate):
+        """Paiement(s) pour amount reçu(s) au taux rate (X[c, f])."""
+        return amount * rate * self.markup
+
+    def transfer_fees(self, amount, cur, w):
+        """
+        Frais de transfert en devise de référence. amount, cur : tableaux de même forme (codes de
+        devise) ; w : valeurs des devises (C,) ou par scénario (S, C) avec amount de forme (S, T) ou (T,).
+        """
+        amount = np.asarray(amount, dtype=np.float64)
+        w = np.asarray(w, dtype=np.float64)
+        value = amount * (w[..., cur] if w.ndim > 1 else w[cur])
+        tier = np.maximum(np.searchsorted(self.thresholds, value, side="right") - 1, 0)
+        fees = compute_transfer_cost(value, self.fee_rates[tier])
+        return fees + self.fixed_fee * (amount > 0) if self.fixed_fee else fees
+
+    def split_payments(self, paid_value):
+        """Valeur payée -> (valeur convertie au taux de marché, écart de conversion, intérêt)."""
+        base = paid_value / self.markup
+        spread = compute_conversion_cost(base, self.spread)
+        return base, spread, compute_conversion_cost(base + spread, self.interet)
+
+    def price(self, t_cur, t_amount, p_from, p_amount, w):
+        """
+        Coût d'un plan donné par tableaux de codes : transferts (devise, montant), paiements (devise
+        payée, montant payé). Renvoie un dict de totaux en devise de référence.
+        """
+        w = np.asarray(w, dtype=np.float64)
+        fees = float(self.transfer_fees(t_amount, t_cur, w).sum()) if len(t_amount) else 0.0
+        paid = float((np.asarray(p_amount) * w[np.asarray(p_from, dtype=np.int64)]).sum()) if len(p_amount) else 0.0
+        base, spread, interest = self.split_payments(paid)
+        return {"transfer_fees": fees, "conversion": base, "spread": spread, "interest": interest,
+                "payments": paid, "total": paid + fees}
+
+    def price_plan(self, transfers, conversions, currencies, w):
+        """price() pour des dicts de optimize_transfers ou des TransferBatch / ConversionBatch."""
+        pos = {c: k for k, c in enumerate(currencies)}
+        if isinstance(transfers, dict):
+            t_cur = np.fromiter((pos[k[2]] for k in transfers), dtype=np.int64, count=len(transfers))
+            t_amount = np.fromiter(transfers.values(), dtype=np.float64, count=len(transfers))
+        else:
+            remap = np.array([pos[c] for c in transfers.currencies], dtype=np.int64)
+            t_cur, t_amount = remap[transfers.cur], transfers.amount
+        conversions = conversions if conversions is not None else {}
+        if isinstance(conversions, dict):
+            p_from = np.fromiter((pos[k[2]] for k in conversions), dtype=np.int64, count=len(conversions))
+            p_amount = np.fromiter(conversions.values(), dtype=np.float64, count=len(conversions))
+        else:
+            remap = np.array([pos[c] for c in conversions.currencies], dtype=np.int64)
+            p_from, p_amount = remap[conversions.from_cur], conversions.amount
+        return self.price(t_cur, t_amount, p_from, p_amount, w)
+
+    def __repr__(self):
+        tiers = list(zip(self.thresholds.tolist(), self.fee_rates.tolist()))
+        return f"CostEngine(tiers={tiers}, fixed_fee={self.fixed_fee}, spread={self.spread}, interet={self.interet})"
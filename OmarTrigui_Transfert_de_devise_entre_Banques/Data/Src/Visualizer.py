@@ -1,11 +1,24 @@
+from collections import OrderedDict
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-def visualize_graph(transfers, conversions, ax):
+TRANSFER, PAYMENT = 0, 1
+STYLES = {TRANSFER: {"color": "blue", "linestyle": "solid", "rad": 0.15},
+          PAYMENT: {"color": "purple", "linestyle": (0, (4, 3)), "rad": 0.3}}
+
+# positions par ensemble de banques (quelques plans différents sur les mêmes banques)
+_LAYOUTS = OrderedDict()
+_LAYOUT_CACHE_SIZE = 16
+
+
+def visualize_graph_annotated(transfers, conversions, ax):
     """
     Visualise les transferts et conversions entre banques dans un graphe.
-    
+    Version détaillée : une flèche annotée par transfert et par conversion (petits plans).
+
     transfers : dict {(src,dst,currency): montant}
     conversions : dict {(b_src,b_dst,from_cur,to_cur): montant}
     ax : matplotlib.axes.Axes pour dessiner le graphe
@@ -79,3 +92,218 @@ def visualize_graph(transfers, conversions, ax):
 
     ax.axis('off')
 
+
+# ------------ flux agrégés ------------
+class Flows:
+    """
+    Flux agrégés par (type, src, dst, devise) : tableaux src, dst, cur (codes), amount, kind
+    (TRANSFER ou PAYMENT, paiement payer -> payee en from_cur).
+    """
+
+    def __init__(self, banks, currencies, src, dst, cur, amount, kind):
+        self.banks = list(banks)
+        self.currencies = list(currencies)
+        self.src = src
+        self.dst = dst
+        self.cur = cur
+        self.amount = amount
+        self.kind = kind
+
+    def __len__(self):
+        return len(self.amount)
+
+    def subset(self, mask):
+        return Flows(self.banks, self.currencies, self.src[mask], self.dst[mask], self.cur[mask],
+                     self.amount[mask], self.kind[mask])
+
+
+def aggregate_flows(transfers, conversions=None):
+    """
+    transfers / conversions : dicts de optimize_transfers ou TransferBatch / ConversionBatch.
+    Les flux parallèles de même (type, src, dst, devise) sont additionnés.
+    """
+    banks, currencies, index, cur_index = [], [], {}, {}
+
+    def code(name, labels, pos):
+        k = pos.get(name)
+        if k is None:
+            k = pos[name] = len(labels)
+            labels.append(name)
+        return k
+
+    rows = []
+    if hasattr(transfers, "src"):
+        names, curs = list(transfers.banks), list(transfers.currencies)
+        rows += zip(np.asarray(names, dtype=object)[transfers.src].tolist(),
+                    np.asarray(names, dtype=object)[transfers.dst].tolist(),
+                    np.asarray(curs, dtype=object)[transfers.cur].tolist(),
+                    transfers.amount.tolist(), [TRANSFER] * len(transfers))
+    else:
+        rows += [(s, d, c, a, TRANSFER) for (s, d, c), a in transfers.items()]
+    if conversions is not None and hasattr(conversions, "payer"):
+        names, curs = list(conversions.banks), list(conversions.currencies)
+        rows += zip(np.asarray(names, dtype=object)[conversions.payer].tolist(),
+                    np.asarray(names, dtype=object)[conversions.payee].tolist(),
+                    np.asarray(curs, dtype=object)[conversions.from_cur].tolist(),
+                    conversions.amount.tolist(), [PAYMENT] * len(conversions))
+    elif conversions is not None:
+        rows += [(payer, payee, f, a, PAYMENT) for (payer, payee, f, _), a in conversions.items()]
+
+    m = len(rows)
+    src, dst, cur = (np.empty(m, dtype=np.int64) for _ in range(3))
+    amount, kind = np.empty(m), np.empty(m, dtype=np.int64)
+    for k, (s, d, c, a, t) in enumerate(rows):
+        src[k], dst[k] = code(s, banks, index), code(d, banks, index)
+        cur[k], amount[k], kind[k] = code(c, currencies, cur_index), a, t
+    n, C = max(len(banks), 1), max(len(currencies), 1)
+    keys, inv = np.unique(((kind * n + src) * n + dst) * C + cur, return_inverse=True)
+    total = np.bincount(inv.ravel(), weights=amount, minlength=len(keys))
+    return Flows(banks, currencies, (keys // C // n) % n, (keys // C) % n, keys % C, total, keys // C // n // n)
+
+
+def select_flows(flows, top_k=None, currencies=None, values=None):
+    """
+    Niveau de détail : filtre sur les devises puis garde les top_k flux les plus importants.
+    values : {devise: valeur unitaire} pour comparer des devises différentes (montant brut sinon).
+    """
+    mask = np.ones(len(flows), dtype=bool)
+    if currencies is not None:
+        wanted = [k for k, c in enumerate(flows.currencies) if c in set(currencies)]
+        mask &= np.isin(flows.cur, wanted)
+    out = flows.subset(mask)
+    if top_k is not None and len(out) > top_k:
+        weight = out.amount
+        if values is not None:
+            weight = weight * np.array([values.get(c, 1.0) for c in out.currencies])[out.cur]
+        out = out.subset(np.sort(np.argpartition(-weight, top_k - 1)[:top_k]))
+    return out
+
+
+def bank_layout(banks, seed=42, spring_max=300):
+    """
+    Positions des banques, en cache par ensemble de banques (LRU).
+    spring_layout jusqu'à spring_max banques (O(n²) par itération), cercle au-delà.
+    """
+    key = tuple(sorted(banks))
+    pos = _LAYOUTS.get(key)
+    if pos is not None:
+        _LAYOUTS.move_to_end(key)
+        return pos
+    if len(key) <= spring_max:
+        G = nx.Graph()
+        G.add_nodes_from(key)
+        pos = nx.spring_layout(G, seed=seed)
+    else:
+        pos = nx.circular_layout(key)
+    pos = {b: np.asarray(p, dtype=np.float64) for b, p in pos.items()}
+    _LAYOUTS[key] = pos
+    if len(_LAYOUTS) > _LAYOUT_CACHE_SIZE:
+        _LAYOUTS.popitem(last=False)
+    return pos
+
+
+def _curves(p0, p1, rad, n_points=16, shrink=0.08):
+    """Arcs quadratiques (comme connectionstyle arc3) échantillonnés : (E, n_points, 2), plus pointes de flèche."""
+    d = p1 - p0
+    normal = np.column_stack([d[:, 1], -d[:, 0]])
+    ctrl = (p0 + p1) / 2 + rad[:, None] * normal
+    t = np.linspace(shrink, 1 - shrink, n_points)[None, :, None]
+    pts = (1 - t) ** 2 * p0[:, None] + 2 * (1 - t) * t * ctrl[:, None] + t ** 2 * p1[:, None]
+    # arrow head: triangle at the end, along the last tangent
+    tip, back = pts[:, -1], pts[:, -2]
+    u = tip - back
+    u /= np.maximum(np.linalg.norm(u, axis=1, keepdims=True), 1e-12)
+    size = 0.035
+    side = np.column_stack([-u[:, 1], u[:, 0]])
+    heads = np.stack([tip, tip - size * u + 0.5 * size * side, tip - size * u - 0.5 * size * side], axis=1)
+    return pts, heads
+
+
+class GraphRenderer:
+    """
+    Graphe banques / flux redessiné sur place : nœuds (un scatter), arcs (une LineCollection),
+    pointes (une PolyCollection) ; seuls les label_k plus gros flux sont étiquetés.
+    Le coût de rendu dépend de top_k, pas de la taille du plan.
+    """
+
+    def __init__(self, ax, top_k=200, label_k=20, currencies=None, values=None, label_nodes=60):
+        self.ax = ax
+        self.top_k = top_k
+        self.label_k = label_k
+        self.currencies = currencies
+        self.values = values
+        self.label_nodes = label_nodes
+        self.nodes = ax.scatter([], [], s=900, c="lightblue", zorder=3)
+        self.edges = LineCollection([], zorder=1)
+        self.heads = PolyCollection([], zorder=2)
+        ax.add_collection(self.edges)
+        ax.add_collection(self.heads)
+        self.node_labels = []
+        self.edge_labels = []
+        ax.axis("off")
+
+    def _texts(self, pool, count, **style):
+        while len(pool) < count:
+            pool.append(self.ax.text(0, 0, "", ha="center", va="center", **style))
+        for t in pool[count:]:
+            t.set_visible(False)
+        return pool[:count]
+
+    def draw(self, transfers, conversions=None):
+        flows = aggregate_flows(transfers, conversions)
+        shown = select_flows(flows, self.top_k, self.currencies, self.values)
+        pos = bank_layout(flows.banks)
+        xy = np.array([pos[b] for b in flows.banks]).reshape(-1, 2)
+
+        self.nodes.set_offsets(xy)
+        visible = np.arange(len(flows.banks)) if len(flows.banks) <= self.label_nodes \
+            else np.unique(np.concatenate([shown.src, shown.dst]))[:self.label_nodes]
+        for t, b in zip(self._texts(self.node_labels, len(visible), fontsize=9, zorder=4), visible.tolist()):
+            t.set_position(xy[b])
+            t.set_text(flows.banks[b])
+            t.set_visible(True)
+
+        if len(shown):
+            rad = np.array([STYLES[k]["rad"] for k in (TRANSFER, PAYMENT)])[shown.kind]
+            pts, heads = _curves(xy[shown.src], xy[shown.dst], rad)
+            colors = np.array([STYLES[k]["color"] for k in (TRANSFER, PAYMENT)], dtype=object)[shown.kind]
+            width = 0.8 + 2.5 * shown.amount / shown.amount.max()
+        else:
+            pts, heads, colors, width = np.zeros((0, 2, 2)), np.zeros((0, 3, 2)), [], []
+        self.edges.set_segments(pts)
+        self.edges.set_color(list(colors))
+        self.edges.set_linewidth(width)
+        self.edges.set_linestyle([STYLES[k]["linestyle"] for k in shown.kind.tolist()] or "solid")
+        self.heads.set_verts(heads)
+        self.heads.set_facecolor(list(colors))
+        self.heads.set_edgecolor("none")
+
+        top = np.argsort(-shown.amount)[:self.label_k]
+        labels = self._texts(self.edge_labels, len(top), fontsize=8, zorder=5,
+                             bbox=dict(boxstyle="round,pad=0.15", fc="white", ec="none", alpha=0.7))
+        for t, e in zip(labels, top.tolist()):
+            t.set_position(pts[e, len(pts[e]) // 2])
+            t.set_text(f"{shown.amount[e]:,.0f} {shown.currencies[shown.cur[e]]}")
+            t.set_color(colors[e])
+            t.set_visible(True)
+
+        if len(xy):
+            lo, hi = xy.min(axis=0), xy.max(axis=0)
+            pad = 0.15 * max(float((hi - lo).max()), 1.0)
+            self.ax.set_xlim(lo[0] - pad, hi[0] + pad)
+            self.ax.set_ylim(lo[1] - pad, hi[1] + pad)
+        return {"flows": len(flows), "shown": len(shown), "banks": len(flows.banks)}
+
+
+def visualize_graph(transfers, conversions, ax, top_k=200, currencies=None):
+    """
+    Visualise les transferts et conversions entre banques dans un graphe (flux agrégés, positions en
+    cache, arcs en une seule collection). top_k / currencies : niveau de détail, voir GraphRenderer.
+
+    transfers : dict {(src,dst,currency): montant} ou TransferBatch
+    conversions : dict {(b_src,b_dst,from_cur,to_cur): montant} ou ConversionBatch
+    ax : matplotlib.axes.Axes pour dessiner le graphe
+    """
+    renderer = GraphRenderer(ax, top_k=top_k, currencies=currencies)
+    renderer.draw(transfers, conversions)
+    return renderer
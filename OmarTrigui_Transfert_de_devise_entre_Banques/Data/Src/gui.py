@@ -1,20 +1,34 @@
 import tkinter as tk
 import sys, os
+import asyncio, queue, threading
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from tkinter import ttk
+from tkinter import filedialog, messagebox
 from Src.DataLoader import DataLoader
-from Src.Optimizer import optimize_transfers
-from Src.Visualizer import visualize_graph
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from Src.RateEngine import RateEngine
+from Src.Optimizer import optimize_transfers, optimize_transfers_fast
+from Src.Ingestion import NetPositions, IngestionService, format_metrics
+from Src.Dashboard import ResultsDashboard
+from Src.Ledger import PlanLedger
+from Src.TableView import BankTable, VirtualTable
 
 class BankApp:
     def __init__(self, master):
         self.master = master
         master.title("Optimisation Transferts Multi-Devises")
         self.dataloader = DataLoader("Data")
-        self.banks, self.balances, self.required = self.dataloader.load_banks_data()
-        self.rates = self.dataloader.load_rates()
+        self.matrices = self.dataloader.load_bank_matrices()
+        self.banks, self.balances, self.required = self.matrices.to_dicts()
+        self.rates = RateEngine.from_loader(self.dataloader)  # meilleurs taux, lecture O(1)
+        self.stream = None
+        self.stream_loop = None
+        self.stream_poll = None
+        self.stream_pending = None
+        self.stream_updates = queue.Queue()
+        self.stream_plan = "Aucun plan"
+        self.dashboard = ResultsDashboard(master)
+        # chaque plan calculé est conservé (audit, rejeu) : Data/ledger/
+        self.ledger = PlanLedger(os.path.join(self.dataloader.data_dir, "ledger"))
+        master.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # --- Frames ---
         self.frame_welcome = tk.Frame(master)
@@ -74,60 +88,109 @@ class BankApp:
 
         tk.Label(self.frame_data, text=description_text, justify="left", wraplength=750).pack(padx=20, pady=5)
 
-        # --- Création du tableau ---
-        self.tree = ttk.Treeview(self.frame_data, columns=("Bank", "Currency", "Balance", "Required"), show="headings")
-        for col, text in [("Bank","Banque"), ("Currency","Devise"), ("Balance","Solde"), ("Required","Besoin")]:
-            self.tree.heading(col, text=text)
-        self.tree.pack(padx=10, pady=10, fill="x")
+        # --- Création du tableau (lignes virtuelles : seules les lignes visibles existent) ---
+        self.table = VirtualTable(self.frame_data)
+        self.table.pack(padx=10, pady=10, fill="x")
 
         # Charger les données dans le tableau
         self.load_table()
 
         # Bouton pour lancer l'optimisation
-        tk.Button(self.frame_data, text="Optimiser", command=self.run_optimization).pack(pady=10)
+        buttons = tk.Frame(self.frame_data)
+        buttons.pack(pady=10)
+        tk.Button(buttons, text="Optimiser", command=self.run_optimization).pack(side="left", padx=5)
+        # heuristique triée : aperçu instantané, sans garantie d'optimalité
+        tk.Button(buttons, text="Aperçu rapide", command=lambda: self.run_optimization(fast=True)).pack(side="left", padx=5)
+        tk.Button(buttons, text="Flux d'ordres", command=self.start_stream).pack(side="left", padx=5)
+        self.stream_status = tk.Label(self.frame_data, text="", justify="left", wraplength=750)
+        self.stream_status.pack(padx=10)
 
     def load_table(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for (bank, cur), bal in self.balances.items():
-            req = self.required[(bank, cur)]
-            self.tree.insert("", "end", values=(bank, cur, bal, req))
-
-    def run_optimization(self):
-        # Mettre à jour les données depuis le tableau
-        for row in self.tree.get_children():
-            bank, currency, balance, req = self.tree.item(row)['values']
-            self.balances[(bank, currency)] = float(balance)
-            self.required[(bank, currency)] = float(req)
-
-        transfers, conversions = optimize_transfers(list(self.banks), self.balances, self.required, self.rates, interet=0.03)
-
-
-        # Fenêtre d'explications
-        explain_window = tk.Toplevel(self.master)
-        explain_window.title("Explications des transferts")
-        tk.Label(explain_window, text="Explications étape par étape", font=("Helvetica", 14), fg="red").pack(pady=5)
-        explanation_text = tk.Text(explain_window, height=20, width=80)
-        explanation_text.pack(padx=10, pady=10, fill="both", expand=True)
-
-        explanation_text.insert(tk.END, "Transferts :\n")
-        for (src,dst,cur), amt in transfers.items():
-            explanation_text.insert(tk.END, f"- {src} transfère {amt:,.2f} {cur} à {dst}\n")
-
-        explanation_text.insert(tk.END, "\nConversions :\n")
-        for (dst, src, from_cur, to_cur), amt in conversions.items():
-            explanation_text.insert(tk.END,
-                f"- {dst} reçoit {to_cur} et paie {amt:,.2f} {from_cur} à {src}\n")
-        explanation_text.config(state="disabled")
-        
-        # --- Graphe ---
-        graph_window = tk.Toplevel(self.master)
-        graph_window.title("Graphe des transferts optimisés")
-        fig, ax = plt.subplots(figsize=(10,7))
-        visualize_graph(transfers, conversions, ax)
-        canvas = FigureCanvasTkAgg(fig, master=graph_window)
-        canvas.get_tk_widget().pack(padx=10, pady=10)
-        canvas.draw()
+        self.table.set_model(BankTable(self.matrices))
+
+    # --- Flux d'ordres de paiement (fichier suivi en continu) ---
+    def start_stream(self):
+        path = filedialog.askopenfilename(title="Flux d'ordres de paiement",
+                                          filetypes=[("CSV", "*.csv"), ("Tous les fichiers", "*.*")])
+        if not path:
+            return
+        # un nouveau fichier remplace le flux en cours
+        self.stop_stream()
+        positions = NetPositions(self.dataloader.load_bank_matrices())
+        updates = self.stream_updates = queue.Queue()
+        self.stream = stream = IngestionService(positions, self.rates,
+                                                on_plan=lambda plan, info: updates.put((plan, info)))
+        self.stream_loop = loop = asyncio.new_event_loop()
+        self.stream_pending = None
+        self.stream_plan = "Aucun plan"
+
+        def serve():
+            try:
+                loop.run_until_complete(stream.run(stream.tail_file(path)))
+            finally:
+                loop.close()
+        # boucle asyncio dans un thread : Tk garde la main, les plans reviennent par la file
+        threading.Thread(target=serve, daemon=True).start()
+        self.stream_poll = self.master.after(500, self.poll_stream)
+
+    def stop_stream(self):
+        if self.stream is None:
+            return
+        self.master.after_cancel(self.stream_poll)
+        # stop() touche aux événements asyncio : à exécuter dans la boucle du flux
+        try:
+            self.stream_loop.call_soon_threadsafe(self.stream.stop)
+        except RuntimeError:
+            pass  # boucle déjà fermée : le flux est terminé
+        self.stream = self.stream_loop = self.stream_pending = None
+
+    def poll_stream(self):
+        while not self.stream_updates.empty():
+            (transfers, conversions), info = self.stream_updates.get()
+            self.stream_pending = info["positions"]
+            self.stream_plan = f"Dernier plan : {len(transfers)} transferts, {len(conversions)} conversions"
+            self.ledger.append(transfers, conversions, self.rates, meta={"source": "stream"})
+        status = self.stream_plan
+        if self.stream_pending is not None:
+            if self.table.model.dirty:
+                # saisies en cours : le tableau n'est remplacé qu'une fois celles-ci prises en compte
+                status += "\nModifications en cours : positions du flux non chargées"
+            else:
+                self.matrices, self.stream_pending = self.stream_pending, None
+                self.banks, self.balances, self.required = self.matrices.to_dicts()
+                self.load_table()
+        self.stream_status.config(text=format_metrics(self.stream.metrics()) + "\n" + status)
+        self.stream_poll = self.master.after(500, self.poll_stream)
+
+    def run_optimization(self, fast=False):
+        # Mettre à jour les données depuis le tableau : seulement les lignes modifiées
+        self.table.model.sync(self.balances, self.required)
+
+        try:
+            if fast:
+                transfer_batch, conversion_batch = optimize_transfers_fast(list(self.banks), self.balances,
+                                                                           self.required, self.rates, interet=0.03)
+                transfers, conversions = transfer_batch.as_dict(), conversion_batch.as_dict()
+            else:
+                transfers, conversions = optimize_transfers(list(self.banks), self.balances, self.required,
+                                                            self.rates, interet=0.03)
+        except (RuntimeError, ValueError) as e:
+            # PL non optimal (ex. besoins impossibles à couvrir) : rien à afficher ni à enregistrer
+            messagebox.showerror("Erreur", str(e), parent=self.master)
+            return
+
+        self.ledger.append(transfers, conversions, self.rates, meta={"source": "fast" if fast else "exact"})
+        title = "Aperçu rapide : " if fast else "Plan exact : "
+        if self.stream is not None:
+            # positions issues du flux d'ordres, pas des fichiers de départ
+            title = "Flux d'ordres - " + title
+        # Fenêtre de résultats unique, mise à jour sur place
+        self.dashboard.show(transfers, conversions, title=title)
+
+    def on_close(self):
+        self.stop_stream()
+        self.dashboard.destroy()
+        self.master.destroy()
 
 
 # --- Lancer l'application ---
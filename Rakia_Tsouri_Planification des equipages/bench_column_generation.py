@@ -0,0 +1,64 @@
+"""
+Benchmark : génération de colonnes pour le crew pairing (column_generation.py).
+
+Programmes synthétiques (crew_network.random_schedule) de --flights vols sur --days jours : itérations
+maître / pricing jusqu'à l'optimum du PL, puis PNE sur les colonnes générées (limité à --time-limit s).
+Affiche la borne du PL, le coût entier, l'écart, les temps, et vérifie que chaque pairing retenu est
+légal, que son coût est celui des règles et que tous les vols sont couverts.
+Avec la licence Gurobi restreinte (2000 variables / contraintes), garder --flights + --max-pool < 2000.
+
+Usage : python bench_column_generation.py [--flights 100 200 400] [--max-pool 1500] [--time-limit 30]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from crew_network import CrewRules, random_schedule
+from column_generation import CrewColumnGeneration
+
+BASES = ("TUN", "DJE")
+
+
+def check(cg, result):
+    g = cg.graph
+    covered = set(result["uncovered"])
+    for p in result["pairings"]:
+        seq = [g.index[f] for f in p["flights"]]
+        assert g.is_legal(seq), f"pairing illégal : {p['flights']}"
+        assert abs(g.pairing_cost(seq) - p["cost"]) < 1e-6, "coût différent des règles"
+        covered.update(p["flights"])
+    assert covered == set(g.names), "vols non couverts"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génération de colonnes pour le crew pairing")
+    parser.add_argument("--flights", type=int, nargs="+", default=[100, 200, 400])
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--airports", type=int, default=8)
+    parser.add_argument("--max-pool", type=int, default=1500)
+    parser.add_argument("--columns-per-iter", type=int, default=100)
+    parser.add_argument("--time-limit", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    print(f"{'vols':>6} {'arcs':>7} {'itér.':>6} {'colonnes':>9} {'borne PL':>11} {'coût PNE':>11} {'écart':>7} "
+          f"{'PL s':>7} {'pricing s':>10} {'PNE s':>7} {'pairings':>9} {'non couv.':>8}")
+    for n in args.flights:
+        flights = random_schedule(n, args.airports, BASES, args.days, args.seed)
+        t0 = time.perf_counter()
+        cg = CrewColumnGeneration(flights, CrewRules(BASES), max_pool=args.max_pool,
+                                  columns_per_iter=args.columns_per_iter, time_limit=args.time_limit)
+        result = cg.solve()
+        elapsed = time.perf_counter() - t0
+        check(cg, result)
+        pricing = sum(e["pricing_time"] for e in result["log"])
+        print(f"{n:>6} {len(cg.graph.succ):>7} {result['iterations']:>6} {result['columns']:>9} "
+              f"{result['lp_bound']:>11,.0f} {result['cost']:>11,.0f} {result['gap']:>7.2%} {result['lp_time']:>7.2f} "
+              f"{pricing:>10.2f} {result['mip_time']:>7.2f} {len(result['pairings']):>9} {len(result['uncovered']):>8}"
+              f"  ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark : construction du modèle de couverture (cover_model.py).
+
+P pairings aléatoires de 2 à 2 x --legs vols parmi F = P / --ratio vols : temps de l'index inversé
+(CoverageBuilder -> matrice CSR vols x pairings) et du modèle Gurobi (addMVar / addMConstr), rapportés
+au nombre de non-zéros. Un temps par non-zéro à peu près constant d'une taille à l'autre montre une
+construction linéaire. Jusqu'à --legacy-max pairings, l'ancienne construction (une somme par vol sur
+tous les pairings) est mesurée aussi, et les deux modèles sont comparés (mêmes non-zéros, même
+solution si le modèle tient dans la licence Gurobi).
+
+Usage : python bench_cover_model.py [--pairings 10000 100000 1000000] [--legs 4] [--ratio 50]
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from gurobipy import Model, GRB
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from cover_model import CoverageBuilder, build_cover_model
+
+LICENSE_LIMIT = 2000
+
+
+def legacy_model(flights, pairings, cost):
+    """Construction d'origine de run_crew_optimizer : O(F x P x L)."""
+    m = Model("legacy")
+    y = {p: m.addVar(vtype=GRB.BINARY, name=f"y_{p}") for p in pairings}
+    m.update()
+    m.setObjective(sum(cost[p] * y[p] for p in pairings), GRB.MINIMIZE)
+    for f in flights:
+        m.addConstr(sum(y[p] for p in pairings if f in pairings[p]) >= 1, name=f"cover_{f}")
+    m.update()
+    return m
+
+
+def random_pairings(P, F, legs, rng):
+    flights = [f"F{k}" for k in range(F)]
+    sizes = rng.integers(2, 2 * legs + 1, P)
+    pairings = {}
+    for k, n in enumerate(sizes.tolist()):
+        pairings[f"P{k}"] = [flights[i] for i in rng.choice(F, n, replace=False)]
+    for i, f in enumerate(flights):  # every flight coverable
+        pairings[f"S{i}"] = [f]
+    cost = {p: float(len(v)) + 1.0 for p, v in pairings.items()}
+    return flights, pairings, cost
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Construction du modèle de couverture")
+    parser.add_argument("--pairings", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legs", type=int, default=4)
+    parser.add_argument("--ratio", type=int, default=50, help="pairings par vol")
+    parser.add_argument("--legacy-max", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'pairings':>10} {'vols':>7} {'non-zéros':>11} {'index s':>8} {'modèle s':>9} {'ns/nz':>7} "
+          f"{'ancien s':>9}")
+    for P in args.pairings:
+        F = max(P // args.ratio, 2 * args.legs)
+        flights, pairings, cost = random_pairings(P, F, args.legs, rng)
+
+        t0 = time.perf_counter()
+        builder = CoverageBuilder(flights)
+        for p, vols in pairings.items():
+            builder.add(p, vols, cost[p])
+        A = builder.matrix()
+        t1 = time.perf_counter()
+        m, y = build_cover_model(A, builder.costs)
+        m.Params.OutputFlag = 0
+        t2 = time.perf_counter()
+        assert m.NumNZs == A.nnz == builder.nnz
+
+        legacy = ""
+        if P <= args.legacy_max:
+            t3 = time.perf_counter()
+            old = legacy_model(flights, pairings, cost)
+            legacy = f"{time.perf_counter() - t3:>9.2f}"
+            old.Params.OutputFlag = 0
+            assert old.NumNZs == m.NumNZs
+            if old.NumVars <= LICENSE_LIMIT and old.NumConstrs <= LICENSE_LIMIT:
+                old.optimize()
+                m.optimize()
+                assert abs(old.ObjVal - m.ObjVal) < 1e-6
+        print(f"{len(pairings):>10,} {F:>7,} {A.nnz:>11,} {t1 - t0:>8.2f} {t2 - t1:>9.2f} "
+              f"{(t2 - t0) / A.nnz * 1e9:>7.0f} {legacy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark : énumération des pairings légaux (pairing_generator.py).
+
+Programmes synthétiques (crew_network.random_schedule, bases --bases) de --flights vols : DFS élagué
+depuis chaque vol partant d'une base, en processus unique puis en pool de --processes processus
+(tâches par base). Affiche le nombre de pairings, les non-zéros de la matrice de couverture, le débit,
+et le pic d'allocations du processus principal (tracemalloc) : les lots arrivent compacts (int32) dans
+CoverageBuilder, la liste complète des pairings n'est jamais construite en objets Python.
+Les deux modes doivent produire le même ensemble de pairings. Si le modèle tient dans la licence
+Gurobi restreinte (2000 variables), la couverture optimale est résolue et comparée à la borne PL de la
+génération de colonnes (column_generation.py).
+
+Usage : python bench_pairing_generator.py [--flights 100 200 300] [--processes 4] [--max-cost 3000]
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from gurobipy import setParam
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from crew_network import CrewRules, random_schedule
+from pairing_generator import generate_cover
+from cover_model import solve_cover
+from column_generation import CrewColumnGeneration
+
+LICENSE_LIMIT = 2000
+
+
+def column_set(builder):
+    A = builder.matrix().tocsc()
+    return {tuple(A.indices[A.indptr[k]:A.indptr[k + 1]].tolist()) for k in range(A.shape[1])}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Énumération des pairings légaux")
+    parser.add_argument("--flights", type=int, nargs="+", default=[100, 200, 300])
+    parser.add_argument("--bases", nargs="+", default=["TUN", "DJE", "MIR"])
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--airports", type=int, default=10)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--max-cost", type=float, default=None, help="coût maximal d'un pairing (élagage)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    setParam("OutputFlag", 0)
+    rules = CrewRules(args.bases)
+    print(f"{'vols':>6} {'processus':>9} {'pairings':>11} {'non-zéros':>11} {'temps s':>8} {'pairings/s':>11} "
+          f"{'pic Mo':>7}")
+    for n in args.flights:
+        flights = random_schedule(n, args.airports, tuple(args.bases), args.days, args.seed, rules)
+        sets = []
+        for processes in sorted({1, args.processes}):
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            graph, builder = generate_cover(flights, rules, processes, max_cost=args.max_cost)
+            elapsed = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+            print(f"{n:>6} {processes:>9} {len(builder):>11,} {builder.nnz:>11,} {elapsed:>8.2f} "
+                  f"{len(builder) / elapsed:>11,.0f} {peak:>7.1f}")
+            sets.append(column_set(builder))
+        assert all(s == sets[0] for s in sets), "pairings différents selon le nombre de processus"
+        if len(builder) + n <= LICENSE_LIMIT and args.max_cost is None:
+            chosen = solve_cover(builder.matrix(), builder.costs)
+            if not chosen:
+                print(f"{'':>6} aucune couverture des vols par les pairings légaux")
+                continue
+            cost = float(builder.costs[chosen].sum())
+            cg = CrewColumnGeneration(flights, rules).solve()
+            print(f"{'':>6} couverture optimale {cost:,.0f} ; génération de colonnes : borne PL "
+                  f"{cg['lp_bound']:,.0f}, PNE {cg['cost']:,.0f}")
+            assert cost >= cg["lp_bound"] - 1e-6
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import time
+from gurobipy import Model, GRB, Column
+from crew_network import ConnectionGraph, SIT
+
+# ----------------------------
+# Pricing : plus court chemin sous contraintes de ressources
+# ----------------------------
+def price_pairings(graph, duals, max_columns=50, label_limit=None, tol=1e-6):
+    """
+    Pairings de coût réduit négatif (coût - somme des duals des vols couverts) par étiquetage sur le
+    graphe des correspondances, parcouru dans l'ordre des départs (ordre topologique).
+    Étiquette = (coût réduit, début du service, vols du service, services, base) ; à un même vol et une
+    même base, une étiquette en domine une autre si elle est meilleure sur toutes les ressources.
+    label_limit : garde au plus ce nombre d'étiquettes par vol (pricing heuristique), None = exact.
+    Renvoie [(coût réduit, [indices des vols])] par coût réduit croissant.
+    """
+    r = graph.rules
+    F = len(graph)
+    dep, arr = graph.departure.tolist(), graph.arrival.tolist()
+    orig, dest = graph.origin.tolist(), graph.destination.tolist()
+    bases = set(graph.base_codes.tolist())
+    # label store: parent pointers to rebuild the flight sequence
+    parent, node = [], []
+    labels = [[] for _ in range(F)]   # per flight: [rc, duty_start, legs, duties, base, label id]
+    done = []
+
+    def push(j, rc, start, legs, duties, base, pred):
+        bucket = labels[j]
+        for lab in bucket:
+            if lab[4] == base and lab[0] <= rc + tol and lab[1] >= start and lab[2] <= legs and lab[3] <= duties:
+                return
+        bucket[:] = [lab for lab in bucket if not (lab[4] == base and rc <= lab[0] + tol and start >= lab[1]
+                                                   and legs <= lab[2] and duties <= lab[3])]
+        parent.append(pred)
+        node.append(j)
+        bucket.append([rc, start, legs, duties, base, len(parent) - 1])
+
+    for i in range(F):
+        if orig[i] in bases:
+            push(i, r.fixed_cost + r.duty_cost * (arr[i] - dep[i]) - duals[i], dep[i], 1, 1, orig[i], -1)
+        bucket = labels[i]
+        if label_limit is not None and len(bucket) > label_limit:
+            bucket.sort(key=lambda lab: lab[0])
+            del bucket[label_limit:]
+        succ, kind = graph.successors(i)
+        succ, kind = succ.tolist(), kind.tolist()
+        for rc, start, legs, duties, base, lid in bucket:
+            if dest[i] == base and rc < -tol:
+                done.append((rc, lid))
+            for j, k in zip(succ, kind):
+                if k == SIT:
+                    if legs >= r.max_legs or arr[j] - start > r.max_duty:
+                        continue
+                    push(j, rc + r.duty_cost * (arr[j] - arr[i]) - duals[j], start, legs + 1, duties, base, lid)
+                else:
+                    if duties >= r.max_duties:
+                        continue
+                    push(j, rc + r.rest_cost + r.duty_cost * (arr[j] - dep[j]) - duals[j], dep[j], 1, duties + 1,
+                         base, lid)
+        labels[i] = None  # every successor comes later: labels at i are no longer needed
+
+    done.sort()
+    columns = []
+    for rc, lid in done[:max_columns]:
+        seq = []
+        while lid >= 0:
+            seq.append(node[lid])
+            lid = parent[lid]
+        columns.append((rc, seq[::-1]))
+    return columns
+
+
+# ----------------------------
+# Génération de colonnes
+# ----------------------------
+class CrewColumnGeneration:
+    """
+    Problème maître restreint : min somme c_p y_p, chaque vol couvert au moins une fois, y_p >= 0
+    sur les pairings générés. Départ réalisable : une variable artificielle par vol (« vol non
+    couvert », coût uncovered_cost), les pairings initial éventuels et, si greedy, une couverture
+    gloutonne par pairings légaux (greedy_cover). À chaque itération, le PL est
+    résolu et les duals des contraintes de couverture alimentent price_pairings ; les colonnes de coût
+    réduit négatif sont ajoutées jusqu'à ce qu'il n'y en ait plus (optimum du PL). Enfin, le PNE
+    binaire sur les colonnes générées (price-and-branch) donne la solution entière.
+    """
+
+    def __init__(self, flights, rules, initial=(), uncovered_cost=1e5, columns_per_iter=100, label_limit=20,
+                 max_iter=200, tol=1e-6, time_limit=None, max_pool=None, greedy=True):
+        self.graph = ConnectionGraph(flights, rules)
+        self.uncovered_cost = uncovered_cost
+        self.columns_per_iter = columns_per_iter
+        self.label_limit = label_limit
+        self.max_iter = max_iter
+        self.tol = tol
+        self.time_limit = time_limit
+        self.max_pool = max_pool
+        self.columns = []       # flight index sequences
+        self.costs = []
+        self.vars = []
+        self.seen = set()
+        self.log = []
+
+        g = self.graph
+        self.model = m = Model("crew_pairing_cg")
+        m.Params.OutputFlag = 0
+        self.artificial = [m.addVar(obj=uncovered_cost, name=f"uncovered_{f}") for f in g.names]
+        self.cover = [m.addConstr(a >= 1, name=f"cover_{f}") for f, a in zip(g.names, self.artificial)]
+        for names in initial:
+            seq = sorted(g.index[f] for f in names)
+            if not g.is_legal(seq):
+                raise ValueError(f"pairing initial illégal : {', '.join(names)}")
+            self.add_column(seq)
+        if greedy:
+            for seq in self.greedy_cover():
+                self.add_column(seq)
+        m.update()
+
+    def greedy_cover(self):
+        """
+        Pairings initiaux couvrant le plus de vols possible : pricing avec un dual élevé sur les vols
+        encore non couverts et nul ailleurs, colonnes retenues tant qu'elles couvrent du nouveau.
+        """
+        g = self.graph
+        weight = self.uncovered_cost
+        uncovered = set(range(len(g)))
+        for seq in self.columns:
+            uncovered.difference_update(seq)
+        chosen = []
+        while uncovered:
+            duals = [weight if i in uncovered else 0.0 for i in range(len(g))]
+            found = False
+            for _, seq in price_pairings(g, duals, self.columns_per_iter, self.label_limit, self.tol):
+                if uncovered.isdisjoint(seq):
+                    continue
+                chosen.append(seq)
+                uncovered.difference_update(seq)
+                found = True
+            if not found:
+                break  # remaining flights belong to no legal pairing
+        return chosen
+
+    def add_column(self, seq):
+        key = tuple(seq)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        cost = self.graph.pairing_cost(seq)
+        col = Column([1.0] * len(seq), [self.cover[i] for i in seq])
+        self.vars.append(self.model.addVar(obj=cost, column=col, name=f"p_{len(self.columns)}"))
+        self.columns.append(key)
+        self.costs.append(cost)
+        return True
+
+    def purge(self, keep):
+        """
+        Retire les colonnes hors base de plus grand coût réduit pour n'en garder que keep (le PL reste
+        optimal : seules des variables nulles partent). Une colonne retirée peut être regénérée.
+        """
+        basic = [v.VBasis == 0 for v in self.vars]
+        rc = [v.RC for v in self.vars]
+        order = sorted(range(len(self.vars)), key=lambda k: (not basic[k], rc[k]))
+        drop = set(k for k in order[keep:] if not basic[k])
+        for k in drop:
+            self.model.remove(self.vars[k])
+            self.seen.discard(self.columns[k])
+        kept = [k for k in range(len(self.vars)) if k not in drop]
+        self.vars = [self.vars[k] for k in kept]
+        self.columns = [self.columns[k] for k in kept]
+        self.costs = [self.costs[k] for k in kept]
+        self.model.update()
+        return len(drop)
+
+    def solve_lp(self):
+        """Itérations maître / pricing jusqu'à l'optimum du PL (ou max_iter). Renvoie la borne du PL."""
+        m = self.model
+        for it in range(self.max_iter):
+            t0 = time.perf_counter()
+            m.optimize()
+            t1 = time.perf_counter()
+            lp, duals = m.ObjVal, [c.Pi for c in self.cover]
+            if self.max_pool is not None and len(self.columns) + self.columns_per_iter > self.max_pool:
+                self.purge(self.max_pool - 2 * self.columns_per_iter)
+            new = price_pairings(self.graph, duals, self.columns_per_iter, self.label_limit, self.tol)
+            exact = self.label_limit is None
+            if not new and not exact:
+                # heuristic pricing found nothing: confirm with exact labelling
+                new = price_pairings(self.graph, duals, self.columns_per_iter, None, self.tol)
+                exact = True
+            added = sum(self.add_column(seq) for _, seq in new)
+            t2 = time.perf_counter()
+            self.log.append({"iteration": it, "lp": lp, "columns": len(self.columns), "added": added,
+                             "min_rc": new[0][0] if new else 0.0, "exact": exact,
+                             "master_time": t1 - t0, "pricing_time": t2 - t1})
+            if not added:
+                return lp
+        m.optimize()
+        return m.ObjVal
+
+    def solve(self):
+        """Génération de colonnes puis PNE sur les colonnes générées ; renvoie un dict de résultats."""
+        t0 = time.perf_counter()
+        lp = self.solve_lp()
+        t1 = time.perf_counter()
+        m = self.model
+        for v in self.vars + self.artificial:
+            v.VType = GRB.BINARY
+        if self.time_limit is not None:
+            m.Params.TimeLimit = self.time_limit
+        m.optimize()
+        t2 = time.perf_counter()
+        # the LP value is a lower bound only if pricing proved there is no improving column left
+        result = {"status": m.Status, "lp_bound": lp, "lp_optimal": bool(self.log) and not self.log[-1]["added"], "columns": len(self.columns), "iterations": len(self.log),
+                  "lp_time": t1 - t0, "mip_time": t2 - t1, "log": self.log}
+        if m.SolCount == 0:
+            result.update(cost=None, pairings=[], uncovered=[])
+            return result
+        names = self.graph.names
+        result["cost"] = m.ObjVal
+        result["gap"] = (m.ObjVal - lp) / max(abs(m.ObjVal), 1e-9)
+        result["pairings"] = [{"flights": [names[i] for i in seq], "cost": c}
+                              for seq, c, v in zip(self.columns, self.costs, self.vars) if v.X > 0.5]
+        result["uncovered"] = [f for f, a in zip(names, self.artificial) if a.X > 0.5]
+        return result
+
+
+def run_column_generation(flights, rules, **options):
+    """Point d'entrée : vols datés (Flight) et règles (CrewRules) -> résultats de CrewColumnGeneration."""
+    return CrewColumnGeneration(flights, rules, **options).solve()
@@ -0,0 +1,117 @@
+import numpy as np
+import scipy.sparse as sp
+from gurobipy import Model, GRB
+
+# ----------------------------
+# Matrice de couverture vols x pairings
+# ----------------------------
+class CoverageBuilder:
+    """
+    Matrice de couverture construite pairing par pairing (ou par lots) : pour chaque pairing, les
+    indices des vols couverts sont ajoutés à la suite (CSC : une colonne par pairing), sans jamais
+    parcourir les autres pairings. matrix() renvoie la matrice CSR vols x pairings, dont chaque ligne
+    est l'index inversé vol -> pairings. Indices, coûts et longueurs sont gardés en tableaux numpy
+    par lot, concaténés à la demande (costs, matrix()).
+    """
+
+    def __init__(self, flights):
+        self.flights = list(flights)
+        self.index = {f: k for k, f in enumerate(self.flights)}
+        self.names = []
+        self._chunks = []   # arrays of flight indices, in pairing order
+        self._costs = []    # arrays of pairing costs, same order
+        self._counts = []   # arrays of pairing lengths, same order
+        # from add(), not yet moved into the chunks: flight indices, costs, lengths
+        self._pending, self._pending_costs, self._pending_counts = [], [], []
+        self._size = 0
+        self._nnz = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, name, flights, cost):
+        """Pairing par noms de vols ; les vols hors de la liste sont ignorés, les doublons comptent une fois."""
+        index = self.index
+        rows = sorted({index[f] for f in flights if f in index})
+        self.names.append(name)
+        self._pending.extend(rows)
+        self._pending_costs.append(float(cost))
+        self._pending_counts.append(len(rows))
+        self._size += 1
+        self._nnz += len(rows)
+
+    def _flush(self):
+        if self._pending_counts:
+            self._chunks.append(np.array(self._pending, dtype=np.int64))
+            self._costs.append(np.array(self._pending_costs, dtype=np.float64))
+            self._counts.append(np.array(self._pending_counts, dtype=np.int64))
+            self._pending, self._pending_costs, self._pending_counts = [], [], []
+
+    def add_many(self, names, rows, counts, costs):
+        """
+        Lot de pairings déjà indexés : rows concatène les indices de vols de chaque pairing, counts leurs
+        longueurs. names=None : pairings anonymes (repérés par leur colonne), aucun nom n'est stocké.
+        """
+        self._flush()
+        if names is not None:
+            self.names.extend(names)
+        self._chunks.append(np.asarray(rows, dtype=np.int64))
+        self._costs.append(np.asarray(costs, dtype=np.float64))
+        self._counts.append(np.asarray(counts, dtype=np.int64))
+        self._size += len(self._counts[-1])
+        self._nnz += len(self._chunks[-1])
+
+    @staticmethod
+    def _join(chunks, dtype):
+        # merged in place: later calls find a single chunk
+        if len(chunks) != 1:
+            chunks[:] = [np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)]
+        return chunks[0]
+
+    @property
+    def costs(self):
+        """Coûts des pairings dans l'ordre des colonnes (tableau numpy)."""
+        self._flush()
+        return self._join(self._costs, np.float64)
+
+    @property
+    def nnz(self):
+        return self._nnz
+
+    def matrix(self):
+        self._flush()
+        rows = self._join(self._chunks, np.int64)
+        indptr = np.concatenate([[0], np.cumsum(self._join(self._counts, np.int64))])
+        data = np.ones(len(rows), dtype=np.float64)
+        A = sp.csc_matrix((data, rows, indptr), shape=(len(self.flights), self._size))
+        return A.tocsr()
+
+
+def coverage_matrix(flights, pairings):
+    """dict pairing -> liste de vols (saisie de CrewApp) -> (matrice CSR vols x pairings, noms des pairings)."""
+    builder = CoverageBuilder(flights)
+    for p, vols in pairings.items():
+        builder.add(p, vols, 0.0)
+    return builder.matrix(), builder.names
+
+
+# ----------------------------
+# Modèle de couverture (API matricielle de Gurobi)
+# ----------------------------
+def build_cover_model(A, cost, name="crew_pairing"):
+    """min cost . y  s.c.  A y >= 1, y binaire ; A : matrice vols x pairings. Renvoie (modèle, y)."""
+    m = Model(name)
+    y = m.addMVar(A.shape[1], vtype=GRB.BINARY, obj=np.asarray(cost, dtype=np.float64), name="y")
+    m.addMConstr(A, y, GRB.GREATER_EQUAL, np.ones(A.shape[0]), name="cover")
+    m.ModelSense = GRB.MINIMIZE
+    m.update()
+    return m, y
+
+
+def solve_cover(A, cost, name="crew_pairing"):
+    """Résout le modèle de couverture ; renvoie les indices des pairings retenus ([] si pas de solution optimale)."""
+    m, y = build_cover_model(A, cost, name)
+    m.optimize()
+    if m.status != GRB.Status.OPTIMAL:
+        return []
+    return np.flatnonzero(y.X > 0.5).tolist()
@@ -0,0 +1,201 @@
+import numpy as np
+
+# ----------------------------
+# Vols datés et règles de construction des pairings
+# ----------------------------
+# Heures en minutes depuis le début de la période (jour 0, 00:00)
+
+
+def parse_time(text):
+    """'HH:MM', 'J HH:MM' (jour J) ou un nombre de minutes -> minutes."""
+    text = str(text).strip()
+    day = 0
+    if " " in text:
+        day, text = text.split(None, 1)
+        day = int(day)
+    if ":" in text:
+        h, m = text.split(":")
+        return day * 1440 + int(h) * 60 + int(m)
+    return day * 1440 + int(float(text))
+
+
+def format_time(minutes):
+    day, rest = divmod(int(minutes), 1440)
+    return f"{day} {rest // 60:02d}:{rest % 60:02d}"
+
+
+class Flight:
+    __slots__ = ("name", "origin", "destination", "departure", "arrival")
+
+    def __init__(self, name, origin, destination, departure, arrival):
+        self.name = name
+        self.origin = origin
+        self.destination = destination
+        self.departure = parse_time(departure)
+        self.arrival = parse_time(arrival)
+        if self.arrival <= self.departure:
+            raise ValueError(f"vol {name} : arrivée avant le départ")
+
+    def __repr__(self):
+        return (f"Flight({self.name!r}, {self.origin!r}, {self.destination!r}, "
+                f"{format_time(self.departure)!r}, {format_time(self.arrival)!r})")
+
+
+class CrewRules:
+    """
+    Règles d'un pairing : suite de vols partant d'une base et y revenant, découpée en services.
+      min_connect : correspondance minimale entre deux vols (minutes)
+      max_sit : attente maximale entre deux vols d'un même service ; au-delà, il faut un repos
+      min_rest, max_rest : durée d'un repos entre deux services
+      max_duty : amplitude maximale d'un service (premier départ -> dernière arrivée)
+      max_legs : vols par service ; max_duties : services par pairing
+    Coût (additif le long du pairing, ce qui permet le pricing par plus court chemin) :
+      fixed_cost + duty_cost x minutes de service (vol et attente) + rest_cost par repos.
+    """
+
+    def __init__(self, bases, min_connect=30, max_sit=240, min_rest=600, max_rest=2160, max_duty=720,
+                 max_legs=6, max_duties=3, fixed_cost=500.0, duty_cost=1.0, rest_cost=300.0):
+        self.bases = list(bases)
+        self.min_connect = min_connect
+        self.max_sit = max_sit
+        self.min_rest = min_rest
+        self.max_rest = max_rest
+        self.max_duty = max_duty
+        self.max_legs = max_legs
+        self.max_duties = max_duties
+        self.fixed_cost = fixed_cost
+        self.duty_cost = duty_cost
+        self.rest_cost = rest_cost
+
+
+# ----------------------------
+# Graphe des correspondances
+# ----------------------------
+SIT, REST = 0, 1
+
+
+class ConnectionGraph:
+    """
+    Vols triés par départ (indices 0..F-1) et correspondances autorisées i -> j en CSR :
+    succ[indptr[i]:indptr[i+1]], kind = SIT (même service) ou REST (repos, nouveau service).
+    Les départs croissent le long d'un arc : le graphe est sans cycle, l'ordre des indices est topologique.
+    """
+
+    def __init__(self, flights, rules):
+        self.rules = rules
+        order = sorted(range(len(flights)), key=lambda k: (flights[k].departure, flights[k].name))
+        self.flights = [flights[k] for k in order]
+        self.names = [f.name for f in self.flights]
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("noms de vols en double")
+        self.index = {name: k for k, name in enumerate(self.names)}
+        airports = sorted({f.origin for f in self.flights} | {f.destination for f in self.flights}
+                          | set(rules.bases))
+        self.airports = airports
+        code = {a: k for k, a in enumerate(airports)}
+        self.origin = np.array([code[f.origin] for f in self.flights], dtype=np.int64)
+        self.destination = np.array([code[f.destination] for f in self.flights], dtype=np.int64)
+        self.departure = np.array([f.departure for f in self.flights], dtype=np.int64)
+        self.arrival = np.array([f.arrival for f in self.flights], dtype=np.int64)
+        self.base_codes = np.array([code[b] for b in rules.bases], dtype=np.int64)
+        self._build()
+
+    def __len__(self):
+        return len(self.flights)
+
+    def _build(self):
+        """Pour chaque vol, fenêtre de départs [arrivée + min_connect, arrivée + max_rest] à l'aéroport d'arrivée."""
+        r = self.rules
+        F = len(self.flights)
+        # flights grouped by origin airport, by departure (stable: indices stay sorted by departure)
+        by_origin = np.argsort(self.origin, kind="stable")
+        starts = np.searchsorted(self.origin[by_origin], np.arange(len(self.airports) + 1))
+        succ, kind, counts = [], [], np.zeros(F, dtype=np.int64)
+        for i in range(F):
+            a = self.destination[i]
+            group = by_origin[starts[a]:starts[a + 1]]
+            dep = self.departure[group]
+            lo = np.searchsorted(dep, self.arrival[i] + r.min_connect)
+            hi = np.searchsorted(dep, self.arrival[i] + r.max_rest, side="right")
+            j = group[lo:hi]
+            wait = self.departure[j] - self.arrival[i]
+            ok = (wait <= r.max_sit) | (wait >= r.min_rest)
+            succ.append(j[ok])
+            kind.append(np.where(wait[ok] <= r.max_sit, SIT, REST).astype(np.int8))
+            counts[i] = ok.sum()
+        self.indptr = np.concatenate([[0], np.cumsum(counts)])
+        self.succ = np.concatenate(succ) if F else np.zeros(0, dtype=np.int64)
+        self.kind = np.concatenate(kind) if F else np.zeros(0, dtype=np.int8)
+
+    def successors(self, i):
+        a, b = self.indptr[i], self.indptr[i + 1]
+        return self.succ[a:b], self.kind[a:b]
+
+    def pairing_cost(self, seq):
+        """Coût d'une suite d'indices de vols (mêmes règles que le pricing)."""
+        r = self.rules
+        cost = r.fixed_cost + r.duty_cost * (self.arrival[seq[0]] - self.departure[seq[0]])
+        for i, j in zip(seq, seq[1:]):
+            wait = self.departure[j] - self.arrival[i]
+            if wait <= r.max_sit:
+                cost += r.duty_cost * (self.arrival[j] - self.arrival[i])
+            else:
+                cost += r.rest_cost + r.duty_cost * (self.arrival[j] - self.departure[j])
+        return float(cost)
+
+    def is_legal(self, seq):
+        """Pairing légal : part d'une base et y revient, correspondances du graphe, limites de service."""
+        r = self.rules
+        if not seq or self.origin[seq[0]] not in self.base_codes or self.destination[seq[-1]] != self.origin[seq[0]]:
+            return False
+        duty_start, legs, duties = self.departure[seq[0]], 1, 1
+        for i, j in zip(seq, seq[1:]):
+            nxt, kinds = self.successors(i)
+            hit = np.flatnonzero(nxt == j)
+            if not len(hit):
+                return False
+            if kinds[hit[0]] == SIT:
+                legs += 1
+            else:
+                duty_start, legs, duties = self.departure[j], 1, duties + 1
+            if legs > r.max_legs or duties > r.max_duties or self.arrival[j] - duty_start > r.max_duty:
+                return False
+        return self.arrival[seq[-1]] - duty_start <= r.max_duty
+
+
+def random_schedule(n_flights, n_airports=8, bases=("TUN",), days=3, seed=0, rules=None):
+    """
+    Programme de vols synthétique : rotations aller-retour depuis les bases (2 à 4 vols par rotation),
+    heures tirées sur la période. Chaque rotation tient en un service sous rules (par défaut
+    CrewRules(bases)) : correspondances entre min_connect et max_sit, amplitude <= max_duty, au plus
+    max_legs vols. Chaque vol est donc couvert par un pairing légal. Renvoie une liste de Flight.
+    """
+    rules = rules if rules is not None else CrewRules(bases)
+    rng = np.random.default_rng(seed)
+    outstations = [f"A{k:02d}" for k in range(n_airports)]
+    max_legs = min(4, rules.max_legs, n_airports + 1)
+    # connections in 5-minute steps, kept inside [min_connect, max_sit]
+    sit_lo, sit_hi = max(8, -(-rules.min_connect // 5)), min(24, rules.max_sit // 5 + 1)
+    flights = []
+    while len(flights) < n_flights:
+        base = bases[rng.integers(len(bases))]
+        legs = int(rng.integers(2, max_legs + 1))
+        left = n_flights - len(flights)
+        if left <= max_legs:
+            legs = left
+        elif left - legs == 1:
+            legs -= 1  # never leave a single flight for the last rotation
+        stops = [base] + [outstations[k] for k in rng.choice(len(outstations), legs - 1, replace=False)] + [base]
+        while True:
+            # redrawn until the rotation fits in one duty
+            t = start = int(rng.integers(0, days * 1440 - 900)) // 5 * 5
+            times = []
+            for _ in range(legs):
+                block = int(rng.integers(6, 30)) * 5
+                times.append((t, t + block))
+                t += block + int(rng.integers(sit_lo, sit_hi)) * 5
+            if times[-1][1] - start <= rules.max_duty:
+                break
+        for (a, b), (dep, arr) in zip(zip(stops, stops[1:]), times):
+            flights.append(Flight(f"F{len(flights):05d}", a, b, dep, arr))
+    return flights
@@ -1,31 +1,20 @@
 import sys
 from PyQt5 import QtWidgets, uic
-from gurobipy import Model, GRB
+from cover_model import coverage_matrix, solve_cover
+from crew_network import Flight, CrewRules
+from pairing_generator import optimize_schedule
+from column_generation import run_column_generation
+
+FLIGHT_COLUMNS = ["Nom du vol", "Origine", "Destination", "Départ", "Arrivée"]
 
 # ----------------------------
 # Fonction Gurobi
 # ----------------------------
 def run_crew_optimizer(flights, pairings, cost):
-    m = Model("crew_pairing_dynamic")
-    y = {p: m.addVar(vtype=GRB.BINARY, name=f"y_{p}") for p in pairings}
-    m.update()
-
-    # Minimiser le coût total
-    m.setObjective(sum(cost[p]*y[p] for p in pairings), GRB.MINIMIZE)
-
-    # Contraintes : chaque vol au moins une fois
-    for f in flights:
-        expr = sum(y[p] for p in pairings if f in pairings[p])
-        m.addConstr(expr >= 1, name=f"cover_{f}")
-
-    m.optimize()
-
-    chosen = {}
-    if m.status == GRB.Status.OPTIMAL:
-        for p in pairings:
-            if y[p].x > 0.5:
-                chosen[p] = pairings[p]
-    return chosen
+    # Matrice de couverture vols x pairings (index inversé), modèle construit en une fois
+    A, names = coverage_matrix(flights, pairings)
+    chosen = solve_cover(A, [cost[p] for p in names], "crew_pairing_dynamic")
+    return {names[k]: pairings[names[k]] for k in chosen}
 
 # ----------------------------
 # Classe principale
@@ -35,6 +24,9 @@ class CrewApp(QtWidgets.QDialog):
         super().__init__()
         uic.loadUi("Rakia_Tsouri_Planification des equipages\\crew_app.ui", self)
 
+        # Vols datés : origine, destination, départ / arrivée ('HH:MM' ou 'J HH:MM')
+        self.flightsTable.setHorizontalHeaderLabels(FLIGHT_COLUMNS)
+
         # Rendre resultTable non éditable
         self.resultTable.setEditTriggers(QtWidgets.QTableWidget.NoEditTriggers)
 
@@ -51,40 +43,82 @@ class CrewApp(QtWidgets.QDialog):
         for row in sorted(selected, reverse=True):
             table.removeRow(row)
 
+    # Lire une cellule (texte vide si absente)
+    def cell(self, table, row, col):
+        item = table.item(row, col)
+        return item.text().strip() if item else ""
+
+    # Vols datés saisis (ValueError si une ligne est incomplète ou une heure invalide)
+    def read_schedule(self):
+        flights = []
+        for row in range(self.flightsTable.rowCount()):
+            values = [self.cell(self.flightsTable, row, col) for col in range(len(FLIGHT_COLUMNS))]
+            if not values[0]:
+                continue
+            if not all(values):
+                raise ValueError(f"vol {values[0]} : origine, destination, départ et arrivée requis")
+            flights.append(Flight(*values))
+        return flights
+
     # Optimisation
     def optimize(self):
         # Récupérer vols
-        flights = [self.flightsTable.item(row,0).text().strip()
-                   for row in range(self.flightsTable.rowCount())
-                   if self.flightsTable.item(row,0) and self.flightsTable.item(row,0).text().strip()]
+        flights = [self.cell(self.flightsTable, row, 0) for row in range(self.flightsTable.rowCount())
+                   if self.cell(self.flightsTable, row, 0)]
 
         # Récupérer pairings
         pairings = {}
         for row in range(self.pairingsTable.rowCount()):
-            name_item = self.pairingsTable.item(row,0)
-            vols_item = self.pairingsTable.item(row,1)
-            if name_item and vols_item and name_item.text().strip() and vols_item.text().strip():
-                vols = [v.strip() for v in vols_item.text().split(",")]
-                pairings[name_item.text().strip()] = vols
-
-        if not flights or not pairings:
-            QtWidgets.QMessageBox.warning(self, "Erreur", "Veuillez saisir au moins un vol et un pairing.")
-            return
+            name = self.cell(self.pairingsTable, row, 0)
+            vols = self.cell(self.pairingsTable, row, 1)
+            if name and vols:
+                pairings[name] = [v.strip() for v in vols.split(",")]
 
-        # Coût = 1 par pairing
-        cost = {p: 1 for p in pairings}
+        if not flights:
+            QtWidgets.QMessageBox.warning(self, "Erreur", "Veuillez saisir au moins un vol.")
+            return
 
-        # Optimiser
-        chosen = run_crew_optimizer(flights, pairings, cost)
+        if pairings:
+            # Pairings saisis : coût = 1 par pairing
+            cost = {p: 1 for p in pairings}
+            chosen = run_crew_optimizer(flights, pairings, cost)
+            rows = [(p, ", ".join(vols)) for p, vols in chosen.items()]
+        else:
+            # Pas de pairing saisi : génération des pairings légaux à partir des vols datés
+            bases = [b.strip() for b in self.basesEdit.text().split(",") if b.strip()]
+            if not bases:
+                QtWidgets.QMessageBox.warning(self, "Erreur",
+                                              "Veuillez saisir des pairings ou les bases des équipages.")
+                return
+            # ValueError : saisie invalide (heure, ligne incomplète, noms de vols en double)
+            try:
+                schedule = self.read_schedule()
+                if self.enumerateCheck.isChecked():
+                    # Énumération de tous les pairings légaux : exacte, réservée aux petits programmes
+                    chosen, uncovered = optimize_schedule(schedule, CrewRules(bases)), []
+                else:
+                    # Génération de colonnes : seuls les pairings utiles sont construits
+                    result = run_column_generation(schedule, CrewRules(bases))
+                    chosen = [(p["flights"], p["cost"]) for p in result["pairings"]]
+                    uncovered = result["uncovered"]
+            except ValueError as e:
+                QtWidgets.QMessageBox.warning(self, "Erreur", str(e))
+                return
+            if uncovered:
+                QtWidgets.QMessageBox.warning(self, "Attention", "Vols sans pairing légal : " + ", ".join(uncovered))
+            rows = [(f"P{k + 1} ({cost:.0f})", ", ".join(vols)) for k, (vols, cost) in enumerate(chosen)]
+
+        if not rows:
+            QtWidgets.QMessageBox.warning(self, "Erreur", "Aucune couverture des vols trouvée.")
 
         # Afficher résultat
         self.resultTable.clear()
-        self.resultTable.setRowCount(len(chosen))
+        self.resultTable.setRowCount(len(rows))
         self.resultTable.setColumnCount(2)
         self.resultTable.setHorizontalHeaderLabels(["Pairing choisi", "Vols couverts"])
-        for row, (p, vols) in enumerate(chosen.items()):
+        for row, (p, vols) in enumerate(rows):
             self.resultTable.setItem(row,0,QtWidgets.QTableWidgetItem(p))
-            self.resultTable.setItem(row,1,QtWidgets.QTableWidgetItem(", ".join(vols)))
+            self.resultTable.setItem(row,1,QtWidgets.QTableWidgetItem(vols))
 
 # ----------------------------
 # Lancer l'application
@@ -0,0 +1,118 @@
+import numpy as np
+from multiprocessing import Pool
+from crew_network import ConnectionGraph, SIT
+from cover_model import CoverageBuilder, solve_cover
+
+# ----------------------------
+# Énumération des pairings légaux (DFS élagué)
+# ----------------------------
+def _lists(graph):
+    # plain lists: scalar indexing in the DFS is much cheaper than on numpy arrays
+    if getattr(graph, "_lists", None) is None:
+        graph._lists = tuple(a.tolist() for a in (graph.departure, graph.arrival, graph.origin, graph.destination,
+                                                  graph.indptr, graph.succ, graph.kind))
+    return graph._lists
+
+
+def enumerate_from(graph, start, max_cost=None):
+    """
+    Pairings légaux commençant par le vol start (départ d'une base), par parcours en profondeur du
+    graphe des correspondances. Une branche est coupée dès qu'une règle est violée (amplitude du
+    service, vols par service, nombre de services) ou que son coût dépasse max_cost : le coût ne fait
+    que croître le long d'un pairing. Génère (indices des vols, coût) pour chaque retour à la base.
+    """
+    r = graph.rules
+    dep, arr, orig, dest, indptr, succ, kind = _lists(graph)
+    base = orig[start]
+    path = [start]
+    cost = r.fixed_cost + r.duty_cost * (arr[start] - dep[start])
+    if max_cost is not None and cost > max_cost:
+        return
+    # stack of (depth, flight, duty start, legs, duties, cost)
+    stack = [(1, start, dep[start], 1, 1, cost)]
+    while stack:
+        depth, i, duty_start, legs, duties, cost = stack.pop()
+        del path[depth - 1:]
+        path.append(i)
+        if dest[i] == base:
+            yield list(path), float(cost)
+        for e in range(indptr[i + 1] - 1, indptr[i] - 1, -1):
+            j = succ[e]
+            if kind[e] == SIT:
+                if legs >= r.max_legs or arr[j] - duty_start > r.max_duty:
+                    continue
+                nxt = (depth + 1, j, duty_start, legs + 1, duties, cost + r.duty_cost * (arr[j] - arr[i]))
+            else:
+                if duties >= r.max_duties:
+                    continue
+                nxt = (depth + 1, j, dep[j], 1, duties + 1, cost + r.rest_cost + r.duty_cost * (arr[j] - dep[j]))
+            if max_cost is not None and nxt[5] > max_cost:
+                continue
+            stack.append(nxt)
+
+
+def enumerate_chunk(graph, starts, max_cost=None):
+    """Pairings des vols de départ starts en tableaux compacts : (indices concaténés, longueurs, coûts)."""
+    rows, counts, costs = [], [], []
+    for start in starts:
+        for seq, cost in enumerate_from(graph, start, max_cost):
+            rows.extend(seq)
+            counts.append(len(seq))
+            costs.append(cost)
+    return (np.array(rows, dtype=np.int32), np.array(counts, dtype=np.int32), np.array(costs, dtype=np.float64))
+
+
+# ----------------------------
+# Parallélisation par base (pool de processus)
+# ----------------------------
+_graph = None
+
+
+def _init_worker(graph):
+    global _graph
+    _graph = graph
+
+
+def _work(task):
+    base, starts, max_cost = task
+    return base, enumerate_chunk(_graph, starts, max_cost)
+
+
+def stream_pairings(graph, processes=None, chunk=32, max_cost=None):
+    """
+    Génère les pairings légaux par lots (base, (indices, longueurs, coûts)). Les vols de départ de chaque
+    base sont découpés en tâches de chunk vols, réparties sur un pool de processus (processes=1 : dans
+    le processus courant). Les lots arrivent au fil de l'eau : seul un lot par tâche est en mémoire
+    à la fois, jamais la liste complète des pairings.
+    """
+    tasks = []
+    for code, base in zip(graph.base_codes.tolist(), graph.rules.bases):
+        starts = np.flatnonzero(graph.origin == code).tolist()
+        tasks += [(base, starts[k:k + chunk], max_cost) for k in range(0, len(starts), chunk)]
+    if processes == 1:
+        for base, starts, cap in tasks:
+            yield base, enumerate_chunk(graph, starts, cap)
+        return
+    with Pool(processes, initializer=_init_worker, initargs=(graph,)) as pool:
+        yield from pool.imap_unordered(_work, tasks)
+
+
+def generate_cover(flights, rules, processes=None, chunk=32, max_cost=None):
+    """Vols datés -> (graphe, CoverageBuilder rempli des pairings légaux), lot par lot."""
+    graph = ConnectionGraph(flights, rules)
+    builder = CoverageBuilder(graph.names)
+    for _, (rows, counts, costs) in stream_pairings(graph, processes, chunk, max_cost):
+        builder.add_many(None, rows, counts, costs)
+    return graph, builder
+
+
+def optimize_schedule(flights, rules, processes=None, max_cost=None):
+    """
+    Pairings générés à partir du programme de vols puis couverture de coût minimal.
+    Renvoie la liste des pairings retenus [(vols, coût)] ([] si aucune couverture n'existe).
+    """
+    graph, builder = generate_cover(flights, rules, processes, max_cost=max_cost)
+    A, costs = builder.matrix(), builder.costs
+    chosen = solve_cover(A, costs, "crew_pairing_generated")
+    A = A.tocsc()
+    return [([graph.names[i] for i in A.indices[A.indptr[k]:A.indptr[k + 1]]], float(costs[k])) for k in chosen]